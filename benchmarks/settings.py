@@ -0,0 +1,48 @@
+"""
+Settings for the benchmarks, which use local stand-ins for the services checked by
+the readiness probes: an in-memory sqlite database and a locmem cache.
+"""
+
+SECRET_KEY = "benchmarks-are-not-secret"
+
+DEBUG = False
+
+USE_TZ = True
+
+ALLOWED_HOSTS = ["*"]
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "djk8s",
+]
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+
+MIDDLEWARE = [
+    "djk8s.middleware.ProbeMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+]
+
+ROOT_URLCONF = "djk8s.urls"
+
+DJK8S_READINESS_PROBES = [
+    "djk8s.probes.DatabaseProbe",
+    "djk8s.probes.CacheProbe",
+]
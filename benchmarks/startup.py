@@ -0,0 +1,79 @@
+"""
+Measures the wall time from interpreter start to exit of each way of running an exec
+probe so that regressions in import and startup time are caught, e.g.:
+
+    $ python benchmarks/startup.py --settings benchmarks.settings
+
+The fast-start client must be faster than the equivalent manage.py probe command;
+the benchmark exits with a non-zero status if it is not within the given ratio.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each mode maps to the fast-start command and the manage.py command it replaces.
+MODES = {
+    "live": (
+        [sys.executable, "-m", "djk8s.client", "--live"],
+        [sys.executable, "-m", "django", "probe", "--live"],
+    ),
+    "ready": (
+        [sys.executable, "-m", "djk8s.client", "--ready"],
+        [sys.executable, "-m", "django", "probe", "--ready"],
+    ),
+}
+
+
+def measure(cmd, env, runs):
+    """
+    Run the command the given number of times and return the wall time of each run.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10, help="number of runs of each command")
+    parser.add_argument("--settings", default=os.environ.get("DJANGO_SETTINGS_MODULE", "benchmarks.settings"))
+    parser.add_argument(
+        "--ratio",
+        type=float,
+        default=0.9,
+        help="the maximum ratio of fast-start to manage.py median time, default: 0.9",
+    )
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=args.settings, PYTHONPATH=ROOT)
+    env.pop("DJK8S_PROBE_SOCKET", None)
+
+    failed = False
+    print(f"{'mode':<8}{'command':<12}{'median':>10}{'min':>10}{'max':>10}")
+    for mode, (fast, slow) in MODES.items():
+        results = {"client": measure(fast, env, args.runs), "manage.py": measure(slow, env, args.runs)}
+        for name, times in results.items():
+            print(
+                f"{mode:<8}{name:<12}{statistics.median(times) * 1000:>8.1f}ms"
+                f"{min(times) * 1000:>8.1f}ms{max(times) * 1000:>8.1f}ms"
+            )
+
+        ratio = statistics.median(results["client"]) / statistics.median(results["manage.py"])
+        if ratio > args.ratio:
+            print(f"{mode}: client is {ratio:.2f}x of manage.py, expected at most {args.ratio:.2f}x")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Measures the overhead and latency of the probes with local stand-ins for the
+services they check (sqlite, locmem caches, and fake slow probes) and writes the
+results as JSON so that releases can be compared, e.g.:
+
+    $ python benchmarks/suite.py --settings benchmarks.settings -o before.json
+    $ python benchmarks/suite.py --settings benchmarks.settings --compare before.json
+
+When comparing, the benchmark exits with a non-zero status if any median time is
+slower than the baseline by more than the given ratio.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Probes used for the concurrency benchmarks: the default service probes backed by
+# sqlite and locmem, and the same probes with a fake probe that sleeps for DELAY.
+DELAY = 0.005
+PROBES = {
+    "services": ["djk8s.probes.DatabaseProbe", "djk8s.probes.CacheProbe"],
+    "slow": ["djk8s.probes.DatabaseProbe", "djk8s.probes.CacheProbe", "tests.probes.SlowProbe"],
+}
+
+
+def timeit(func, number):
+    """
+    Call the function the given number of times and return the time of each call.
+    """
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times, **extra):
+    """
+    Summarize a list of times in seconds as microseconds.
+    """
+    times = sorted(times)
+    return {
+        "n": len(times),
+        "median_us": statistics.median(times) * 1e6,
+        "p99_us": times[max(int(len(times) * 0.99) - 1, 0)] * 1e6,
+        "min_us": times[0] * 1e6,
+        "max_us": times[-1] * 1e6,
+        **extra,
+    }
+
+
+def bench_middleware(number):
+    """
+    The overhead the ProbeMiddleware adds to every request that is not a probe,
+    compared to calling the next handler directly, with and without load tracking.
+    """
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+    from djk8s.middleware import ProbeMiddleware
+
+    response = HttpResponse("Ok")
+    request = RequestFactory().get("/api/items")
+
+    def get_response(request):
+        return response
+
+    results = {"baseline": summarize(timeit(lambda: get_response(request), number))}
+    configs = {
+        "passthrough": {},
+        "load_tracking": {"DJK8S_READINESS_PROBES": ["djk8s.probes.LoadProbe"]},
+    }
+
+    for name, overrides in configs.items():
+        with override_settings(**overrides):
+            middleware = ProbeMiddleware(get_response)
+            results[name] = summarize(timeit(lambda: middleware(request), number))
+    return results
+
+
+def bench_concurrency(number, levels):
+    """
+    The latency of readiness requests handled by the ProbeMiddleware when they are
+    made concurrently by the given numbers of threads, with the probes run inline and
+    on the probe thread pool.
+    """
+    from django.db import connections
+    from django.test import RequestFactory, override_settings
+    from djk8s.middleware import ProbeMiddleware
+    from tests.probes import SlowProbe
+
+    SlowProbe.delay = DELAY
+    request = RequestFactory().get("/readyz")
+
+    def get_response(request):
+        raise AssertionError("readiness request was not handled by the middleware")
+
+    def worker(middleware, count):
+        try:
+            return timeit(lambda: middleware(request), count)
+        finally:
+            connections.close_all()
+
+    results = {}
+    for name, probes in PROBES.items():
+        for workers in (None, 4):
+            label = f"{name}_inline" if workers is None else f"{name}_pool"
+            overrides = {"DJK8S_READINESS_PROBES": probes, "DJK8S_PROBE_WORKERS": workers}
+            with override_settings(**overrides):
+                middleware = ProbeMiddleware(get_response)
+                middleware(request)
+
+                for threads in levels:
+                    count = max(number // threads, 1)
+                    start = time.perf_counter()
+                    with ThreadPoolExecutor(max_workers=threads) as executor:
+                        futures = [executor.submit(worker, middleware, count) for _ in range(threads)]
+                        times = [t for future in futures for t in future.result()]
+                    elapsed = time.perf_counter() - start
+
+                    results[f"{label}_{threads}"] = summarize(
+                        times, threads=threads, rps=len(times) / elapsed
+                    )
+    return results
+
+
+def bench_handlers(number):
+    """
+    The cost of a readiness and liveness request through the full WSGI handler when
+    answered by the ProbeMiddleware compared to the ReadinessView and LivenessView,
+    and when answered by the ProbeApplication wrapper before the handler.
+    """
+    from django.conf import settings
+    from django.test import RequestFactory, override_settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from djk8s.wsgi import ProbeApplication
+
+    environ = RequestFactory()._base_environ
+
+    def start_response(status, headers):
+        pass
+
+    def call(handler, path):
+        response = handler(environ(PATH_INFO=path, REQUEST_METHOD="GET"), start_response)
+        if hasattr(response, "close"):
+            response.close()
+
+    views = [m for m in settings.MIDDLEWARE if m != "djk8s.middleware.ProbeMiddleware"]
+    configs = {
+        "middleware": {"MIDDLEWARE": ["djk8s.middleware.ProbeMiddleware"] + views},
+        "view": {"MIDDLEWARE": views},
+        "wrapper": {"MIDDLEWARE": views},
+    }
+
+    results = {}
+    for name, overrides in configs.items():
+        with override_settings(
+            ROOT_URLCONF="djk8s.urls",
+            DJK8S_READINESS_PROBES=PROBES["services"],
+            **overrides,
+        ):
+            handler = WSGIHandler()
+            if name == "wrapper":
+                handler = ProbeApplication(handler)
+
+            for path in ("/readyz", "/livez"):
+                call(handler, path)
+                times = timeit(lambda: call(handler, path), number)
+                results[f"{name}_{path.strip('/')}"] = summarize(times)
+    return results
+
+
+def bench_commands(runs, settings):
+    """
+    The wall time of an exec probe with the manage.py probe command and the client.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings, PYTHONPATH=ROOT)
+    env.pop("DJK8S_PROBE_SOCKET", None)
+
+    commands = {
+        "probe_live": [sys.executable, "-m", "django", "probe", "--live"],
+        "probe_ready": [sys.executable, "-m", "django", "probe", "--ready"],
+        "client_live": [sys.executable, "-m", "djk8s.client", "--live"],
+        "client_ready": [sys.executable, "-m", "djk8s.client", "--ready"],
+    }
+
+    def run(cmd):
+        subprocess.run(cmd, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+    return {name: summarize(timeit(lambda: run(cmd), runs)) for name, cmd in commands.items()}
+
+
+def environment():
+    """
+    The versions and platform the benchmarks were run on.
+    """
+    import django
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        djk8s = version("django-kubernetes")
+    except PackageNotFoundError:
+        djk8s = "unknown"
+
+    return {
+        "djk8s": djk8s,
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(results, baseline, ratio):
+    """
+    Print the change in the median time of every benchmark in both results and
+    return the names of the benchmarks that are slower than the ratio allows.
+    """
+    slower = []
+    print(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for group, benchmarks in results["benchmarks"].items():
+        for name, result in benchmarks.items():
+            previous = baseline.get("benchmarks", {}).get(group, {}).get(name)
+            if previous is None:
+                continue
+
+            change = result["median_us"] / previous["median_us"]
+            print(
+                f"{group + '.' + name:<40}{previous['median_us']:>10.1f}us"
+                f"{result['median_us']:>10.1f}us{change:>9.2f}x"
+            )
+            if change > ratio:
+                slower.append(f"{group}.{name}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=2000, help="number of requests per benchmark")
+    parser.add_argument("-r", "--runs", type=int, default=10, help="number of runs of each probe command")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, nargs="+", default=[1, 4, 16], help="numbers of concurrent threads"
+    )
+    parser.add_argument("-o", "--output", default=None, help="write the JSON results to this path instead of stdout")
+    parser.add_argument("--compare", default=None, help="a JSON results file to compare the results with")
+    parser.add_argument(
+        "--ratio",
+        type=float,
+        default=1.25,
+        help="the maximum ratio of current to baseline median time when comparing, default: 1.25",
+    )
+    parser.add_argument("--skip-commands", action="store_true", help="do not benchmark the probe commands")
+    parser.add_argument("--settings", default=os.environ.get("DJANGO_SETTINGS_MODULE", "benchmarks.settings"))
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    os.environ.pop("DJK8S_PROBE_SOCKET", None)
+
+    import django
+
+    django.setup()
+
+    results = {
+        "environment": environment(),
+        "benchmarks": {
+            "middleware": bench_middleware(args.number),
+            "concurrency": bench_concurrency(args.number // 10, args.concurrency),
+            "handlers": bench_handlers(args.number),
+        },
+    }
+
+    if not args.skip_commands:
+        results["benchmarks"]["commands"] = bench_commands(args.runs, args.settings)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.ratio)
+        if slower:
+            print(f"slower than the baseline by more than {args.ratio:.2f}x: {', '.join(slower)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
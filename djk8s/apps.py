@@ -6,3 +6,13 @@ class Djk8SConfig(AppConfig):
     name = "djk8s"
     label = "kubernetes"
     verbose_name = "Django Kubernetes"
+
+    def ready(self):
+        from djk8s.conf import settings
+
+        # Serve exec probes from this process if a probe socket is configured.
+        if settings.DJK8S_PROBE_SOCKET:
+            from djk8s import server
+
+            if server.should_start():
+                server.start()
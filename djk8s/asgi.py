@@ -0,0 +1,112 @@
+"""
+An ASGI application wrapper that answers probes before Django handles the request.
+"""
+
+from djk8s.conf import settings
+from djk8s.cache import readiness_cache
+from djk8s.probes import NotReady, registry
+from djk8s.checks import acheck_ready, acheck_startup
+
+
+class ProbeApplication(object):
+    """
+    Wraps an ASGI application (e.g. the result of get_asgi_application) and answers
+    GET requests to the health, startup, and readiness paths directly from the scope
+    using the same probes as the ProbeMiddleware. The readiness probes are run
+    concurrently on the event loop. Probes never build an HttpRequest, send the
+    request_started and request_finished signals, or pass through the middleware
+    stack. All other requests, websockets, and lifespan events are passed to the
+    wrapped application.
+
+    In your asgi.py module:
+
+        application = ProbeApplication(get_asgi_application())
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+        # Build the shared readiness probes so misconfiguration is detected at startup.
+        registry.probes
+
+        # If configured, serve readiness requests from periodically refreshed results.
+        self.cache = readiness_cache()
+
+        # Paths that are answered directly instead of being passed to the application.
+        self.handlers = {}
+        for path in settings.DJK8S_READY_PATHS:
+            self.handlers[path] = self.ready
+
+        for path in settings.DJK8S_HEALTH_PATHS:
+            self.handlers[path] = self.health
+
+        for path in settings.DJK8S_STARTUP_PATHS:
+            self.handlers[path] = self.startup
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope.get("method") == "GET":
+            handler = self.handlers.get(request_path(scope))
+            if handler is not None:
+                status, content = await handler()
+                return await respond(send, status, content)
+
+        return await self.application(scope, receive, send)
+
+    async def health(self):
+        """
+        The process is live if it can answer the request.
+        """
+        return 200, "Ok"
+
+    async def startup(self):
+        """
+        Runs the warm-up hooks in the thread used for synchronous code and reports
+        ready once they have all succeeded.
+        """
+        try:
+            await acheck_startup()
+        except NotReady as e:
+            return e.status, e.content
+        return 200, "Ok"
+
+    async def ready(self):
+        """
+        Runs the readiness probes on the event loop (or checks the cached results) once
+        the warm-up is complete. Since the request_finished signal is not sent,
+        connections that have become unusable or exceeded their maximum age are closed
+        here.
+        """
+        try:
+            await acheck_ready(self.cache, close_connections=True)
+        except NotReady as e:
+            return e.status, e.content
+        return 200, "Ok"
+
+
+def request_path(scope) -> str:
+    """
+    The full path of the request, including the root path the application is mounted
+    at, like SCRIPT_NAME and PATH_INFO in the WSGI wrapper. The ASGI spec includes the
+    root path in the path, but some servers do not.
+    """
+    path = scope.get("path", "")
+    root_path = scope.get("root_path", "")
+    if root_path and path != root_path and not path.startswith(root_path + "/"):
+        path = root_path + path
+    return path
+
+
+async def respond(send, status: int, content: str):
+    """
+    Send a plain text response.
+    """
+    body = content.encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/plain"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
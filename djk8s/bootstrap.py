@@ -0,0 +1,51 @@
+"""
+A minimal bootstrap for exec probes that loads the Django settings and only the
+modules needed by the configured readiness probes instead of setting up every app
+and running system checks like manage.py does.
+"""
+
+import os
+import django
+
+
+def ready(settings_module: str = None):
+    """
+    Run the configured readiness probes with as little of Django loaded as possible.
+    The app registry is only populated if a probe sets requires_apps or if importing
+    a probe requires the app registry (e.g. because it imports models).
+
+    :param settings_module: The settings module, by default $DJANGO_SETTINGS_MODULE.
+    :returns: A tuple of the status code and message of the readiness check.
+    """
+    if settings_module:
+        os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+
+    from django.core.exceptions import AppRegistryNotReady
+
+    try:
+        probes = load_probes()
+    except AppRegistryNotReady:
+        django.setup(set_prefix=False)
+        probes = load_probes()
+
+    if any(probe.requires_apps for probe in probes):
+        django.setup(set_prefix=False)
+
+    from djk8s.probes import NotReady
+    from djk8s.runner import run_probes
+
+    try:
+        run_probes(probes, None)
+    except NotReady as e:
+        return e.status, e.content
+    return 200, "Ok"
+
+
+def load_probes():
+    """
+    Import and instantiate the configured readiness probes.
+    """
+    from djk8s.probes import registry
+
+    registry.reset()
+    return registry.probes
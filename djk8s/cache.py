@@ -0,0 +1,217 @@
+import time
+import logging
+import threading
+
+from djk8s.conf import settings
+from djk8s.probes import NotReady, registry
+from asgiref.sync import sync_to_async
+from djk8s.runner import run_probes
+from django.db import close_old_connections
+from django.core.signals import setting_changed
+from django.core.exceptions import ImproperlyConfigured
+
+
+logger = logging.getLogger("djk8s.probe")
+
+
+class ReadinessCache(object):
+    """
+    Caches the results of the readiness probes so that readiness requests can be
+    answered from the last snapshot instead of running every probe inline. A daemon
+    thread refreshes the snapshot every ttl seconds; if the snapshot is older than
+    max_age (e.g. because a hung probe has stalled the refresher) the cache reports
+    not ready rather than serving a stale Ok forever.
+    """
+
+    def __init__(self, probes, ttl: float, max_age: float = None):
+        """
+        Initialize the cache with the probes to refresh and the refresh intervals.
+
+        :param probes: The readiness probe instances to run on every refresh or None
+            to run the probes in the shared probe registry.
+        :param ttl: The number of seconds between refreshes of the probe results.
+        :param max_age: The number of seconds after which a snapshot is considered
+            stale; defaults to three times the ttl.
+        """
+        if not ttl or ttl <= 0:
+            raise ImproperlyConfigured("readiness cache ttl must be greater than 0")
+
+        if max_age is None:
+            max_age = ttl * 3
+
+        if max_age < ttl:
+            raise ImproperlyConfigured(
+                "readiness cache max age must be greater than or equal to the ttl"
+            )
+
+        self.probes = probes
+        self.ttl = ttl
+        self.max_age = max_age
+
+        # The snapshot is a tuple of (monotonic timestamp, NotReady or None) that is
+        # replaced atomically so that readers never need to acquire the lock.
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """
+        Check the cached readiness results; on the first call the probes are run in
+        the calling thread and the background refresher is started.
+
+        :raises NotReady: If the last snapshot was not ready or is stale.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            with self._lock:
+                if self.snapshot is None:
+                    self.refresh()
+                self.start()
+            snapshot = self.snapshot
+
+        updated, error = snapshot
+        if time.monotonic() - updated > self.max_age:
+            raise NotReady("cache: readiness results are stale")
+
+        if error is not None:
+            raise error
+
+    async def acheck(self):
+        """
+        Check the cached readiness results without blocking the event loop; only the
+        first call, which must run the probes, is performed in a worker thread.
+
+        :raises NotReady: If the last snapshot was not ready or is stale.
+        """
+        if self.snapshot is None:
+            return await sync_to_async(self.check, thread_sensitive=False)()
+        return self.check()
+
+    @property
+    def cached_probes(self):
+        """
+        The readiness probes whose results are cached.
+        """
+        return self.probes or registry.probes
+
+    def refresh(self):
+        """
+        Run all of the readiness probes and store the result as the new snapshot.
+        """
+        error = None
+        try:
+            run_probes(self.cached_probes, None)
+        except NotReady as e:
+            error = e
+        except Exception as e:
+            logger.exception(f"readiness cache refresh failed: {str(e)}")
+            error = NotReady("cache: readiness probes could not be refreshed")
+
+        self.snapshot = (time.monotonic(), error)
+
+    def start(self):
+        """
+        Start the background refresher thread if it is not already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="djk8s-readiness-cache", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Signal the background refresher thread to stop and wait for it to exit.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        while not self._stop.wait(self.ttl):
+            try:
+                self.refresh()
+            finally:
+                # The refresher does not receive request signals, so close connections
+                # that have errored or outlived CONN_MAX_AGE as Django does per request.
+                close_old_connections()
+
+
+# The readiness cache of this process, created on first use by readiness_cache().
+_cache = None
+_cache_created = False
+_cache_lock = threading.Lock()
+
+
+def readiness_cache():
+    """
+    Return the readiness cache of this process, which is created on first use and
+    shared by every entry point (the middleware, the WSGI and ASGI applications, and
+    the probe server) so that they serve the same results from a single refresher.
+
+    :returns: A readiness cache or None if readiness results are not cached.
+    """
+    global _cache, _cache_created
+    with _cache_lock:
+        if not _cache_created:
+            _cache = create_readiness_cache()
+            _cache_created = True
+        return _cache
+
+
+def create_readiness_cache():
+    """
+    Create the readiness cache configured by the DJK8S_READINESS_CACHE_TTL setting,
+    shared between processes if DJK8S_SHARED_STATUS_FILE is set.
+
+    :returns: A readiness cache or None if readiness results are not cached.
+    """
+    if settings.DJK8S_SHARED_STATUS_FILE:
+        if not settings.DJK8S_READINESS_CACHE_TTL:
+            raise ImproperlyConfigured(
+                "DJK8S_SHARED_STATUS_FILE requires DJK8S_READINESS_CACHE_TTL to be set"
+            )
+
+        from djk8s.shared import SharedReadinessCache
+
+        return SharedReadinessCache(
+            None,
+            ttl=settings.DJK8S_READINESS_CACHE_TTL,
+            max_age=settings.DJK8S_READINESS_CACHE_MAX_AGE,
+            path=settings.DJK8S_SHARED_STATUS_FILE,
+        )
+
+    if settings.DJK8S_READINESS_CACHE_TTL:
+        return ReadinessCache(
+            None,
+            ttl=settings.DJK8S_READINESS_CACHE_TTL,
+            max_age=settings.DJK8S_READINESS_CACHE_MAX_AGE,
+        )
+    return None
+
+
+def reset_cache(*args, **kwargs):
+    """
+    Stop and discard the readiness cache of this process when the cache settings or
+    the configured readiness probes are changed.
+    """
+    global _cache, _cache_created
+    if kwargs["setting"] in (
+        "DJK8S_READINESS_CACHE_TTL",
+        "DJK8S_READINESS_CACHE_MAX_AGE",
+        "DJK8S_SHARED_STATUS_FILE",
+        "DJK8S_READINESS_PROBES",
+    ):
+        with _cache_lock:
+            if _cache is not None:
+                _cache.stop()
+            _cache = None
+            _cache_created = False
+
+
+setting_changed.connect(reset_cache)
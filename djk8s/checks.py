@@ -0,0 +1,83 @@
+"""
+The startup and readiness checks shared by every entry point that answers probes:
+the ProbeMiddleware, the probe views, the WSGI and ASGI application wrappers, and the
+probe server. Liveness needs no check; a process that can answer is live.
+"""
+
+from djk8s.warmup import warmup
+from djk8s.drain import drainer
+from djk8s.probes import NotReady, registry
+from djk8s.runner import run_probes, arun_probes
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+# The message reported until the warm-up hooks have all succeeded.
+WARMUP_INCOMPLETE = "startup: warm-up is not complete"
+
+
+def check_startup():
+    """
+    Run any warm-up hooks that have not yet succeeded.
+
+    :raises NotReady: If the warm-up is not complete.
+    """
+    if not warmup.run():
+        raise NotReady(WARMUP_INCOMPLETE)
+
+
+async def acheck_startup():
+    """
+    Async version of check_startup; the warm-up hooks are run in the thread used for
+    synchronous code so that the connections they open are reused by sync views.
+
+    :raises NotReady: If the warm-up is not complete.
+    """
+    if not warmup.complete and not await sync_to_async(warmup.run)():
+        raise NotReady(WARMUP_INCOMPLETE)
+
+
+def check_ready(cache=None, probes=None, request=None, close_connections=False):
+    """
+    Check that the process is ready: the warm-up is complete, the process is not
+    draining, and the readiness probes are ready (or the cached results if a readiness
+    cache is given).
+
+    :param cache: The ReadinessCache to check instead of running the probes, if any.
+    :param probes: The readiness probes to run, by default the configured probes.
+    :param request: The HTTP request object or None if there is no request.
+    :param close_connections: Close connections that have errored or outlived
+        CONN_MAX_AGE after the check, for callers outside of Django's request cycle
+        (which otherwise does this when the request_finished signal is sent).
+    :raises NotReady: If the process is not ready.
+    """
+    try:
+        check_startup()
+        drainer.check()
+        if cache is not None:
+            cache.check()
+        else:
+            run_probes(registry.probes if probes is None else probes, request)
+    finally:
+        if close_connections:
+            close_old_connections()
+
+
+async def acheck_ready(cache=None, probes=None, request=None, close_connections=False):
+    """
+    Async version of check_ready; the probes are run concurrently on the event loop.
+    Connections are closed in the thread used for synchronous code, which is where
+    the warm-up hooks and the readiness cache open them.
+
+    :raises NotReady: If the process is not ready.
+    """
+    try:
+        await acheck_startup()
+        drainer.check()
+        if cache is not None:
+            await cache.acheck()
+        else:
+            await arun_probes(registry.probes if probes is None else probes, request)
+    finally:
+        if close_connections:
+            await sync_to_async(close_old_connections)()
@@ -0,0 +1,119 @@
+"""
+A minimal client for the probe server that does not import Django, so that
+Kubernetes exec probes can check a running process in milliseconds, e.g.:
+
+    $ djk8s-probe --ready --socket /tmp/djk8s.sock
+
+If no probe server socket is specified, liveness checks are answered without
+importing Django and readiness checks use the minimal bootstrap in djk8s.bootstrap
+rather than setting up the whole project like manage.py probe does. Startup checks
+require the probe server, since only the running process knows if it has started.
+
+This module must only import from the standard library at module level.
+"""
+
+import os
+import sys
+import socket
+import argparse
+
+
+# The environment variable used to specify the probe server socket path.
+SOCKET_ENV = "DJK8S_PROBE_SOCKET"
+
+
+def request(path: str, command: str, timeout: float = 5.0):
+    """
+    Send a probe command to the probe server listening on the socket path.
+
+    :returns: A tuple of the status code and message from the server.
+    :raises OSError: If the probe server cannot be reached or does not respond.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(f"{command}\n".encode())
+
+        with sock.makefile("rb") as reader:
+            line = reader.readline().decode(errors="replace").strip()
+
+    status, _, content = line.partition(" ")
+    if not status.isdigit():
+        raise OSError(f"invalid response from probe server: {line!r}")
+    return int(status), content
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="djk8s-probe",
+        description="Probe the readiness and liveness state of a running Django process via its probe server.",
+    )
+
+    probes = parser.add_mutually_exclusive_group(required=True)
+    for command, pargs in {
+        "ready": ("-R", "--ready"),
+        "live": ("-L", "--live"),
+        "health": ("-H", "--health"),
+        "startup": ("-S", "--startup"),
+    }.items():
+        probes.add_argument(
+            *pargs,
+            dest="command",
+            action="store_const",
+            const=command,
+            help=f"check the {command} state of the container",
+        )
+
+    parser.add_argument(
+        "-s",
+        "--socket",
+        default=os.environ.get(SOCKET_ENV),
+        help=f"path to the probe server socket, default: ${SOCKET_ENV}",
+    )
+    parser.add_argument(
+        "--settings",
+        default=None,
+        help="the settings module used if there is no probe server, default: $DJANGO_SETTINGS_MODULE",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=5.0,
+        metavar="SEC",
+        help="number of seconds to wait for the probe server, default: 5",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        default=False,
+        help="suppress output for the probe check",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "startup" and not args.socket:
+        parser.error(f"--startup requires the probe server socket, use --socket or ${SOCKET_ENV}")
+
+    if args.socket:
+        try:
+            status, content = request(args.socket, args.command, timeout=args.timeout)
+        except OSError as e:
+            if not args.quiet:
+                sys.stderr.write(f"could not reach probe server at {args.socket}: {e}\n")
+            return 1
+    elif args.command == "ready":
+        # Readiness requires Django; import only what the configured probes need.
+        from djk8s import bootstrap
+
+        status, content = bootstrap.ready(args.settings)
+    else:
+        status, content = 200, "Ok"
+
+    if not args.quiet:
+        sys.stdout.write(f"{content}\n")
+    return 0 if status == 200 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
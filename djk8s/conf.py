@@ -1,6 +1,7 @@
 from typing import Sequence
 from dataclasses import dataclass
 from django.conf import settings as django_settings
+from django.core.signals import setting_changed
 from django.utils.module_loading import import_string
 
 
@@ -8,7 +9,7 @@ from django.utils.module_loading import import_string
 PREFIX = "DJK8S_"
 
 # All settings that are import strings should be imported when accessed.
-IMPORT_STRINGS = ("DJK8S_READINESS_PROBES",)
+IMPORT_STRINGS = ("DJK8S_READINESS_PROBES", "DJK8S_WARMUP_HOOKS")
 
 
 @dataclass(frozen=True)
@@ -16,6 +17,10 @@ class AppSettings(object):
     """
     This class defines the default settings for the djk8s app. These settings can be
     overridden using similar names in the Django settings module.
+
+    Resolved settings (including imported probe classes) are cached on first access;
+    the cache is cleared when a DJK8S_ setting is changed via the setting_changed
+    signal (e.g. by override_settings) or by calling reload().
     """
 
     DJK8S_READY_PATHS: Sequence[str] = ("/readyz",)
@@ -24,28 +29,144 @@ class AppSettings(object):
     DJK8S_HEALTH_PATHS: Sequence[str] = ("/healthz", "/livez")
     """The ProbeMiddleware will respond to GET requests at these paths with a 200 Ok and will abort the request."""
 
+    DJK8S_STARTUP_PATHS: Sequence[str] = ("/startupz",)
+    """The ProbeMiddleware will respond to GET requests at these paths with a 200 Ok once the warm-up hooks have completed and a 503 until then."""
+
+    DJK8S_DRAIN_PATHS: Sequence[str] = ()
+    """If set, the ProbeMiddleware will respond to GET requests at these paths (e.g. from a preStop hook) by draining the process and responding once the requests in flight have finished."""
+
+    DJK8S_METRICS_PATHS: Sequence[str] = ()
+    """If set, the ProbeMiddleware will respond to GET requests at these paths with readiness probe metrics in the Prometheus text format."""
+
     DJK8S_READINESS_PROBES: Sequence[str] = (
         "djk8s.probes.DatabaseProbe",
         "djk8s.probes.MemcachedProbe",
     )
     """A list of readiness probes to check before responding to a readiness request."""
 
+    DJK8S_DATABASE_PROBE_ALIASES: Sequence[str] = None
+    """The aliases of the databases checked by the DatabaseProbe; if not set, all configured databases are checked."""
+
+    DJK8S_MEMCACHED_PROBE_MODE: str = "stats"
+    """How the MemcachedProbe checks servers: "stats" fetches stats via the cache client and "version" sends a minimal version command to each server concurrently."""
+
+    DJK8S_REDIS_PROBE_LATENCY_BUDGET: float = None
+    """If set, the RedisProbe reports not ready if a redis server takes longer than this many seconds to respond to a ping."""
+
+    DJK8S_CACHE_PROBE_ALIASES: Sequence[str] = None
+    """The aliases of the caches checked by the CacheProbe; if not set, all configured caches are checked."""
+
+    DJK8S_CACHE_PROBE_LATENCY_BUDGET: float = None
+    """If set, the CacheProbe reports not ready if a cache takes longer than this many seconds to complete a set/get round-trip."""
+
+    DJK8S_LOAD_PROBE_MAX_INFLIGHT: int = None
+    """If set, the LoadProbe reports not ready while more than this many requests are being handled by the process."""
+
+    DJK8S_LOAD_PROBE_MAX_LATENCY: float = None
+    """If set, the LoadProbe reports not ready while the latency percentile of recent requests exceeds this many seconds."""
+
+    DJK8S_LOAD_PROBE_MAX_QUEUE_DELAY: float = None
+    """If set, the LoadProbe reports not ready while the percentile of the time recent requests spent queued (from X-Request-Start) exceeds this many seconds."""
+
+    DJK8S_LOAD_PROBE_PERCENTILE: float = 99
+    """The percentile of recent request latencies and queue delays compared to the LoadProbe thresholds."""
+
+    DJK8S_LOAD_PROBE_WINDOW: float = 30
+    """The number of seconds of recent requests used to compute the LoadProbe latency and queue delay percentiles."""
+
+    DJK8S_WARMUP_HOOKS: Sequence[str] = ()
+    """A list of callables that are run once per process before startup and readiness probes report ready; e.g. the hooks in djk8s.warmup."""
+
+    DJK8S_PROBE_WORKERS: int = None
+    """If set, readiness probes are run concurrently on a thread pool with this many workers so that timeouts can be enforced."""
+
+    DJK8S_PROBE_TIMEOUT: float = None
+    """The maximum number of seconds a single readiness probe may run when probes are run concurrently."""
+
+    DJK8S_PROBE_DEADLINE: float = None
+    """The maximum number of seconds all readiness probes may run when probes are run concurrently."""
+
+    DJK8S_READINESS_SUCCESS_THRESHOLD: int = 1
+    """The number of consecutive successful readiness checks required to become ready again after being not ready."""
+
+    DJK8S_READINESS_FAILURE_THRESHOLD: int = 1
+    """The number of consecutive failed readiness checks required to become not ready after being ready."""
+
+    DJK8S_PROBE_BREAKER_THRESHOLD: int = None
+    """If set, a readiness probe that fails this many times in a row is not run again until its circuit breaker backoff has passed."""
+
+    DJK8S_PROBE_BREAKER_BACKOFF: float = 1.0
+    """The number of seconds a probe's circuit breaker stays open the first time it opens; doubled (with jitter) every time the trial run fails."""
+
+    DJK8S_PROBE_BREAKER_MAX_BACKOFF: float = 60.0
+    """The maximum number of seconds a probe's circuit breaker stays open."""
+
+    DJK8S_DRAIN_TOKEN: str = None
+    """If set, drain requests must send this token in the X-Drain-Token header; otherwise only requests from the loopback interface may drain the process."""
+
+    DJK8S_DRAIN_ON_SIGTERM: bool = False
+    """If set, the ProbeMiddleware installs a SIGTERM handler that drains the process before passing the signal on to the server."""
+
+    DJK8S_DRAIN_TIMEOUT: float = 25
+    """The maximum number of seconds to wait for the requests in flight to finish when draining the process."""
+
+    DJK8S_DRAIN_DELAY: float = 0
+    """The minimum number of seconds to wait when draining the process so that the load balancers stop sending new requests."""
+
+    DJK8S_READINESS_CACHE_TTL: float = None
+    """If set, the ProbeMiddleware refreshes readiness results in a background thread every ttl seconds and serves readiness requests from the last result."""
+
+    DJK8S_READINESS_CACHE_MAX_AGE: float = None
+    """Cached readiness results older than this many seconds are reported as not ready; defaults to 3x the cache ttl."""
+
+    DJK8S_SHARED_STATUS_FILE: str = None
+    """If set with DJK8S_READINESS_CACHE_TTL, readiness results are refreshed by one elected process and shared with every process through this memory-mapped status file."""
+
+    DJK8S_PROBE_SOCKET: str = None
+    """If set, a probe server listening on this UNIX domain socket path is started when the app is loaded so the djk8s-probe client can probe the running process."""
+
+    DJK8S_PROBE_SERVER_PROGRAMS: Sequence[str] = ("gunicorn", "uvicorn", "daphne", "hypercorn", "celery worker")
+    """The programs (optionally followed by a required subcommand) that start the probe server; manage.py commands only start it for runserver."""
+
     DJK8S_MIGRATE_LOCK_ID: int = 1000
     """The ID of the lock used to prevent multiple migrations from running at the same time."""
 
+    DJK8S_MIGRATION_CACHE: str = None
+    """If set, the path of the migration cache written by the migrationcache command that is used to confirm the database is up to date without building the migration graph."""
+
+    def __post_init__(self):
+        object.__setattr__(self, "_cache", {})
+
     def __getattribute__(self, name: str) -> any:
         """
         Check if a Django project setting should override the app default.
         """
-        if name.startswith(PREFIX) and hasattr(django_settings, name):
+        if not name.startswith(PREFIX):
+            return super().__getattribute__(name)
+
+        cache = super().__getattribute__("_cache")
+        try:
+            return cache[name]
+        except KeyError:
+            pass
+
+        if hasattr(django_settings, name):
             val = getattr(django_settings, name)
         else:
             val = super().__getattribute__(name)
 
         if name in IMPORT_STRINGS:
-            return perform_import(val, name)
+            val = perform_import(val, name)
+
+        cache[name] = val
         return val
 
+    def reload(self):
+        """
+        Clear the cached settings so they are resolved again on next access.
+        """
+        self._cache.clear()
+
 
 def perform_import(val: str, name: str) -> any:
     """
@@ -69,3 +190,14 @@ def import_from_string(val: str, name: str) -> any:
 
 
 settings = AppSettings()
+
+
+def reload_settings(*args, **kwargs):
+    """
+    Clear the cached app settings when a djk8s setting is changed.
+    """
+    if kwargs["setting"].startswith(PREFIX):
+        settings.reload()
+
+
+setting_changed.connect(reload_settings)
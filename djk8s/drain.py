@@ -0,0 +1,198 @@
+import os
+import hmac
+import time
+import signal
+import logging
+import ipaddress
+import threading
+
+from djk8s.load import load
+from djk8s.conf import settings
+from djk8s.probes import NotReady
+from djk8s.metrics import metrics
+from djk8s.signals import readiness_changed
+from django.core.signals import setting_changed
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# The number of seconds between checks of the requests in flight while draining.
+DRAIN_POLL_INTERVAL = 0.05
+
+# The not ready message reported by readiness probes while the process is draining.
+DRAINING = "drain: process is shutting down"
+
+# The request header (as a WSGI environ key) that carries the DJK8S_DRAIN_TOKEN.
+DRAIN_TOKEN_HEADER = "HTTP_X_DRAIN_TOKEN"
+
+
+class Drain(object):
+    """
+    Drains the process before it shuts down so that rollouts do not fail requests.
+    Once draining has started, readiness probes report not ready so that the pod is
+    removed from the Service endpoints, and shutdown is delayed until the requests in
+    flight (as tracked by the ProbeMiddleware) have finished or the drain timeout has
+    passed.
+
+    Draining is started by an authorized request to one of the DJK8S_DRAIN_PATHS
+    (e.g. from a preStop hook) or, if DJK8S_DRAIN_ON_SIGTERM is set, by the SIGTERM
+    sent by the kubelet, in which case the signal is re-sent to the previous handler
+    once the process has drained. Draining is per process: a drain request only drains
+    the worker process that handles it.
+    """
+
+    def __init__(self, tracker=load):
+        self.tracker = tracker
+        self.draining = False
+        self._lock = threading.Lock()
+        self._thread = None
+        self._previous = None
+        self._drained = False
+
+    def check(self):
+        """
+        :raises NotReady: If the process is draining.
+        """
+        if self.draining:
+            raise NotReady(DRAINING)
+
+    def authorize(self, meta) -> bool:
+        """
+        Check that a drain request may drain the process: if DJK8S_DRAIN_TOKEN is set
+        the request must send it in the X-Drain-Token header, otherwise the request must
+        come from the loopback interface (e.g. a preStop exec hook that uses curl).
+
+        :param meta: The WSGI environ or request.META of the drain request.
+        """
+        token = settings.DJK8S_DRAIN_TOKEN
+        if token:
+            return hmac.compare_digest(meta.get(DRAIN_TOKEN_HEADER, "").encode(), token.encode())
+
+        try:
+            return ipaddress.ip_address(meta.get("REMOTE_ADDR", "")).is_loopback
+        except ValueError:
+            return False
+
+    def start(self):
+        """
+        Start draining; readiness probes report not ready from now on.
+        """
+        with self._lock:
+            if self.draining:
+                return
+            self.draining = True
+
+        logger.warning("draining process: readiness probes now report not ready")
+        metrics.set_ready(False)
+        readiness_changed.send(sender=self.__class__, ready=False, error=NotReady(DRAINING))
+
+    def wait(self, timeout: float = None, delay: float = None, inflight: int = 0) -> bool:
+        """
+        Start draining and block until no more than the given number of requests are
+        in flight (e.g. 1 if called while handling a request) or the timeout passes.
+
+        :param timeout: The maximum number of seconds to wait, by default the
+            DJK8S_DRAIN_TIMEOUT setting.
+        :param delay: The minimum number of seconds to wait so that the endpoints
+            update propagates to the load balancers, by default DJK8S_DRAIN_DELAY.
+        :param inflight: The number of requests that may remain in flight.
+        :returns: True if the process drained or False if the timeout passed.
+        """
+        self.start()
+        timeout = settings.DJK8S_DRAIN_TIMEOUT if timeout is None else timeout
+        delay = settings.DJK8S_DRAIN_DELAY if delay is None else delay
+
+        started = time.monotonic()
+        deadline = started + max(timeout, delay)
+        while True:
+            now = time.monotonic()
+            if now - started >= delay and self.tracker.inflight <= inflight:
+                logger.info(f"process drained after {now - started:0.2f}s")
+                return True
+
+            if now >= deadline:
+                logger.warning(
+                    f"process did not drain after {timeout:g}s, "
+                    f"{self.tracker.inflight} requests still in flight"
+                )
+                return False
+
+            time.sleep(min(DRAIN_POLL_INTERVAL, deadline - now))
+
+    def install(self) -> bool:
+        """
+        Install a SIGTERM handler that drains the process before re-sending the signal
+        to the previously installed handler (e.g. the server's graceful shutdown).
+        Signal handlers can only be installed from the main thread.
+
+        :returns: True if the handler was installed.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            logger.warning("could not install drain SIGTERM handler outside of the main thread")
+            return False
+
+        previous = signal.getsignal(signal.SIGTERM)
+        if previous is self.handle_sigterm:
+            return True
+
+        self._previous = previous
+        signal.signal(signal.SIGTERM, self.handle_sigterm)
+        return True
+
+    def handle_sigterm(self, signum, frame):
+        """
+        Start draining and wait for the requests in flight in a thread, since the
+        signal handler runs in the main thread which may be serving requests. Once the
+        process has drained the signal is re-sent and passed to the previous handler.
+        """
+        if self._drained:
+            return self.forward(signum, frame)
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self.shutdown, args=(signum,), name="djk8s-drain", daemon=True
+            )
+        self._thread.start()
+
+    def shutdown(self, signum: int = signal.SIGTERM):
+        """
+        Drain the process, then re-send the signal to the process so that the server
+        shuts down as it would have without draining.
+        """
+        self.wait()
+        self._drained = True
+        os.kill(os.getpid(), signum)
+
+    def forward(self, signum, frame):
+        """
+        Pass the signal to the handler that was installed before the drain handler.
+        """
+        previous = self._previous
+        if callable(previous):
+            return previous(signum, frame)
+
+        if previous != signal.SIG_IGN:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+    def reset(self):
+        with self._lock:
+            self.draining = False
+            self._drained = False
+            self._thread = None
+
+
+drainer = Drain()
+
+
+def reset_drain(*args, **kwargs):
+    """
+    Stop draining when a drain setting is changed (e.g. by override_settings in tests).
+    """
+    if kwargs["setting"].startswith("DJK8S_DRAIN_"):
+        drainer.reset()
+
+
+setting_changed.connect(reset_drain)
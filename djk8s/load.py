@@ -0,0 +1,141 @@
+import math
+import time
+import threading
+
+from array import array
+from djk8s.conf import settings
+
+
+# The minimum number of samples in the window before a percentile is reported so that
+# a single slow request does not take the process out of rotation.
+MIN_SAMPLES = 10
+
+# The number of samples kept in each rolling window.
+WINDOW_SAMPLES = 1024
+
+
+class RollingWindow(object):
+    """
+    A fixed size ring buffer of timestamped samples stored in compact arrays, used to
+    compute percentiles over the samples recorded in the last few seconds. Once the
+    buffer is full the oldest samples are overwritten.
+    """
+
+    __slots__ = ("size", "values", "times", "index", "count")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = array("d", bytes(8 * size))
+        self.times = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: float, now: float):
+        self.values[self.index] = value
+        self.times[self.index] = now
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def percentile(self, q: float, since: float) -> float:
+        """
+        Compute the nearest-rank percentile of the samples recorded since the given time.
+
+        :param q: The percentile to compute between 0 and 100.
+        :param since: The monotonic time of the oldest sample to include.
+        :returns: The percentile or None if there are fewer than MIN_SAMPLES samples.
+        """
+        samples = sorted(
+            value
+            for value, recorded in zip(self.values[: self.count], self.times[: self.count])
+            if recorded >= since
+        )
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[max(math.ceil(q / 100 * len(samples)) - 1, 0)]
+
+
+class LoadTracker(object):
+    """
+    Tracks the load on the process from the requests passing through the
+    ProbeMiddleware: the number of requests in flight, the latency of recent requests,
+    and the time recent requests spent queued before reaching the process as reported
+    by the X-Request-Start header set by the load balancer or proxy.
+    """
+
+    def __init__(self, samples: int = WINDOW_SAMPLES):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def started(self, request) -> float:
+        """
+        Record that a request has started and return the start time to pass to finished.
+        """
+        now = time.monotonic()
+        delay = queue_delay(request.META.get("HTTP_X_REQUEST_START"), time.time())
+        with self._lock:
+            self.inflight += 1
+            if delay is not None:
+                self.queue.add(delay, now)
+        return now
+
+    def finished(self, start: float):
+        """
+        Record that a request has finished.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.inflight -= 1
+            self.latency.add(now - start, now)
+
+    def latency_percentile(self, q: float) -> float:
+        """
+        The percentile of request latencies in seconds over the DJK8S_LOAD_PROBE_WINDOW.
+        """
+        since = time.monotonic() - settings.DJK8S_LOAD_PROBE_WINDOW
+        with self._lock:
+            return self.latency.percentile(q, since)
+
+    def queue_percentile(self, q: float) -> float:
+        """
+        The percentile of request queue delays in seconds over the DJK8S_LOAD_PROBE_WINDOW.
+        """
+        since = time.monotonic() - settings.DJK8S_LOAD_PROBE_WINDOW
+        with self._lock:
+            return self.queue.percentile(q, since)
+
+    def reset(self):
+        with self._lock:
+            self.inflight = 0
+            self.latency = RollingWindow(self.samples)
+            self.queue = RollingWindow(self.samples)
+
+
+def queue_delay(header: str, now: float) -> float:
+    """
+    Parse an X-Request-Start header and return the number of seconds since the request
+    was received by the proxy or None if the header is missing or malformed. The header
+    may be prefixed with "t=" and may be in seconds (e.g. nginx's $msec), milliseconds,
+    or microseconds since the epoch.
+    """
+    if not header:
+        return None
+
+    if header.startswith("t="):
+        header = header[2:]
+
+    try:
+        start = float(header)
+    except ValueError:
+        return None
+
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+
+    return max(now - start, 0.0)
+
+
+load = LoadTracker()
@@ -1,6 +1,9 @@
 import os
+import json
 
+from concurrent.futures import ThreadPoolExecutor
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.core.management.base import BaseCommand, CommandError
@@ -14,7 +17,7 @@ DJANGO_ADMIN_EMAIL = os.environ.get("DJANGO_ADMIN_EMAIL", None)
 
 class Command(BaseCommand):
 
-    help = "Ensures that a Django superuser exists with credentials from environment variables."
+    help = "Ensures that a Django superuser (or the users in a file) exists with credentials from environment variables."
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -49,6 +52,16 @@ class Command(BaseCommand):
                 "choices": tuple(connections),
                 "help": "Specifies the database to use. Default is 'default'.",
             },
+            ("-f", "--file"): {
+                "type": str,
+                "default": None,
+                "help": "A JSON or YAML file with a list of users to create if they do not exist",
+            },
+            ("-w", "--workers"): {
+                "type": int,
+                "default": 1,
+                "help": "The number of threads used to hash passwords with --file, default: 1",
+            },
         }
 
         for pargs, kwargs in args.items():
@@ -57,6 +70,9 @@ class Command(BaseCommand):
             parser.add_argument(*pargs, **kwargs)
 
     def handle(self, *args, **options):
+        if options["file"]:
+            return self.handle_file(options["file"], options["database"], options["workers"])
+
         if not options["username"]:
             raise CommandError(
                 "Username is required. Set DJANGO_ADMIN_USERNAME or use --username."
@@ -67,24 +83,145 @@ class Command(BaseCommand):
                 "Password is required. Set DJANGO_ADMIN_PASSWORD or use --password."
             )
 
+        # The username is set last in case the user model uses the email as username.
         info = {
+            self.email_field.name: options["email"],
             self.username_field.name: options["username"],
             self.password_field: options["password"],
-            self.email_field.name: options["email"],
         }
 
+        db = self.UserModel._default_manager.db_manager(options["database"])
+
+        # Check if the user already exists before validating and hashing the password.
+        if db.filter(**{self.username_field.name: info[self.username_field.name]}).exists():
+            self.stdout.write("Admin user already exists, service is ready.")
+            return
+
         # Validate the password
         try:
             validate_password(password=info[self.password_field], user=None)
         except ValidationError as e:
             raise CommandError(f"Password validation error: {e}")
 
-        db = self.UserModel._default_manager.db_manager(options["database"])
+        db.create_superuser(**info)
+        self.stdout.write("Admin user created from environment variables.")
+
+    def handle_file(self, path, database, workers=1):
+        """
+        Create the users in the file that do not already exist. The existing users are
+        fetched in a single query and only the passwords of new users are validated
+        and hashed (concurrently) before the new users are created in bulk.
+        """
+        if workers < 1:
+            raise CommandError("Workers must be at least 1.")
+
+        users = self.load_users(path)
+        db = self.UserModel._default_manager.db_manager(database)
+        username = self.username_field.name
+
+        existing = set(
+            db.filter(**{f"{username}__in": [user[username] for user in users]})
+            .values_list(username, flat=True)
+        )
+        users = [user for user in users if user[username] not in existing]
+
+        errors = []
+        for user in users:
+            try:
+                validate_password(password=user[self.password_field], user=None)
+            except ValidationError as e:
+                errors.append(f"{user[username]}: {e}")
+
+        if errors:
+            raise CommandError(f"Password validation error: {'; '.join(errors)}")
+
+        passwords = [user[self.password_field] for user in users]
+        if len(passwords) > 1 and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                passwords = list(executor.map(make_password, passwords))
+        else:
+            passwords = [make_password(password) for password in passwords]
+
+        for user, password in zip(users, passwords):
+            user[self.password_field] = password
+
+        db.bulk_create([self.UserModel(**user) for user in users], ignore_conflicts=True)
+
+        # Conflicting rows (e.g. users created by another process since the query) are
+        # skipped by the insert, so count the users rather than the rows inserted.
+        created = 0
+        if users:
+            created = db.filter(**{f"{username}__in": [user[username] for user in users]}).count()
+        self.stdout.write(
+            f"Created {created} users from {path}, {len(existing) + len(users) - created} already exist."
+        )
 
-        # Check if the user already exists, create if not.
+    def load_users(self, path):
+        """
+        Load and normalize the list of users from a JSON or YAML file. Each user must
+        have a username and password and may have an email and any other field of the
+        user model (e.g. is_staff, is_superuser, or first_name).
+        """
         try:
-            db.get(username=info[self.username_field.name])
-            self.stdout.write("Admin user already exists, service is ready.")
-        except self.UserModel.DoesNotExist:
-            db.create_superuser(**info)
-            self.stdout.write("Admin user created from environment variables.")
+            with open(path, "r") as f:
+                if path.endswith((".yaml", ".yml")):
+                    try:
+                        import yaml
+                    except ImportError:
+                        raise CommandError("PyYAML is required to load users from YAML files.")
+                    data = yaml.safe_load(f)
+                else:
+                    data = json.load(f)
+        except CommandError:
+            raise
+        except Exception as e:
+            raise CommandError(f"Could not load users from {path}: {e}")
+
+        if isinstance(data, dict):
+            data = data.get("users")
+
+        if not isinstance(data, list):
+            raise CommandError(f"{path} must contain a list of users.")
+
+        # Fields that are set by the command or would be saved without validation.
+        fields = {
+            field.name for field in self.UserModel._meta.concrete_fields
+            if not field.primary_key and not field.is_relation
+        }
+        fields -= {self.username_field.name, self.password_field, self.email_field.name}
+
+        users = []
+        usernames = set()
+        for i, item in enumerate(data):
+            if not isinstance(item, dict) or not item.get("username") or not item.get("password"):
+                raise CommandError(f"User {i} in {path} must have a username and password.")
+
+            unknown = set(item) - fields - {"username", "password", "email"}
+            if unknown:
+                raise CommandError(
+                    f"User {i} in {path} has unknown fields: {', '.join(sorted(unknown))}."
+                )
+
+            username = self.UserModel.normalize_username(item["username"])
+            if username in usernames:
+                raise CommandError(f"User {username} is specified more than once in {path}.")
+            usernames.add(username)
+
+            user = {key: value for key, value in item.items() if key in fields}
+            user.update({
+                self.username_field.name: username,
+                self.password_field: item["password"],
+            })
+
+            # If the user model uses the email as username the email is the username.
+            email = self.UserModel._default_manager.normalize_email(item.get("email") or "")
+            if self.email_field.name != self.username_field.name:
+                user[self.email_field.name] = email
+            elif email and email != username:
+                raise CommandError(f"User {i} in {path} has an email that differs from its username.")
+            if "is_superuser" in fields:
+                user["is_superuser"] = bool(item.get("is_superuser", False))
+                if "is_staff" in fields:
+                    user["is_staff"] = bool(item.get("is_staff", user["is_superuser"]))
+            users.append(user)
+        return users
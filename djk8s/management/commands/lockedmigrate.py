@@ -1,8 +1,71 @@
+import time
+import zlib
+import threading
+
+from djk8s.plan import migrated
 from djk8s.conf import settings
-from django.db import connections
+from concurrent.futures import ThreadPoolExecutor
+from django.db import DEFAULT_DB_ALIAS, connections
+from djk8s.wait import Backoff, LOG_INTERVAL
+from django.core.management.base import CommandError
+from django.db.migrations.executor import MigrationExecutor
 from django.core.management.commands.migrate import Command as MigrateCommand
 
 
+# Options that change what migrate does, in which case the fast path is not used.
+MIGRATE_OPTIONS = (
+    "app_label",
+    "fake",
+    "fake_initial",
+    "plan",
+    "run_syncdb",
+    "check_unapplied",
+    "prune",
+)
+
+
+def alias_lock_id(lock_id: int, alias: str) -> int:
+    """
+    Return the advisory lock ID for the database alias with --all-databases: the lock
+    ID itself for the default database and the lock ID in the upper 32 bits combined
+    with the CRC32 of the alias in the lower 32 bits for any other database. Migrating
+    a single database always uses the lock ID as given.
+    """
+    if alias == DEFAULT_DB_ALIAS:
+        return lock_id
+    return ((lock_id & 0x7FFFFFFF) << 32) | zlib.crc32(alias.encode())
+
+
+class PrefixedStream(object):
+    """
+    A file-like object that writes complete lines to an output wrapper prefixed with
+    the database alias, so the output of concurrent migrations is not interleaved.
+    """
+
+    def __init__(self, out, alias: str, lock: threading.Lock):
+        self.out = out
+        self.prefix = f"[{alias}] "
+        self.lock = lock
+        self.buffer = ""
+
+    def write(self, msg):
+        self.buffer += msg
+        *lines, self.buffer = self.buffer.split("\n")
+        if lines:
+            with self.lock:
+                for line in lines:
+                    self.out.write(self.prefix + line)
+
+    def flush(self):
+        if self.buffer:
+            self.write("\n")
+        with self.lock:
+            self.out.flush()
+
+    def isatty(self):
+        return self.out.isatty()
+
+
 class Command(MigrateCommand):
 
     help = (
@@ -20,9 +83,92 @@ class Command(MigrateCommand):
                 "The advisory lock ID to use for migrations."
             ),
         )
+        parser.add_argument(
+            "-T",
+            "--lock-timeout",
+            type=float,
+            default=None,
+            metavar="SEC",
+            help=(
+                "The number of seconds to wait for the advisory lock; "
+                "waits indefinitely by default."
+            ),
+        )
+        parser.add_argument(
+            "--all-databases",
+            action="store_true",
+            help="Migrate all configured databases concurrently.",
+        )
+        parser.add_argument(
+            "-j",
+            "--parallel",
+            type=int,
+            default=4,
+            metavar="N",
+            help=(
+                "The maximum number of databases to migrate concurrently "
+                "with --all-databases, default: 4."
+            ),
+        )
         return super().add_arguments(parser)
 
     def handle(self, *args, **options):
+        if options["all_databases"]:
+            return self.migrate_all(*args, **options)
+        return self.migrate(*args, **options)
+
+    def migrate_all(self, *args, **options):
+        """
+        Migrate every configured database on a bounded thread pool, each with its own
+        advisory lock, reporting the progress and failure of every database.
+        """
+        if options["parallel"] < 1:
+            raise CommandError("Parallel must be at least 1.")
+
+        aliases = list(connections)
+        if not options["skip_checks"]:
+            self.check(databases=aliases)
+        options["skip_checks"] = True
+
+        lock = threading.Lock()
+        with ThreadPoolExecutor(
+            max_workers=min(options["parallel"], len(aliases)),
+            thread_name_prefix="djk8s-migrate",
+        ) as executor:
+            futures = {
+                alias: executor.submit(self.migrate_alias, alias, lock, *args, **options)
+                for alias in aliases
+            }
+
+        failed = []
+        for alias, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(alias)
+                self.stderr.write(f"[{alias}] migration failed: {e}")
+
+        if failed:
+            raise CommandError(f"Migrations failed for databases: {', '.join(failed)}")
+
+    def migrate_alias(self, alias, lock, *args, **options):
+        """
+        Migrate a single database in the calling thread with a new command instance
+        whose output is prefixed with the alias.
+        """
+        stdout = PrefixedStream(self.stdout, alias, lock)
+        stderr = PrefixedStream(self.stderr, alias, lock)
+        command = Command(stdout=stdout, stderr=stderr, no_color=options["no_color"])
+        try:
+            lock_id = alias_lock_id(options["lock_id"], alias)
+            command.migrate(*args, **{**options, "database": alias, "lock_id": lock_id})
+        finally:
+            stdout.flush()
+            stderr.flush()
+            # Connections are per-thread, so close the connection opened by this thread.
+            connections[alias].close()
+
+    def migrate(self, *args, **options):
         database = options["database"]
         if not options["skip_checks"]:
             self.check(databases=[database])
@@ -30,10 +176,72 @@ class Command(MigrateCommand):
         conn = connections[database]
         conn.prepare_database()
 
+        # If there is nothing to migrate, exit without waiting for the lock; the
+        # migration cache (if any) is checked first to avoid building the graph.
+        executor = None
+        if not any(options.get(opt) for opt in MIGRATE_OPTIONS):
+            if not migrated(conn):
+                executor = MigrationExecutor(conn)
+            if executor is None or not self.migration_plan(executor):
+                if options["verbosity"] >= 1:
+                    self.stdout.write("No migrations to apply.")
+                return
+
         lock_id = options["lock_id"]
         with conn.cursor() as cursor:
-            cursor.execute("SELECT pg_advisory_lock(%s);", [lock_id])
+            self.acquire_lock(cursor, lock_id, options["lock_timeout"], options["verbosity"])
             try:
+                # Another process may have applied the migrations while we waited.
+                if executor is not None and (
+                    migrated(conn) or not self.migration_plan(executor, reload=True)
+                ):
+                    if options["verbosity"] >= 1:
+                        self.stdout.write("No migrations to apply; applied by another process.")
+                    return
                 super().handle(*args, **options)
             finally:
                 cursor.execute("SELECT pg_advisory_unlock(%s);", [lock_id])
+
+    def migration_plan(self, executor, reload=False):
+        """
+        Return the plan to migrate all apps to their latest migrations. If reload is
+        True, the applied migrations are read from the database again without
+        rebuilding the migration graph.
+        """
+        if reload:
+            executor.loader.applied_migrations = executor.recorder.applied_migrations()
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+    def acquire_lock(self, cursor, lock_id, timeout=None, verbosity=1):
+        """
+        Poll for the advisory lock with pg_try_advisory_lock until it is acquired,
+        writing progress at most once every LOG_INTERVAL seconds.
+
+        :raises CommandError: If the lock is not acquired before the timeout.
+        """
+        backoff = Backoff()
+        start = time.monotonic()
+        logged = None
+
+        while True:
+            cursor.execute("SELECT pg_try_advisory_lock(%s);", [lock_id])
+            if cursor.fetchone()[0]:
+                return
+
+            now = time.monotonic()
+            if timeout is not None and now - start >= timeout:
+                raise CommandError(
+                    f"Could not acquire migration lock {lock_id} after {timeout:g}s."
+                )
+
+            if verbosity >= 1 and (logged is None or now - logged >= LOG_INTERVAL):
+                self.stdout.write(
+                    f"Waiting for migration lock {lock_id} held by another process "
+                    f"(elapsed: {now - start:.1f}s)"
+                )
+                logged = now
+
+            delay = backoff.next()
+            if timeout is not None:
+                delay = min(delay, start + timeout - now)
+            time.sleep(delay)
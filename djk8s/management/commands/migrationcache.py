@@ -0,0 +1,47 @@
+from djk8s.conf import settings
+from djk8s.plan import build_cache, load_cache
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+
+    help = "Writes the migration cache used to check for unapplied migrations without building the migration graph."
+
+    def add_arguments(self, parser):
+        args = {
+            ("-o", "--output"): {
+                "default": None,
+                "metavar": "PATH",
+                "help": "path to write the migration cache to, default: DJK8S_MIGRATION_CACHE",
+            },
+            ("-c", "--check"): {
+                "action": "store_true",
+                "help": "exit with an error if the migration cache is missing or out of date instead of writing it",
+            },
+        }
+
+        for pargs, kwargs in args.items():
+            if isinstance(pargs, str):
+                pargs = (pargs,)
+            parser.add_argument(*pargs, **kwargs)
+
+    def handle(self, *args, **options):
+        path = options["output"] or settings.DJK8S_MIGRATION_CACHE
+        if not path:
+            raise CommandError("Specify the cache path with --output or DJK8S_MIGRATION_CACHE.")
+
+        if options["check"]:
+            if load_cache(path) is None:
+                raise CommandError(f"Migration cache {path} is missing or out of date.")
+            if options["verbosity"] >= 1:
+                self.stdout.write(f"Migration cache {path} is up to date.")
+            return
+
+        try:
+            cache = build_cache(path)
+        except OSError as e:
+            raise CommandError(f"Could not write migration cache {path}: {e}")
+
+        if options["verbosity"] >= 1:
+            count = sum(len(names) for names in cache["migrations"].values())
+            self.stdout.write(f"Wrote migration cache for {count} migrations to {path}.")
@@ -1,7 +1,8 @@
 import sys
 
-from djk8s.conf import settings
-from djk8s.probes import NotReady, ReadinessProbe
+from djk8s.runner import run_probes
+from djk8s.probes import NotReady, registry
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.base import BaseCommand, CommandError
 
 
@@ -9,6 +10,9 @@ class Command(BaseCommand):
 
     help = "Allows Kubernetes to probe the readiness and liveness state of the container with an exec instead of an HTTP request."
 
+    # Probes run frequently and must be fast, so skip the system checks.
+    requires_system_checks = []
+
     def add_arguments(self, parser):
         args = {
             "readiness": ("-R", "--ready"),
@@ -50,25 +54,14 @@ class Command(BaseCommand):
         sys.exit(0)
 
     def readyz(self, quiet=False):
-        # Perform readiness checks
-        probes = [Probe() for Probe in settings.DJK8S_READINESS_PROBES]
-
-        # Ensure all probes are instances of ReadinessProbe.
-        for probe in probes:
-            if not isinstance(probe, ReadinessProbe):
-                raise CommandError(
-                    f"probe {probe} is not an instance of ReadinessProbe."
-                )
-
-        # If no probes are configured, raise an error.
-        if not probes:
-            raise CommandError(
-                "no readiness probes configured for Django Kubernetes ProbeMiddleware."
-            )
+        # Perform readiness checks with the shared, validated readiness probes.
+        try:
+            probes = registry.probes
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
 
         try:
-            for probe in probes:
-                probe.ready(None)  # Pass None as request since we don't have one
+            run_probes(probes, None)  # Pass None as request since we don't have one
         except NotReady as e:
             if not quiet:
                 self.stdout.write(str(e) + "\n")
@@ -1,55 +1,99 @@
-import sys
-from time import time, sleep
-
+from functools import partial
+from djk8s.probes import connect
+from djk8s.wait import Backoff, wait_all, wait_until, write_stderr
 from django.db.utils import OperationalError
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.core.management.base import BaseCommand, CommandError
 
 
+# Default ports of database backends that connect over TCP, used for the pre-check.
+DEFAULT_PORTS = {"postgresql": 5432, "mysql": 3306, "oracle": 1521}
+
+
 def wait_for_database(
-    timeout=180, stable=5, interval=1, database=DEFAULT_DB_ALIAS, **kwargs
+    timeout=180,
+    stable=5,
+    interval=0.25,
+    max_interval=5,
+    database=DEFAULT_DB_ALIAS,
+    log=write_stderr,
+    **kwargs,
 ):
     """
-    Waits for the database to be ready and stable before returning.
+    Waits for the database to be ready and stable before returning. Before every full
+    connection attempt a TCP connection is made to the database server (if it has a
+    host) so that a server that is not yet listening is detected cheaply.
 
     :param timeout: Maximum time to wait for the database to be ready (in seconds).
     :param stable: Time to wait for the database to remain stable (in seconds).
-    :param interval: Time between checks for database readiness (in seconds).
+    :param interval: Initial time between checks for database readiness (in seconds).
+    :param max_interval: Maximum time between checks when backing off (in seconds).
     :param database: The database alias to check.
+    :param log: A callable to write progress messages to or None to be silent.
+    :returns: The number of seconds waited.
+    :raises TimeoutError: If the database is not ready before the timeout.
     """
-    alive_start = None
-    connection = connections[database]
-    start = time()
+    try:
+        return wait_until(
+            lambda: check_database(database),
+            timeout=timeout,
+            stable=stable,
+            backoff=Backoff(interval, max_interval),
+            log=log,
+            name=f"database '{database}'",
+            errors=(OperationalError, OSError),
+        )
+    finally:
+        # Connections are per-thread, so close the connection opened by this thread.
+        connections[database].close()
+
+
+def wait_for_databases(databases, **kwargs):
+    """
+    Waits for all of the databases to be ready and stable concurrently.
 
-    while True:
-        # loop until we have a connection or timeout is reached
-        while True:
-            try:
-                connection.cursor().execute("SELECT 1")
-                if not alive_start:
-                    alive_start = time()
-                break
-            except OperationalError as e:
-                alive_start = None
+    :param databases: The database aliases to check.
+    :param kwargs: The arguments to wait_for_database.
+    :raises TimeoutError: If any of the databases are not ready before the timeout.
+    """
+    wait_all([partial(wait_for_database, database=alias, **kwargs) for alias in databases])
 
-                elapsed = time() - start
-                if elapsed > timeout:
-                    raise TimeoutError("Could not establish database connection") from e
 
-                msg = str(e).strip()
-                sys.stderr.write(
-                    f"Database not ready: (cause: {msg}, elapsed: {elapsed}s\n"
-                )
-                sys.stderr.flush()
+def check_database(alias):
+    """
+    Check that the database server accepts TCP connections and then that a query can
+    be executed, closing the connection if it fails so that it is reopened next time.
+
+    :raises OSError: If the database server is not accepting connections.
+    :raises OperationalError: If the query could not be executed.
+    """
+    conn = connections[alias]
+    address = database_address(conn)
+    if address is not None:
+        with connect(address, timeout=1.0):
+            pass
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except OperationalError:
+        conn.close()
+        raise
 
-                sleep(interval)
 
-        uptime = int(time() - alive_start)
-        sys.stdout.write(f"Connection alive for > {uptime}s\n")
+def database_address(conn):
+    """
+    Return the (host, port) of the database server or None if the connection does not
+    use a single TCP host (e.g. sqlite, UNIX domain sockets, or multiple hosts).
+    """
+    host = conn.settings_dict.get("HOST")
+    if not host or host.startswith("/") or "," in host:
+        return None
 
-        if uptime >= stable:
-            break
-        sleep(interval)
+    port = conn.settings_dict.get("PORT") or DEFAULT_PORTS.get(conn.vendor)
+    if not port:
+        return None
+    return (host, int(port))
 
 
 class Command(BaseCommand):
@@ -59,26 +103,38 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         args = {
             ("-t", "--timeout"): {
-                "type": int,
+                "type": float,
                 "default": 180,
                 "metavar": "SEC",
                 "help": "number of seconds to wait for database until timeout, default: 180",
             },
             ("-s", "--stable"): {
-                "type": int,
+                "type": float,
                 "default": 5,
                 "metavar": "SEC",
                 "help": "stability timeout to wait for continuous database connection, default: 5",
             },
             ("-i", "--interval"): {
-                "type": int,
-                "default": 1,
+                "type": float,
+                "default": 0.25,
+                "metavar": "SEC",
+                "help": "number of seconds to wait between database checks, default: 0.25",
+            },
+            ("-m", "--max-interval"): {
+                "type": float,
+                "default": 5,
                 "metavar": "SEC",
-                "help": "number of seconds to wait between database checks, default: 1",
+                "help": "maximum number of seconds to back off between failed checks, default: 5",
             },
             ("-d", "--database"): {
-                "default": DEFAULT_DB_ALIAS,
-                "help": "which database to wait for, default: 'default'",
+                "action": "append",
+                "dest": "databases",
+                "metavar": "DATABASE",
+                "help": "which database to wait for (may be repeated), default: 'default'",
+            },
+            ("-a", "--all"): {
+                "action": "store_true",
+                "help": "wait for all configured databases",
             },
         }
 
@@ -89,17 +145,40 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         self.validate(**options)
-        wait_for_database(**options)
+
+        if options["all"]:
+            databases = list(connections)
+        else:
+            databases = options["databases"] or [DEFAULT_DB_ALIAS]
+
+        try:
+            wait_for_databases(
+                databases,
+                timeout=options["timeout"],
+                stable=options["stable"],
+                interval=options["interval"],
+                max_interval=options["max_interval"],
+                log=write_stderr if options["verbosity"] > 0 else None,
+            )
+        except TimeoutError as e:
+            raise CommandError(str(e))
 
     def validate(self, **options):
         if options.get("timeout", 0) <= 0:
             raise CommandError("Timeout must be greater than 0 seconds.")
 
-        if options.get("stable", 0) <= 0:
-            raise CommandError("Stability timeout must be greater than 0 seconds.")
+        if options.get("stable", 0) < 0:
+            raise CommandError("Stability timeout must not be negative.")
 
         if options.get("interval", 0) <= 0:
             raise CommandError("Interval must be greater than 0 seconds.")
 
-        if not options.get("database"):
-            raise CommandError("Database must be specified.")
+        if options.get("max_interval", 0) < options.get("interval", 0):
+            raise CommandError("Maximum interval must be greater than or equal to the interval.")
+
+        if options.get("all") and options.get("databases"):
+            raise CommandError("Specify either --all or --database, not both.")
+
+        for alias in options.get("databases") or []:
+            if alias not in connections:
+                raise CommandError(f"Database '{alias}' is not configured.")
@@ -0,0 +1,153 @@
+from functools import partial
+from django.db import connections
+from djk8s.conf import import_from_string
+from djk8s.runner import run_probes
+from djk8s.wait import Backoff, wait_all, wait_until, write_stderr
+from djk8s.probes import ReadinessProbe, registry
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+
+def wait_for_probe(
+    probe,
+    timeout=180,
+    stable=5,
+    interval=0.25,
+    max_interval=5,
+    log=None,
+    **kwargs,
+):
+    """
+    Waits for the readiness probe to be ready and stable before returning, with the
+    same timeout, stability, and backoff semantics as wait_for_database. Each check is
+    run with run_probes so that probe timeouts and circuit breakers apply, and any
+    error raised by the probe is retried like a probe that is not ready.
+
+    :param probe: The readiness probe instance to check.
+    :param timeout: Maximum time to wait for the probe to be ready (in seconds).
+    :param stable: Time to wait for the probe to remain ready (in seconds).
+    :param interval: Initial time between checks of the probe (in seconds).
+    :param max_interval: Maximum time between checks when backing off (in seconds).
+    :param log: A callable to write progress messages to or None to be silent.
+    :returns: The number of seconds waited.
+    :raises TimeoutError: If the probe is not ready before the timeout.
+    """
+    try:
+        return wait_until(
+            lambda: run_probes([probe], report=False),
+            timeout=timeout,
+            stable=stable,
+            backoff=Backoff(interval, max_interval),
+            log=log,
+            name=probe.name,
+        )
+    finally:
+        # Connections are per-thread, so close any connections opened by this thread.
+        connections.close_all()
+
+
+def wait_for_probes(probes, **kwargs):
+    """
+    Waits for all of the readiness probes to be ready and stable concurrently.
+
+    :param probes: The readiness probe instances to check.
+    :param kwargs: The arguments to wait_for_probe.
+    :raises TimeoutError: If any of the probes are not ready before the timeout.
+    """
+    wait_all([partial(wait_for_probe, probe, **kwargs) for probe in probes])
+
+
+class Command(BaseCommand):
+
+    help = "Waits for the readiness probes to be ready before exiting."
+
+    def add_arguments(self, parser):
+        args = {
+            ("-t", "--timeout"): {
+                "type": float,
+                "default": 180,
+                "metavar": "SEC",
+                "help": "number of seconds to wait for the probes until timeout, default: 180",
+            },
+            ("-s", "--stable"): {
+                "type": float,
+                "default": 5,
+                "metavar": "SEC",
+                "help": "number of seconds the probes must be continuously ready, default: 5",
+            },
+            ("-i", "--interval"): {
+                "type": float,
+                "default": 0.25,
+                "metavar": "SEC",
+                "help": "number of seconds to wait between probe checks, default: 0.25",
+            },
+            ("-m", "--max-interval"): {
+                "type": float,
+                "default": 5,
+                "metavar": "SEC",
+                "help": "maximum number of seconds to back off between failed checks, default: 5",
+            },
+            ("-p", "--probe"): {
+                "action": "append",
+                "dest": "probes",
+                "metavar": "PROBE",
+                "help": "import path of a readiness probe to wait for (may be repeated), default: DJK8S_READINESS_PROBES",
+            },
+        }
+
+        for pargs, kwargs in args.items():
+            if isinstance(pargs, str):
+                pargs = (pargs,)
+            parser.add_argument(*pargs, **kwargs)
+
+    def handle(self, *args, **options):
+        self.validate(**options)
+        probes = self.get_probes(options["probes"])
+
+        try:
+            wait_for_probes(
+                probes,
+                timeout=options["timeout"],
+                stable=options["stable"],
+                interval=options["interval"],
+                max_interval=options["max_interval"],
+                log=write_stderr if options["verbosity"] > 0 else None,
+            )
+        except TimeoutError as e:
+            raise CommandError(str(e))
+
+    def get_probes(self, paths=None):
+        """
+        Instantiate the readiness probes at the import paths or return the configured
+        readiness probes if no paths are specified.
+        """
+        if not paths:
+            try:
+                return registry.probes
+            except ImproperlyConfigured as e:
+                raise CommandError(str(e))
+
+        probes = []
+        for path in paths:
+            try:
+                Probe = import_from_string(path, "--probe")
+            except ImportError as e:
+                raise CommandError(str(e))
+
+            if not isinstance(Probe, type) or not issubclass(Probe, ReadinessProbe):
+                raise CommandError(f"{path} is not a ReadinessProbe")
+            probes.append(Probe())
+        return probes
+
+    def validate(self, **options):
+        if options.get("timeout", 0) <= 0:
+            raise CommandError("Timeout must be greater than 0 seconds.")
+
+        if options.get("stable", 0) < 0:
+            raise CommandError("Stability timeout must not be negative.")
+
+        if options.get("interval", 0) <= 0:
+            raise CommandError("Interval must be greater than 0 seconds.")
+
+        if options.get("max_interval", 0) < options.get("interval", 0):
+            raise CommandError("Maximum interval must be greater than or equal to the interval.")
@@ -0,0 +1,178 @@
+import time
+import threading
+
+from array import array
+from bisect import bisect_left
+
+
+# Default histogram buckets (in seconds) for readiness probe latencies.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram(object):
+    """
+    A fixed bucket histogram that stores its bucket counts in a compact array. The
+    last count is the +Inf bucket; counts are not cumulative until they are rendered.
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = array("d", sorted(buckets))
+        self.counts = array("Q", bytes(8 * (len(self.buckets) + 1)))
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class ProbeStats(object):
+    """
+    The latency histogram and outcome counters for a single readiness probe.
+    """
+
+    __slots__ = ("latency", "successes", "failures", "timeouts", "last_failure")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.latency = Histogram(buckets)
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.last_failure = None
+
+
+class Metrics(object):
+    """
+    Collects readiness probe metrics for the process and renders them in the
+    Prometheus text exposition format without any third-party dependencies.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.ready = None
+        self._probes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, probe: str, duration: float, ok: bool):
+        """
+        Record the latency and outcome of a single readiness probe run.
+
+        :param probe: The name of the probe.
+        :param duration: The number of seconds the probe took to run.
+        :param ok: True if the probe was ready, False otherwise.
+        """
+        with self._lock:
+            stats = self._stats(probe)
+            stats.latency.observe(duration)
+            if ok:
+                stats.successes += 1
+            else:
+                stats.failures += 1
+                stats.last_failure = time.time()
+
+    def timeout(self, probe: str):
+        """
+        Record that a readiness probe did not respond before its timeout or deadline.
+        """
+        with self._lock:
+            stats = self._stats(probe)
+            stats.timeouts += 1
+            stats.last_failure = time.time()
+
+    def set_ready(self, ready: bool):
+        """
+        Record the result of the last readiness check.
+        """
+        self.ready = ready
+
+    def reset(self):
+        with self._lock:
+            self.ready = None
+            self._probes = {}
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        if self.ready is not None:
+            lines += [
+                "# HELP djk8s_ready Whether the last readiness check was ready (1) or not (0).",
+                "# TYPE djk8s_ready gauge",
+                f"djk8s_ready {int(self.ready)}",
+            ]
+
+        with self._lock:
+            probes = sorted(self._probes.items())
+            if not probes:
+                return "\n".join(lines) + "\n" if lines else ""
+
+            lines += [
+                "# HELP djk8s_probe_duration_seconds Latency of readiness probes in seconds.",
+                "# TYPE djk8s_probe_duration_seconds histogram",
+            ]
+            for name, stats in probes:
+                label = f'probe="{escape(name)}"'
+                cumulative = 0
+                for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                    cumulative += count
+                    lines.append(
+                        f'djk8s_probe_duration_seconds_bucket{{{label},le="{bound:g}"}} {cumulative}'
+                    )
+                cumulative += stats.latency.counts[-1]
+                lines += [
+                    f'djk8s_probe_duration_seconds_bucket{{{label},le="+Inf"}} {cumulative}',
+                    f"djk8s_probe_duration_seconds_sum{{{label}}} {stats.latency.sum!r}",
+                    f"djk8s_probe_duration_seconds_count{{{label}}} {cumulative}",
+                ]
+
+            counters = (
+                ("success", "successes", "Number of readiness probe runs that were ready."),
+                ("failure", "failures", "Number of readiness probe runs that were not ready."),
+                ("timeout", "timeouts", "Number of readiness probe runs that timed out."),
+            )
+            for metric, attr, description in counters:
+                lines += [
+                    f"# HELP djk8s_probe_{metric}_total {description}",
+                    f"# TYPE djk8s_probe_{metric}_total counter",
+                ]
+                for name, stats in probes:
+                    lines.append(
+                        f'djk8s_probe_{metric}_total{{probe="{escape(name)}"}} {getattr(stats, attr)}'
+                    )
+
+            lines += [
+                "# HELP djk8s_probe_last_failure_timestamp_seconds Unix time of the last readiness probe failure.",
+                "# TYPE djk8s_probe_last_failure_timestamp_seconds gauge",
+            ]
+            for name, stats in probes:
+                if stats.last_failure is not None:
+                    lines.append(
+                        f'djk8s_probe_last_failure_timestamp_seconds{{probe="{escape(name)}"}} {stats.last_failure!r}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    def _stats(self, probe: str) -> ProbeStats:
+        stats = self._probes.get(probe)
+        if stats is None:
+            stats = self._probes[probe] = ProbeStats(self.buckets)
+        return stats
+
+
+def escape(value: str) -> str:
+    """
+    Escape a Prometheus label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
@@ -1,6 +1,12 @@
 from djk8s.conf import settings
+from djk8s.load import load
+from djk8s.drain import drainer
+from djk8s.cache import readiness_cache
+from djk8s.metrics import metrics, CONTENT_TYPE
 from django.http import HttpResponse
-from djk8s.probes import NotReady, ReadinessProbe
+from djk8s.checks import check_ready, acheck_ready, check_startup, acheck_startup
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from djk8s.probes import LoadProbe, NotReady, registry
 from django.core.exceptions import ImproperlyConfigured
 
 
@@ -13,46 +19,100 @@ class ProbeMiddleware(object):
 
     If you're not concerned about database usage or cache calls, you can use the
     provided probe views in `djk8s.views` instead.
+
+    The middleware supports both WSGI and ASGI; when it is run in an async middleware
+    chain, probes are run on the event loop using their aready methods.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
-        # Readiness probes used to check if the application is ready to serve requests.
-        self.probes = [Probe() for Probe in settings.DJK8S_READINESS_PROBES]
+        # Build the shared readiness probes so misconfiguration is detected at startup.
+        # The load of the process is only tracked if it is checked by a LoadProbe or
+        # if the requests in flight must be drained before the process shuts down.
+        self.tracker = None
+        if any(isinstance(probe, LoadProbe) for probe in registry.probes):
+            self.tracker = load
 
-        # Ensure all probes are instances of ReadinessProbe.
-        for probe in self.probes:
-            if not isinstance(probe, ReadinessProbe):
-                raise ImproperlyConfigured(
-                    f"probe {probe} is not an instance of ReadinessProbe."
-                )
+        if settings.DJK8S_DRAIN_PATHS or settings.DJK8S_DRAIN_ON_SIGTERM:
+            self.tracker = load
+            if settings.DJK8S_DRAIN_ON_SIGTERM:
+                drainer.install()
 
-        # If no probes are configured, raise an error.
-        if not self.probes:
-            raise ImproperlyConfigured(
-                "no readiness probes configured for Django Kubernetes ProbeMiddleware."
-            )
+        # If configured, serve readiness requests from periodically refreshed results.
+        self.cache = readiness_cache()
 
         # Paths that the middleware will directly handle instead of passing to a view.
         self.handlers = {}
+        self.async_handlers = {}
 
         for path in settings.DJK8S_READY_PATHS:
             self.handlers[path] = self.ready
+            self.async_handlers[path] = self.aready
 
         for path in settings.DJK8S_HEALTH_PATHS:
             self.handlers[path] = self.health
+            self.async_handlers[path] = self.ahealth
+
+        for path in settings.DJK8S_STARTUP_PATHS:
+            self.handlers[path] = self.startup
+            self.async_handlers[path] = self.astartup
+
+        for path in settings.DJK8S_METRICS_PATHS:
+            self.handlers[path] = self.metrics
+            self.async_handlers[path] = self.ametrics
+
+        for path in settings.DJK8S_DRAIN_PATHS:
+            self.handlers[path] = self.drain
+            self.async_handlers[path] = self.adrain
 
         # If no paths are configured, raise an error.
         if not self.handlers:
             raise ImproperlyConfigured(
-                "no ready or health paths configured for Django Kubernetes ProbeMiddleware."
+                "no probe paths configured for Django Kubernetes ProbeMiddleware."
             )
 
+    @property
+    def probes(self):
+        """
+        Readiness probes used to check if the application is ready to serve requests.
+        """
+        return registry.probes
+
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
         if request.method == "GET" and request.path in self.handlers:
             return self.handlers[request.path](request)
-        return self.get_response(request)
+
+        if self.tracker is None:
+            return self.get_response(request)
+
+        start = self.tracker.started(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.tracker.finished(start)
+
+    async def __acall__(self, request):
+        if request.method == "GET" and request.path in self.async_handlers:
+            return await self.async_handlers[request.path](request)
+
+        if self.tracker is None:
+            return await self.get_response(request)
+
+        start = self.tracker.started(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.tracker.finished(start)
 
     def health(self, request):
         """
@@ -61,15 +121,90 @@ class ProbeMiddleware(object):
         """
         return HttpResponse("Ok", status=200, content_type="text/plain")
 
+    def startup(self, request):
+        """
+        Runs the warm-up hooks on the first request and returns a 200 Ok response once
+        they have all succeeded; returns a 503 while the warm-up is incomplete.
+        """
+        try:
+            check_startup()
+        except NotReady as e:
+            return e.response()
+        return HttpResponse("Ok", status=200, content_type="text/plain")
+
+    def metrics(self, request):
+        """
+        Returns the readiness probe latency histograms, outcome counters, and the
+        current readiness state in the Prometheus text exposition format.
+        """
+        return HttpResponse(metrics.render(), status=200, content_type=CONTENT_TYPE)
+
+    def drain(self, request):
+        """
+        Starts draining the process so that readiness probes report not ready and
+        waits for the requests in flight to finish; returns a 200 Ok response once the
+        process has drained or a 503 if the drain timeout passed first. Requests that
+        are not authorized to drain the process are rejected with a 403.
+        """
+        if not drainer.authorize(request.META):
+            return HttpResponse("drain: forbidden", status=403, content_type="text/plain")
+
+        if not drainer.wait():
+            return NotReady("drain: requests in flight did not finish").response()
+        return HttpResponse("Ok", status=200, content_type="text/plain")
+
     def ready(self, request):
         """
         Connects to each database and performs a generic SQL query to check that the
         database connection is available and responding to requests. Connects to any
-        caches and calls get_stats to check if the cache is online.
+        caches and calls get_stats to check if the cache is online. If the readiness
+        cache is enabled, the last refreshed results are returned instead. Reports not
+        ready until the warm-up hooks have completed.
+        """
+        try:
+            check_ready(self.cache, self.probes, request)
+        except NotReady as e:
+            return e.response()
+
+        return HttpResponse("Ok", status=200, content_type="text/plain")
+
+    async def ahealth(self, request):
+        """
+        Async version of health; always returns a 200 Ok response.
+        """
+        return self.health(request)
+
+    async def astartup(self, request):
+        """
+        Async version of startup; the warm-up hooks are run in the thread used for
+        synchronous code so that the connections they open are reused by sync views.
+        """
+        try:
+            await acheck_startup()
+        except NotReady as e:
+            return e.response()
+        return HttpResponse("Ok", status=200, content_type="text/plain")
+
+    async def ametrics(self, request):
+        """
+        Async version of metrics; returns the Prometheus text exposition.
+        """
+        return self.metrics(request)
+
+    async def adrain(self, request):
+        """
+        Async version of drain; waits for the requests in flight in a worker thread so
+        that the event loop can finish handling them.
+        """
+        return await sync_to_async(self.drain, thread_sensitive=False)(request)
+
+    async def aready(self, request):
+        """
+        Async version of ready; runs the probes concurrently on the event loop or
+        returns the last refreshed results if the readiness cache is enabled.
         """
         try:
-            for probe in self.probes:
-                probe.ready(request)
+            await acheck_ready(self.cache, self.probes, request)
         except NotReady as e:
             return e.response()
 
@@ -0,0 +1,209 @@
+"""
+An on-disk cache of the migrations that an up-to-date database has applied, keyed by
+a content hash of the migration files of the installed apps. Building the migration
+graph imports every migration module which can take seconds in large projects; with
+the cache, an up-to-date database can be confirmed by hashing the migration files and
+reading the applied migrations in a single query. The cache can be built when the
+container image is built with the migrationcache command.
+"""
+
+import os
+import json
+import hashlib
+import pkgutil
+
+from djk8s.conf import settings
+from django.apps import apps
+from importlib import import_module
+from django.db import DatabaseError
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+
+# Incremented when the format of the cache file changes; version 2 added replacements.
+CACHE_VERSION = 2
+
+
+def source_hash() -> str:
+    """
+    Compute a hash of the installed apps, their migrations modules, and the contents
+    of every migration file that the migration loader would load.
+    """
+    digest = hashlib.sha256()
+    for app_config in sorted(apps.get_app_configs(), key=lambda app: app.label):
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        digest.update(f"{app_config.label}:{module_name}\n".encode())
+
+        for path in migration_files(module_name):
+            digest.update(os.path.basename(path).encode() + b"\n")
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+
+    return digest.hexdigest()
+
+
+def migration_files(module_name: str):
+    """
+    Return the sorted paths of the migration files in the migrations package or an
+    empty list if the app does not have migrations.
+    """
+    if module_name is None:
+        return []
+
+    try:
+        module = import_module(module_name)
+    except ImportError:
+        return []
+
+    paths = []
+    for directory in getattr(module, "__path__", []):
+        for _, name, is_pkg in pkgutil.iter_modules([directory]):
+            if is_pkg or name[0] in "_~":
+                continue
+
+            path = os.path.join(directory, f"{name}.py")
+            if os.path.exists(path):
+                paths.append(path)
+    return sorted(paths)
+
+
+def migration_state():
+    """
+    Build the migration graph from disk and return the (app, name) keys of every
+    migration that must be applied for the database to be up to date and a mapping of
+    the keys of squashed migrations to the keys of the migrations they replace.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    expected = set(loader.graph.nodes)
+    replacements = {
+        key: [tuple(replaced) for replaced in migration.replaces]
+        for key, migration in loader.replacements.items()
+        if key in expected
+    }
+    return expected, replacements
+
+
+def unapplied_migrations(expected: set, replacements: dict, applied: set) -> list:
+    """
+    Return the sorted keys of the expected migrations that have not been applied. A
+    squashed migration is applied if all of the migrations it replaces are applied,
+    even if the squashed migration itself has not yet been recorded.
+    """
+    return sorted(
+        key
+        for key in expected - applied
+        if not (key in replacements and all(r in applied for r in replacements[key]))
+    )
+
+
+def build_cache(path: str = None) -> dict:
+    """
+    Build the migration graph and write the migration cache.
+
+    :param path: The path of the cache file, by default DJK8S_MIGRATION_CACHE.
+    :returns: The cache that was written.
+    """
+    path = path or settings.DJK8S_MIGRATION_CACHE
+    expected, replacements = migration_state()
+
+    migrations = {}
+    for app, name in sorted(expected):
+        migrations.setdefault(app, []).append(name)
+
+    cache = {
+        "version": CACHE_VERSION,
+        "source": source_hash(),
+        "migrations": migrations,
+        "replacements": [
+            [list(key), [list(r) for r in replaced]]
+            for key, replaced in sorted(replacements.items())
+        ],
+    }
+    with open(path, "w") as f:
+        json.dump(cache, f, separators=(",", ":"))
+    return cache
+
+
+def load_cache(path: str = None):
+    """
+    Load the migration state from the cache if it is up to date with the migration
+    files of the installed apps.
+
+    :param path: The path of the cache file, by default DJK8S_MIGRATION_CACHE.
+    :returns: The expected (app, name) migration keys and the replacements of squashed
+        migrations as returned by migration_state or None if there is no cache or the
+        cache is stale.
+    """
+    path = path or settings.DJK8S_MIGRATION_CACHE
+    if not path:
+        return None
+
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+
+    if cache.get("source") != source_hash():
+        return None
+
+    try:
+        expected = {(app, name) for app, names in cache["migrations"].items() for name in names}
+        replacements = {
+            tuple(key): [tuple(r) for r in replaced] for key, replaced in cache["replacements"]
+        }
+    except (KeyError, TypeError, ValueError, AttributeError):
+        # A cache with missing or malformed fields is treated like a missing cache.
+        return None
+    return expected, replacements
+
+
+def migrations_table(connection) -> str:
+    """
+    Return the quoted name of the table in which applied migrations are recorded.
+    """
+    return connection.ops.quote_name(MigrationRecorder.Migration._meta.db_table)
+
+
+def table_fingerprint(connection) -> tuple:
+    """
+    Read the row count and maximum id of the migrations table in a single query, which
+    change whenever migrations are applied or unapplied.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*), MAX(id) FROM {migrations_table(connection)}")
+        return tuple(cursor.fetchone())
+
+
+def applied_migrations(connection) -> set:
+    """
+    Read the (app, name) keys of the applied migrations in a single query; returns an
+    empty set if the migrations table does not exist.
+    """
+    table = migrations_table(connection)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT app, name FROM {table}")
+            return set(cursor.fetchall())
+    except DatabaseError:
+        return set()
+
+
+def migrated(connection, path: str = None) -> bool:
+    """
+    Use the migration cache to check if every migration has been applied to the
+    database without building the migration graph.
+
+    :param connection: The database connection to check.
+    :param path: The path of the cache file, by default DJK8S_MIGRATION_CACHE.
+    :returns: True if the database is confirmed to be up to date; False if there are
+        unapplied migrations or if the cache is missing or stale, in which case the
+        migration graph must be built to determine the migration plan.
+    """
+    state = load_cache(path)
+    if state is None:
+        return False
+    return not unapplied_migrations(*state, applied_migrations(connection))
@@ -1,11 +1,36 @@
 import abc
+import ssl
+import time
+import uuid
+import socket
+import asyncio
 import logging
+import threading
 
-from django.http import HttpResponseServerError
+from djk8s.conf import settings
+from urllib.parse import urlsplit, unquote
+from concurrent.futures import ThreadPoolExecutor, wait
+from asgiref.sync import sync_to_async
+from django.core.signals import setting_changed
+from django.core.exceptions import ImproperlyConfigured
 
 
 logger = logging.getLogger("djk8s.probe")
 
+# Responses from memcached that indicate the server could not handle the command.
+MEMCACHED_ERRORS = (b"ERROR", b"CLIENT_ERROR", b"SERVER_ERROR")
+
+# The ways the MemcachedProbe can check that a memcached server is available.
+MEMCACHED_PROBE_MODES = ("stats", "version")
+
+# Default timeout for probes that connect directly to a server with a socket.
+SOCKET_TIMEOUT = 5.0
+
+# The prefix of the keys reserved for the CacheProbe round-trip and their timeout;
+# every check uses its own key, so they expire quickly rather than being overwritten.
+CACHE_PROBE_KEY = "djk8s:probe"
+CACHE_PROBE_TIMEOUT = 10
+
 
 class NotReady(Exception):
     """
@@ -27,6 +52,9 @@ class NotReady(Exception):
         """
         Return an HTTP response for the exception.
         """
+        # Imported here since django.http imports the ORM, which fast-start probes avoid.
+        from django.http import HttpResponseServerError
+
         return HttpResponseServerError(
             content=self.content,
             status=self.status,
@@ -39,6 +67,22 @@ class ReadinessProbe(abc.ABC):
     Base classes for all readiness probes.
     """
 
+    timeout = None
+    """If set, overrides DJK8S_PROBE_TIMEOUT for this probe when probes run concurrently."""
+
+    requires_apps = False
+    """Set to True if the probe uses models so that fast-start probes set up the app registry."""
+
+    process_local = False
+    """Set to True if the probe checks the state of its own process (e.g. its load) so that its result is never shared with other processes."""
+
+    @property
+    def name(self):
+        """
+        A human readable name for the probe used in log and timeout messages.
+        """
+        return self.__class__.__name__
+
     @abc.abstractmethod
     def ready(self, request):
         """
@@ -49,8 +93,153 @@ class ReadinessProbe(abc.ABC):
         """
         return None
 
+    async def aready(self, request):
+        """
+        Asynchronously check if the application is ready to serve requests. By default
+        this runs the synchronous ready method in a worker thread; probes that can
+        check their service without blocking should override this method.
 
-class DatabaseProbe(ReadinessProbe):
+        :param request: The HTTP request object.
+        :raises NotReady: If the application is not ready.
+        """
+        return await sync_to_async(self.ready, thread_sensitive=False)(request)
+
+
+class ProbeRegistry(object):
+    """
+    A process-wide registry of the readiness probes configured by the
+    DJK8S_READINESS_PROBES setting. The probes are instantiated and validated once on
+    first access and shared by the middleware, views, and management commands, so
+    probes may hold expensive state (connections, clients, etc.) for the life of the
+    process; they must therefore be safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self._probes = None
+        self._lock = threading.Lock()
+
+    @property
+    def probes(self):
+        """
+        The validated readiness probe instances, built on first access.
+
+        :raises ImproperlyConfigured: If no probes are configured or a configured probe
+            is not a ReadinessProbe.
+        """
+        probes = self._probes
+        if probes is None:
+            with self._lock:
+                if self._probes is None:
+                    self._probes = self.build()
+                probes = self._probes
+        return probes
+
+    def build(self):
+        """
+        Instantiate and validate the probes configured in DJK8S_READINESS_PROBES.
+        """
+        probes = tuple(Probe() for Probe in settings.DJK8S_READINESS_PROBES)
+
+        # Ensure all probes are instances of ReadinessProbe.
+        for probe in probes:
+            if not isinstance(probe, ReadinessProbe):
+                raise ImproperlyConfigured(
+                    f"probe {probe} is not an instance of ReadinessProbe."
+                )
+
+        # If no probes are configured, raise an error.
+        if not probes:
+            raise ImproperlyConfigured(
+                "no readiness probes configured for Django Kubernetes."
+            )
+
+        return probes
+
+    def reset(self):
+        """
+        Discard the probe instances so they are rebuilt on next access.
+        """
+        with self._lock:
+            self._probes = None
+
+
+class ConcurrentChecksMixin(object):
+    """
+    Provides a lazily created thread pool for probes that check several databases or
+    servers at once so that the total probe latency is that of the slowest check.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def get_executor(self, workers):
+        """
+        Return the thread pool used to run checks concurrently, growing it if more
+        checks are needed than it has workers.
+        """
+        with self._lock:
+            if self._executor is None or self._workers < workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix=f"djk8s-{self.__class__.__name__}",
+                )
+                self._workers = workers
+            return self._executor
+
+    def check_all(self, check, items):
+        """
+        Run check on every item concurrently (the first in the calling thread) and
+        raise the first exception in item order once all of the checks are done.
+        """
+        items = list(items)
+        if len(items) < 2:
+            for item in items:
+                check(item)
+            return
+
+        executor = self.get_executor(len(items) - 1)
+        futures = [executor.submit(check, item) for item in items[1:]]
+        try:
+            check(items[0])
+        finally:
+            wait(futures)
+
+        for future in futures:
+            future.result()
+
+
+class DatabaseProbe(ConcurrentChecksMixin, ReadinessProbe):
+    """
+    Checks that the databases in DJK8S_DATABASE_PROBE_ALIASES (all databases by
+    default) are available. Connections that are already open (e.g. persistent
+    connections kept by CONN_MAX_AGE) are checked with is_usable rather than opening
+    a new connection, and multiple databases are checked concurrently.
+    """
+
+    def __init__(self):
+        super().__init__()
+        from django.db import connections
+
+        unknown = [name for name in self.aliases if name not in connections]
+        if unknown:
+            raise ImproperlyConfigured(
+                f"unknown database aliases in DJK8S_DATABASE_PROBE_ALIASES: {', '.join(unknown)}"
+            )
+
+    @property
+    def aliases(self):
+        """
+        The aliases of the databases that gate readiness.
+        """
+        from django.db import connections
+
+        if settings.DJK8S_DATABASE_PROBE_ALIASES is None:
+            return list(connections)
+        return list(settings.DJK8S_DATABASE_PROBE_ALIASES)
 
     def ready(self, request):
         """
@@ -59,20 +248,190 @@ class DatabaseProbe(ReadinessProbe):
         :param request: The HTTP request object.
         :raises NotReady: If the database is not ready.
         """
+        from django.db import connections
+
+        aliases = self.aliases
+        if len(aliases) < 2:
+            for name in aliases:
+                self.check(name)
+            return
+
+        # Share this thread's connections with the worker threads so that open
+        # connections are reused; the first database is checked in this thread.
+        conns = [connections[name] for name in aliases]
+        for conn in conns[1:]:
+            conn.inc_thread_sharing()
+
+        try:
+            self.check_all(self.check_connection, conns)
+        finally:
+            for conn in conns[1:]:
+                conn.dec_thread_sharing()
+
+    async def aready(self, request):
+        """
+        Check if the databases are ready to serve requests. Django database access is
+        synchronous so each database is checked concurrently in a worker thread.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If the database is not ready.
+        """
+        check = sync_to_async(self.check_and_close, thread_sensitive=False)
+        await asyncio.gather(*[check(name) for name in self.aliases])
+
+    def check_and_close(self, name):
+        """
+        Check the specified database, then close the connection opened by this thread;
+        the worker threads of async probes are not request threads, so Django would
+        never close their connections.
+
+        :param name: The alias of the database to check.
+        :raises NotReady: If the database is not ready.
+        """
+        from django.db import connections
+
         try:
-            from django.db import connections
+            self.check(name)
+        finally:
+            connections[name].close()
 
-            for name in connections:
-                with connections[name].cursor() as cursor:
-                    cursor.execute("SELECT 1")
-                    if cursor.fetchone() is None:
-                        raise NotReady(f"db: database '{name}' is not responding")
+    def check(self, name):
+        """
+        Check the specified database using this thread's connection.
+
+        :param name: The alias of the database to check.
+        :raises NotReady: If the database is not ready.
+        """
+        from django.db import connections
+
+        self.check_connection(connections[name])
+
+    def check_connection(self, conn):
+        """
+        If the connection is open, check that it is still usable; otherwise (or if it
+        is no longer usable) connect and perform a generic SQL query.
+
+        :param conn: The Django database connection to check.
+        :raises NotReady: If the database is not ready.
+        """
+        try:
+            if conn.connection is not None:
+                if conn.is_usable():
+                    return
+                conn.close()
+
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                if cursor.fetchone() is None:
+                    raise NotReady(f"db: database '{conn.alias}' is not responding")
+        except NotReady:
+            raise
         except Exception as e:
             logger.exception(f"database readiness check failed: {str(e)}")
-            raise NotReady("db: could not connect to database")
+            raise NotReady(f"db: could not connect to database '{conn.alias}'")
+
+
+class MigrationsProbe(DatabaseProbe):
+    """
+    Checks that every migration of the installed apps has been applied to the
+    databases in DJK8S_DATABASE_PROBE_ALIASES (all databases by default) so that pods
+    running new code do not become ready against a schema that has not been migrated.
+
+    The migrations that must be applied are computed once per process, from the
+    migration cache if DJK8S_MIGRATION_CACHE is set or else from the migration graph.
+    After that each check only reads the row count and maximum id of the migrations
+    table; the applied migrations are only read again when those change.
+    """
+
+    requires_apps = True
+
+    def __init__(self):
+        super().__init__()
+        self._state = None
+        self._state_lock = threading.Lock()
+
+        # The migrations table fingerprint and result of the last check of each alias.
+        self._checked = {}
+
+    @property
+    def state(self):
+        """
+        The expected migrations and the replacements of squashed migrations.
+        """
+        if self._state is None:
+            from djk8s import plan
+
+            with self._state_lock:
+                if self._state is None:
+                    self._state = plan.load_cache() or plan.migration_state()
+        return self._state
+
+    def check_connection(self, conn):
+        """
+        Check that all migrations have been applied to the database, reading the
+        applied migrations only if the migrations table has changed since the last
+        check.
+
+        :param conn: The Django database connection to check.
+        :raises NotReady: If there are unapplied migrations.
+        """
+        from djk8s import plan
+
+        expected, replacements = self.state
+        try:
+            fingerprint = plan.table_fingerprint(conn)
+            checked = self._checked.get(conn.alias)
+            if checked is not None and checked[0] == fingerprint:
+                error = checked[1]
+            else:
+                unapplied = plan.unapplied_migrations(
+                    expected, replacements, plan.applied_migrations(conn)
+                )
+                error = None
+                if unapplied:
+                    app, name = unapplied[0]
+                    error = (
+                        f"migrations: {len(unapplied)} unapplied migrations on database "
+                        f"'{conn.alias}' (e.g. {app}.{name})"
+                    )
+                self._checked[conn.alias] = (fingerprint, error)
+        except Exception as e:
+            logger.exception(f"migrations readiness check failed: {str(e)}")
+            raise NotReady(f"migrations: could not read migrations from database '{conn.alias}'")
+
+        if error is not None:
+            raise NotReady(error)
+
+
+class MemcachedProbe(ConcurrentChecksMixin, ReadinessProbe):
+    """
+    Checks that the servers of every memcached cache are available. By default stats
+    are requested from every server; if DJK8S_MEMCACHED_PROBE_MODE is "version" each
+    server is instead sent a minimal version command directly over the memcached text
+    protocol, concurrently, which works with both pymemcache and pylibmc backends.
+    """
 
+    def __init__(self):
+        super().__init__()
+        if settings.DJK8S_MEMCACHED_PROBE_MODE not in MEMCACHED_PROBE_MODES:
+            raise ImproperlyConfigured(
+                f"unknown memcached probe mode {settings.DJK8S_MEMCACHED_PROBE_MODE!r}, "
+                f"choose one of {', '.join(MEMCACHED_PROBE_MODES)}"
+            )
 
-class MemcachedProbe(ReadinessProbe):
+    @property
+    def servers(self):
+        """
+        The locations of the servers of all configured memcached caches.
+        """
+        from django.core.cache import caches
+        from django.core.cache.backends.memcached import BaseMemcachedCache
+
+        servers = {}
+        for cache in caches.all():
+            if isinstance(cache, BaseMemcachedCache):
+                servers.update(dict.fromkeys(cache.client_servers))
+        return list(servers)
 
     def ready(self, request):
         """
@@ -82,14 +441,510 @@ class MemcachedProbe(ReadinessProbe):
         :raises NotReady: If the cache is not ready.
         """
         try:
+            if settings.DJK8S_MEMCACHED_PROBE_MODE == "version":
+                return self.check_all(self.version, self.servers)
+
             from django.core.cache import caches
             from django.core.cache.backends.memcached import BaseMemcachedCache
 
             for cache in caches.all():
                 if isinstance(cache, BaseMemcachedCache):
                     stats = cache.get_stats()
-                    if len(stats) != len(cache._servers):
+                    if len(stats) != len(cache.client_servers):
                         raise NotReady("cache: memcache is not responding")
+        except NotReady:
+            raise
+        except Exception as e:
+            logger.exception(f"cache readiness check failed: {str(e)}")
+            raise NotReady("cache: could not connect to cache")
+
+    async def aready(self, request):
+        """
+        Check if memcached caches are ready to serve requests by requesting stats (or
+        the version) from every server concurrently on the event loop.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If the cache is not ready.
+        """
+        try:
+            if settings.DJK8S_MEMCACHED_PROBE_MODE == "version":
+                check = self.aversion
+            else:
+                check = self.astats
+            await asyncio.gather(*[check(server) for server in self.servers])
+        except NotReady:
+            raise
         except Exception as e:
             logger.exception(f"cache readiness check failed: {str(e)}")
             raise NotReady("cache: could not connect to cache")
+
+    def version(self, server):
+        """
+        Send the version command to a single memcached server.
+
+        :param server: The memcached server location, e.g. "host:port" or "unix:/path".
+        :raises NotReady: If the server does not respond with its version.
+        """
+        try:
+            with connect(memcached_address(server)) as sock:
+                sock.sendall(b"version\r\n")
+                with sock.makefile("rb") as reader:
+                    line = reader.readline()
+        except OSError as e:
+            logger.warning(f"memcached server {server} readiness check failed: {str(e)}")
+            line = b""
+
+        if not line.startswith(b"VERSION "):
+            raise NotReady(f"cache: memcached server '{server}' is not responding")
+
+    async def aversion(self, server):
+        """
+        Asynchronously send the version command to a single memcached server.
+
+        :param server: The memcached server location, e.g. "host:port" or "unix:/path".
+        :raises NotReady: If the server does not respond with its version.
+        """
+        try:
+            reader, writer = await aconnect(memcached_address(server))
+        except OSError as e:
+            logger.warning(f"memcached server {server} readiness check failed: {str(e)}")
+            raise NotReady(f"cache: memcached server '{server}' is not responding")
+
+        try:
+            writer.write(b"version\r\n")
+            await writer.drain()
+            line = await areadline(reader)
+        except OSError as e:
+            logger.warning(f"memcached server {server} readiness check failed: {str(e)}")
+            line = b""
+        finally:
+            writer.close()
+
+        if not line.startswith(b"VERSION "):
+            raise NotReady(f"cache: memcached server '{server}' is not responding")
+
+    async def astats(self, server):
+        """
+        Request stats from a single memcached server using the text protocol.
+
+        :param server: The memcached server location, e.g. "host:port" or "unix:/path".
+        :raises NotReady: If the server does not respond with stats.
+        """
+        try:
+            reader, writer = await aconnect(memcached_address(server))
+        except OSError as e:
+            logger.warning(f"memcached server {server} readiness check failed: {str(e)}")
+            raise NotReady(f"cache: memcached server '{server}' is not responding")
+
+        try:
+            writer.write(b"stats\r\n")
+            await writer.drain()
+
+            while True:
+                line = await areadline(reader)
+                if line == b"END\r\n":
+                    return
+                if not line or line.startswith(MEMCACHED_ERRORS):
+                    raise NotReady(f"cache: memcached server '{server}' is not responding")
+        except OSError as e:
+            logger.warning(f"memcached server {server} readiness check failed: {str(e)}")
+            raise NotReady(f"cache: memcached server '{server}' is not responding")
+        finally:
+            writer.close()
+
+
+class RedisProbe(ConcurrentChecksMixin, ReadinessProbe):
+    """
+    Checks that the servers of every Django RedisCache are available by sending each
+    server a single pipelined PING (preceded by AUTH if the server URL includes
+    credentials) concurrently. If DJK8S_REDIS_PROBE_LATENCY_BUDGET is set, servers
+    that take longer than the budget to respond are reported as not ready.
+    """
+
+    @property
+    def servers(self):
+        """
+        The URLs of the servers of all configured Redis caches.
+        """
+        from django.core.cache import caches
+        from django.core.cache.backends.redis import RedisCache
+
+        servers = {}
+        for cache in caches.all():
+            if isinstance(cache, RedisCache):
+                # RedisCache does not expose its server URLs publicly.
+                servers.update(dict.fromkeys(cache._servers))
+        return list(servers)
+
+    def ready(self, request):
+        """
+        Check if redis caches are ready to serve requests.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If a redis server is not ready.
+        """
+        self.check_all(self.ping, self.servers)
+
+    async def aready(self, request):
+        """
+        Check if redis caches are ready to serve requests by pinging every server
+        concurrently on the event loop.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If a redis server is not ready.
+        """
+        await asyncio.gather(*[self.aping(server) for server in self.servers])
+
+    def ping(self, server):
+        """
+        Send a pipelined PING to a single redis server.
+
+        :param server: The redis server URL, e.g. "redis://host:port/0".
+        :raises NotReady: If the server does not respond in time with PONG.
+        """
+        address, payload, replies, tls = redis_ping(server)
+        start = time.monotonic()
+        try:
+            sock = connect(address)
+            try:
+                if tls:
+                    sock = ssl.create_default_context().wrap_socket(
+                        sock, server_hostname=address[0]
+                    )
+                sock.sendall(payload)
+                with sock.makefile("rb") as reader:
+                    lines = [reader.readline() for _ in range(replies)]
+            finally:
+                sock.close()
+        except OSError as e:
+            logger.warning(f"redis server {redact(server)} readiness check failed: {str(e)}")
+            lines = []
+
+        self.check_replies(server, lines, time.monotonic() - start)
+
+    async def aping(self, server):
+        """
+        Asynchronously send a pipelined PING to a single redis server.
+
+        :param server: The redis server URL, e.g. "redis://host:port/0".
+        :raises NotReady: If the server does not respond in time with PONG.
+        """
+        address, payload, replies, tls = redis_ping(server)
+        start = time.monotonic()
+        try:
+            reader, writer = await aconnect(address, ssl=tls or None)
+            try:
+                writer.write(payload)
+                await writer.drain()
+                lines = [await areadline(reader) for _ in range(replies)]
+            finally:
+                writer.close()
+        except OSError as e:
+            logger.warning(f"redis server {redact(server)} readiness check failed: {str(e)}")
+            lines = []
+
+        self.check_replies(server, lines, time.monotonic() - start)
+
+    def check_replies(self, server, lines, latency):
+        """
+        Check the replies to the pipelined commands and the round-trip latency.
+        """
+        if not lines or lines[-1] != b"+PONG\r\n":
+            errors = [line.strip().decode(errors="replace") for line in lines if line.startswith(b"-")]
+            reason = f": {errors[0][1:]}" if errors else ""
+            raise NotReady(f"cache: redis server '{redact(server)}' is not responding{reason}")
+
+        budget = settings.DJK8S_REDIS_PROBE_LATENCY_BUDGET
+        if budget is not None and latency > budget:
+            raise NotReady(
+                f"cache: redis server '{redact(server)}' responded in {latency * 1000:.0f}ms "
+                f"which exceeds the {budget * 1000:.0f}ms budget"
+            )
+
+
+class CacheProbe(ConcurrentChecksMixin, ReadinessProbe):
+    """
+    Checks that any Django cache backend is available by setting and getting a value
+    on a key reserved for this process in every cache in DJK8S_CACHE_PROBE_ALIASES
+    (all caches by default). If DJK8S_CACHE_PROBE_LATENCY_BUDGET is set, caches that
+    take longer than the budget to complete the round-trip are reported as not ready.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.key = f"{CACHE_PROBE_KEY}:{uuid.uuid4().hex}"
+
+    @property
+    def aliases(self):
+        """
+        The aliases of the caches that gate readiness.
+        """
+        from django.core.cache import caches
+
+        if settings.DJK8S_CACHE_PROBE_ALIASES is None:
+            return list(caches.settings)
+        return list(settings.DJK8S_CACHE_PROBE_ALIASES)
+
+    def ready(self, request):
+        """
+        Check if the caches are ready to serve requests.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If a cache is not ready.
+        """
+        self.check_all(self.check, self.aliases)
+
+    async def aready(self, request):
+        """
+        Check if the caches are ready to serve requests using the async cache API.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If a cache is not ready.
+        """
+        await asyncio.gather(*[self.acheck(alias) for alias in self.aliases])
+
+    def check(self, alias):
+        """
+        Perform a set/get round-trip on the specified cache.
+
+        :param alias: The alias of the cache to check.
+        :raises NotReady: If the cache is not ready.
+        """
+        from django.core.cache import caches
+
+        key, token = self.token()
+        start = time.monotonic()
+        try:
+            cache = caches[alias]
+            cache.set(key, token, timeout=CACHE_PROBE_TIMEOUT)
+            value = cache.get(key)
+        except Exception as e:
+            logger.exception(f"cache readiness check failed: {str(e)}")
+            raise NotReady(f"cache: could not connect to cache '{alias}'")
+
+        self.check_value(alias, token, value, time.monotonic() - start)
+
+    async def acheck(self, alias):
+        """
+        Perform a set/get round-trip on the specified cache using the async API.
+
+        :param alias: The alias of the cache to check.
+        :raises NotReady: If the cache is not ready.
+        """
+        from django.core.cache import caches
+
+        key, token = self.token()
+        start = time.monotonic()
+        try:
+            cache = caches[alias]
+            await cache.aset(key, token, timeout=CACHE_PROBE_TIMEOUT)
+            value = await cache.aget(key)
+        except Exception as e:
+            logger.exception(f"cache readiness check failed: {str(e)}")
+            raise NotReady(f"cache: could not connect to cache '{alias}'")
+
+        self.check_value(alias, token, value, time.monotonic() - start)
+
+    def token(self):
+        """
+        Return a unique value to round-trip and the key to store it under, which is
+        derived from the value so that concurrent checks (including async checks on the
+        same event loop thread) do not read each other's values.
+        """
+        value = uuid.uuid4().hex
+        return f"{self.key}:{value}", value
+
+    def check_value(self, alias, token, value, latency):
+        if value != token:
+            raise NotReady(f"cache: cache '{alias}' did not return the probe value")
+
+        budget = settings.DJK8S_CACHE_PROBE_LATENCY_BUDGET
+        if budget is not None and latency > budget:
+            raise NotReady(
+                f"cache: cache '{alias}' responded in {latency * 1000:.0f}ms "
+                f"which exceeds the {budget * 1000:.0f}ms budget"
+            )
+
+
+class LoadProbe(ReadinessProbe):
+    """
+    Reports not ready while the process is overloaded so that traffic is routed to
+    other pods. The load is tracked by the ProbeMiddleware from the requests it
+    passes through, so this probe requires the middleware. The process is overloaded
+    if more than DJK8S_LOAD_PROBE_MAX_INFLIGHT requests are in flight or if the
+    DJK8S_LOAD_PROBE_PERCENTILE of the latency or queue delay of the requests in the
+    last DJK8S_LOAD_PROBE_WINDOW seconds exceeds DJK8S_LOAD_PROBE_MAX_LATENCY or
+    DJK8S_LOAD_PROBE_MAX_QUEUE_DELAY; thresholds that are not set are not checked.
+    """
+
+    process_local = True
+
+    def ready(self, request):
+        """
+        Check if the process is not overloaded.
+
+        :param request: The HTTP request object.
+        :raises NotReady: If any of the load thresholds are exceeded.
+        """
+        from djk8s.load import load
+
+        q = settings.DJK8S_LOAD_PROBE_PERCENTILE
+        max_inflight = settings.DJK8S_LOAD_PROBE_MAX_INFLIGHT
+        if max_inflight is not None and load.inflight > max_inflight:
+            raise NotReady(f"load: {load.inflight} requests in flight exceeds the maximum of {max_inflight}")
+
+        max_latency = settings.DJK8S_LOAD_PROBE_MAX_LATENCY
+        if max_latency is not None:
+            latency = load.latency_percentile(q)
+            if latency is not None and latency > max_latency:
+                raise NotReady(
+                    f"load: p{q:g} request latency of {latency * 1000:.0f}ms "
+                    f"exceeds the {max_latency * 1000:.0f}ms maximum"
+                )
+
+        max_delay = settings.DJK8S_LOAD_PROBE_MAX_QUEUE_DELAY
+        if max_delay is not None:
+            delay = load.queue_percentile(q)
+            if delay is not None and delay > max_delay:
+                raise NotReady(
+                    f"load: p{q:g} request queue delay of {delay * 1000:.0f}ms "
+                    f"exceeds the {max_delay * 1000:.0f}ms maximum"
+                )
+
+    async def aready(self, request):
+        """
+        The load checks do not block so they are run directly on the event loop.
+        """
+        self.ready(request)
+
+
+def connect(address, timeout: float = None):
+    """
+    Open a blocking socket to a (host, port) tuple or a unix socket path.
+    """
+    if timeout is None:
+        timeout = settings.DJK8S_PROBE_TIMEOUT or SOCKET_TIMEOUT
+
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    return socket.create_connection(address, timeout=timeout)
+
+
+async def aconnect(address, timeout: float = None, **kwargs):
+    """
+    Open an asyncio stream to a (host, port) tuple or a unix socket path.
+
+    :raises OSError: If the connection fails or is not established within the timeout.
+    """
+    if isinstance(address, str):
+        connection = asyncio.open_unix_connection(address, **kwargs)
+    else:
+        connection = asyncio.open_connection(*address, **kwargs)
+    return await awithin(connection, timeout)
+
+
+async def areadline(reader, timeout: float = None):
+    """
+    Read a line from an asyncio stream.
+
+    :raises OSError: If the line is not received within the timeout.
+    """
+    return await awithin(reader.readline(), timeout)
+
+
+async def awithin(awaitable, timeout: float = None):
+    """
+    Await a socket operation with the same timeout as blocking sockets, raising
+    TimeoutError (an OSError) like a blocking socket if it expires.
+    """
+    if timeout is None:
+        timeout = settings.DJK8S_PROBE_TIMEOUT or SOCKET_TIMEOUT
+
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError("timed out") from None
+
+
+def memcached_address(server: str):
+    """
+    Parse a memcached server location into a (host, port) tuple or a unix socket path.
+    """
+    if server.startswith("unix:"):
+        return server[5:]
+    if server.startswith("/"):
+        return server
+
+    host, sep, port = server.rpartition(":")
+    if not sep or host.endswith(":") or (host.startswith("[") and not host.endswith("]")):
+        # Either no port was specified or the location is a bare IPv6 address.
+        return server.strip("[]"), 11211
+    return host.strip("[]"), int(port)
+
+
+def redis_ping(server: str):
+    """
+    Parse a redis server URL and build the pipelined commands to ping it.
+
+    :returns: the address to connect to, the payload to send, the number of replies
+        to read, and whether or not the connection should use TLS.
+    """
+    url = urlsplit(server)
+    if url.scheme == "unix" or (not url.scheme and server.startswith("/")):
+        address = url.path
+    else:
+        address = (url.hostname or "localhost", url.port or 6379)
+
+    commands = []
+    if url.password:
+        auth = [url.username, url.password] if url.username else [url.password]
+        commands.append(resp_command("AUTH", *map(unquote, auth)))
+    commands.append(resp_command("PING"))
+    return address, b"".join(commands), len(commands), url.scheme == "rediss"
+
+
+def resp_command(*args) -> bytes:
+    """
+    Encode a command in the redis serialization protocol.
+    """
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        arg = arg.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def redact(server: str) -> str:
+    """
+    Remove any password from a server URL so that it can be logged.
+    """
+    url = urlsplit(server)
+    if not url.password:
+        return server
+    netloc = url.netloc.rsplit("@", 1)[-1]
+    if url.username:
+        netloc = f"{url.username}:***@{netloc}"
+    else:
+        netloc = f":***@{netloc}"
+    return url._replace(netloc=netloc).geturl()
+
+
+registry = ProbeRegistry()
+
+
+def reset_registry(*args, **kwargs):
+    """
+    Rebuild the probe registry when the configured readiness probes are changed.
+    """
+    if kwargs["setting"] == "DJK8S_READINESS_PROBES":
+        registry.reset()
+
+
+setting_changed.connect(reset_registry)
@@ -0,0 +1,276 @@
+import time
+import asyncio
+import logging
+import threading
+
+from djk8s.state import state
+from djk8s.conf import settings
+from djk8s.probes import NotReady
+from djk8s.metrics import metrics
+from django.db import close_old_connections
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# How often to check whether queued probes with a timeout have started running.
+START_POLL_INTERVAL = 0.01
+
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+
+def run_probes(probes, request=None, report: bool = True):
+    """
+    Run the readiness probes and raise the first NotReady exception. If
+    DJK8S_PROBE_WORKERS is set, the probes are run concurrently on a bounded thread
+    pool and any probe that exceeds its timeout or the overall deadline is reported as
+    not ready; otherwise the probes are run one after another in the calling thread.
+
+    The result is reported through the readiness state, so the process only changes
+    between ready and not ready once the success or failure threshold is reached.
+
+    :param probes: The readiness probe instances to run.
+    :param request: The HTTP request object or None if there is no request.
+    :param report: If False, the result of this check is raised directly rather than
+        reported through the readiness state of the process.
+    :raises NotReady: If the process (or the check if report is False) is not ready.
+    """
+    if not report:
+        return _run_probes(probes, request)
+
+    try:
+        _run_probes(probes, request)
+    except NotReady as e:
+        _report(e)
+    except Exception:
+        metrics.set_ready(False)
+        raise
+    else:
+        _report(None)
+
+
+def _run_probes(probes, request):
+    workers = settings.DJK8S_PROBE_WORKERS
+    if not workers:
+        for probe in probes:
+            _observe(probe, request)
+        return
+
+    executor = get_executor(workers)
+    start = time.monotonic()
+    deadline = settings.DJK8S_PROBE_DEADLINE
+
+    # Probe timeouts are measured from when each probe starts running in a worker, so
+    # that time spent queued behind other probes only counts against the deadline.
+    started = {}
+    timed_out = set()
+    pending = {}
+    for probe in probes:
+        pending[executor.submit(_run_probe, probe, request, started, timed_out)] = probe
+
+    try:
+        while pending:
+            timeout = _check_limits(pending.values(), started, start, deadline, timed_out)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                future.result()
+    finally:
+        # Do not run probes that have not yet started if the check has already failed.
+        for future in pending:
+            future.cancel()
+
+
+async def arun_probes(probes, request=None):
+    """
+    Run the readiness probes concurrently on the event loop using each probe's aready
+    method and raise the first NotReady exception. Any probe that exceeds its timeout
+    or the overall deadline is cancelled and reported as not ready.
+
+    :param probes: The readiness probe instances to run.
+    :param request: The HTTP request object or None if there is no request.
+    :raises NotReady: If the process is not ready.
+    """
+    try:
+        await _arun_probes(probes, request)
+    except NotReady as e:
+        _report(e)
+    except Exception:
+        metrics.set_ready(False)
+        raise
+    else:
+        _report(None)
+
+
+async def _arun_probes(probes, request):
+    start = time.monotonic()
+    deadline = settings.DJK8S_PROBE_DEADLINE
+
+    # Every probe starts running on the event loop as soon as its task is created.
+    started = {}
+    pending = {}
+    for probe in probes:
+        pending[asyncio.ensure_future(_aobserve(probe, request))] = probe
+        started[probe] = start
+
+    try:
+        while pending:
+            timeout = _check_limits(pending.values(), started, start, deadline, set())
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                del pending[task]
+                task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def get_executor(workers: int) -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to run probes concurrently, creating it
+    if it does not exist or if the number of workers has been changed.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="djk8s-probe"
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def _report(error):
+    """
+    Update the readiness state with the result of the probes and raise the NotReady
+    exception it returns, if any.
+    """
+    error = state.update(error)
+    metrics.set_ready(error is None)
+    if error is not None:
+        raise error
+
+
+def _observe(probe, request, timed_out=()):
+    """
+    Run the probe unless its circuit breaker is open and record its latency and
+    outcome in the probe metrics and circuit breaker. The outcome of a probe that
+    finishes after it timed out is not recorded in the circuit breaker, which has
+    already recorded the timeout as a failure.
+    """
+    breaker = state.breaker(probe.name)
+    if breaker is not None:
+        breaker.before()
+
+    start = time.perf_counter()
+    try:
+        probe.ready(request)
+    except Exception:
+        metrics.observe(probe.name, time.perf_counter() - start, ok=False)
+        if breaker is not None and probe not in timed_out:
+            breaker.failure()
+        raise
+    metrics.observe(probe.name, time.perf_counter() - start, ok=True)
+    if breaker is not None and probe not in timed_out:
+        breaker.success()
+
+
+async def _aobserve(probe, request):
+    """
+    Run the probe asynchronously unless its circuit breaker is open and record its
+    latency and outcome.
+    """
+    breaker = state.breaker(probe.name)
+    if breaker is not None:
+        breaker.before()
+
+    start = time.perf_counter()
+    try:
+        await probe.aready(request)
+    except Exception:
+        metrics.observe(probe.name, time.perf_counter() - start, ok=False)
+        if breaker is not None:
+            breaker.failure()
+        raise
+    metrics.observe(probe.name, time.perf_counter() - start, ok=True)
+    if breaker is not None:
+        breaker.success()
+
+
+def _run_probe(probe, request, started=None, timed_out=()):
+    if started is not None:
+        started[probe] = time.monotonic()
+
+    try:
+        _observe(probe, request, timed_out)
+    finally:
+        # Probe threads do not receive request signals so close any connections that
+        # have errored or outlived CONN_MAX_AGE the same way Django does per request.
+        close_old_connections()
+
+
+def _check_limits(probes, started, start, deadline, timed_out):
+    """
+    Raise NotReady for the first probe that has exceeded its timeout or the deadline.
+    A probe that was running when it exceeded its limit is added to timed_out and
+    counted as a failure by its circuit breaker, since a cancelled task or abandoned
+    thread never reports its own outcome.
+
+    :returns: The number of seconds until the next limit or None if there is none.
+    """
+    now = time.monotonic()
+    limits = []
+    for probe in probes:
+        limit, msg = _probe_limit(probe, started.get(probe), start, deadline)
+        if probe not in started and _timeout(probe) is not None:
+            # The probe's full timeout begins once a worker picks it up.
+            limits.append(now + START_POLL_INTERVAL)
+
+        if limit is None:
+            continue
+
+        if limit <= now:
+            logger.warning(msg)
+            metrics.timeout(probe.name)
+
+            breaker = state.breaker(probe.name)
+            if breaker is not None and probe in started:
+                timed_out.add(probe)
+                breaker.failure()
+            raise NotReady(msg)
+        limits.append(limit)
+
+    return min(limits) - now if limits else None
+
+
+def _probe_limit(probe, started, start, deadline):
+    """
+    Compute the monotonic time by which the probe must finish and the message to
+    report if it does not, taking the earlier of the probe timeout and the deadline
+    (measured from the start of the readiness check). The timeout is measured from
+    when the probe started running or, while it is still queued, from the start of
+    the check, so that a pool filled by hung probes cannot block the check.
+    """
+    limits = []
+    timeout = _timeout(probe)
+    if timeout is not None and started is not None:
+        limits.append((started + timeout, f"{probe.name}: probe timed out after {timeout}s"))
+    elif timeout is not None:
+        limits.append((start + timeout, f"{probe.name}: probe was not started within {timeout}s"))
+
+    if deadline is not None:
+        limits.append((start + deadline, f"{probe.name}: readiness deadline of {deadline}s exceeded"))
+
+    if not limits:
+        return None, None
+    return min(limits, key=lambda limit: limit[0])
+
+
+def _timeout(probe):
+    return probe.timeout if probe.timeout is not None else settings.DJK8S_PROBE_TIMEOUT
@@ -0,0 +1,185 @@
+import os
+import sys
+import atexit
+import socket
+import logging
+import threading
+import socketserver
+
+from djk8s.conf import settings
+from djk8s.probes import NotReady
+from djk8s.cache import readiness_cache
+from djk8s.checks import check_ready, check_startup
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# Management commands that run a long-lived server and may start the probe server.
+SERVER_COMMANDS = ("runserver",)
+
+# The probe server running in this process, if any.
+_server = None
+_server_lock = threading.Lock()
+
+
+class ProbeServer(socketserver.UnixStreamServer):
+    """
+    Answers probe requests from the djk8s-probe client on a UNIX domain socket using
+    the probe registry of the running process, so that Kubernetes exec probes do not
+    have to start a new interpreter and set up Django on every probe.
+
+    The protocol is a single line command ("live", "health", "ready", or "startup")
+    answered by a single line containing an HTTP-like status code and a message.
+    Requests are handled one at a time in the server thread so that the connections
+    opened by the probes are reused from probe to probe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.cache = readiness_cache()
+        super().__init__(path, ProbeRequestHandler)
+
+    def check(self, command: str):
+        """
+        Perform the probe named by the command.
+
+        :returns: A tuple of the status code and message to respond with.
+        """
+        if command in ("live", "health"):
+            return 200, "Ok"
+
+        try:
+            if command == "startup":
+                check_startup()
+            elif command == "ready":
+                # Requests are not handled by Django, so close connections here.
+                check_ready(self.cache, close_connections=True)
+            else:
+                return 400, f"unknown probe command {command!r}"
+        except NotReady as e:
+            return e.status, e.content
+        return 200, "Ok"
+
+    def server_close(self):
+        super().server_close()
+
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ProbeRequestHandler(socketserver.StreamRequestHandler):
+
+    # Do not allow a stuck client to block the server from answering other probes.
+    timeout = 5
+
+    def handle(self):
+        try:
+            command = self.rfile.readline(64).strip().decode(errors="replace")
+        except OSError:
+            return
+
+        # Connections without a command are liveness checks of the server itself.
+        if not command:
+            return
+
+        try:
+            status, content = self.server.check(command)
+        except Exception as e:
+            logger.exception(f"probe server could not handle {command!r}: {str(e)}")
+            status, content = 500, "probe server error"
+
+        content = " ".join(str(content).split())
+        self.wfile.write(f"{status} {content}\n".encode())
+
+
+def start(path: str = None):
+    """
+    Start the probe server in a daemon thread if it is not already running in this
+    or another process on the same socket.
+
+    :param path: The socket path, by default the DJK8S_PROBE_SOCKET setting.
+    :returns: The running probe server or None if it was not started.
+    """
+    global _server
+    path = path or settings.DJK8S_PROBE_SOCKET
+    if not path:
+        return None
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        if os.path.exists(path):
+            if is_listening(path):
+                logger.info(f"probe server is already listening on {path}")
+                return None
+            # Remove the socket left behind by a process that has exited.
+            os.unlink(path)
+
+        try:
+            server = ProbeServer(path)
+        except OSError as e:
+            logger.warning(f"could not start probe server on {path}: {str(e)}")
+            return None
+
+        thread = threading.Thread(
+            target=server.serve_forever, name="djk8s-probe-server", daemon=True
+        )
+        thread.start()
+        logger.info(f"probe server listening on {path}")
+        atexit.register(stop)
+        _server = server
+        return server
+
+
+def stop():
+    """
+    Stop the probe server running in this process, if any.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+
+
+def is_listening(path: str) -> bool:
+    """
+    Check if a server is accepting connections on the UNIX domain socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1)
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def should_start(argv=None) -> bool:
+    """
+    The probe server only runs in long-lived server processes: the management
+    commands in SERVER_COMMANDS and the programs in DJK8S_PROBE_SERVER_PROGRAMS (e.g.
+    gunicorn, uvicorn, or a celery worker), not in one-off commands or scripts.
+    """
+    argv = sys.argv if argv is None else argv
+    if not argv:
+        return False
+
+    prog = os.path.normpath(argv[0])
+    name = os.path.basename(prog)
+    if name == "__main__.py":
+        # Programs run with python -m, e.g. python -m gunicorn.
+        name = os.path.basename(os.path.dirname(prog))
+
+    if name in ("manage.py", "django-admin", "django"):
+        return len(argv) > 1 and argv[1] in SERVER_COMMANDS
+
+    for program in settings.DJK8S_PROBE_SERVER_PROGRAMS:
+        program, *subcommands = program.split()
+        if name == program and all(command in argv[1:] for command in subcommands):
+            return True
+    return False
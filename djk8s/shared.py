@@ -0,0 +1,250 @@
+"""
+A readiness cache shared by all of the worker processes of a server through a small
+memory-mapped status file, so that only one worker runs the readiness probes and every
+worker answers readiness requests from the same result.
+"""
+
+import os
+import mmap
+import time
+import fcntl
+import struct
+import logging
+
+from djk8s.cache import ReadinessCache
+from djk8s.runner import run_probes
+from asgiref.sync import sync_to_async
+from djk8s.probes import NotReady, registry
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# The fixed layout of the status file: a magic number, the layout version, the status
+# code of the last result (200 if ready), a generation counter that is odd while the
+# result is being written, the wall clock time of the result, and the length of the
+# not ready message, followed by the message itself.
+MAGIC = b"DJK8"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQdH")
+GENERATION = struct.Struct("<Q")
+GENERATION_OFFSET = 8
+SIZE = 512
+MAX_CONTENT = SIZE - HEADER.size
+
+# The number of times a reader retries when the result is written while it is read.
+READ_RETRIES = 16
+
+
+class StatusFile(object):
+    """
+    A fixed-layout status file that is mapped into the memory of every process. The
+    result is written with a sequence lock: the writer makes the generation odd, writes
+    the result, then makes the generation even again, and readers retry if the
+    generation changed while they were reading, so neither readers nor the writer ever
+    block on a lock. Only the process that holds an exclusive flock on the file may
+    write to it; the lock is released by the kernel if the process exits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self.fd).st_size < SIZE:
+            os.ftruncate(self.fd, SIZE)
+        self.map = mmap.mmap(self.fd, SIZE)
+        self.pid = os.getpid()
+        self.locked = False
+
+    def acquire(self) -> bool:
+        """
+        Try to become the writer of the status file without blocking.
+
+        :returns: True if this process holds the write lock.
+        """
+        if self.locked:
+            return True
+
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+
+        self.locked = True
+        logger.info(f"process {self.pid} is writing readiness results to {self.path}")
+        return True
+
+    def read(self):
+        """
+        Read the last result written to the file.
+
+        :returns: A tuple of (wall clock time, NotReady or None), or None if no result
+            has been written or it could not be read consistently.
+        """
+        for _ in range(READ_RETRIES):
+            generation = GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0]
+            if generation % 2:
+                continue
+
+            data = self.map[:SIZE]
+            if GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0] != generation:
+                continue
+
+            magic, version, status, _, updated, length = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                return None
+
+            if status == 200:
+                return updated, None
+
+            content = data[HEADER.size:HEADER.size + length].decode(errors="replace")
+            return updated, NotReady(content, status=status)
+        return None
+
+    def write(self, updated: float, error: NotReady = None):
+        """
+        Write a result to the file; must only be called by the process holding the lock.
+        """
+        status, content = 200, b""
+        if error is not None:
+            status = error.status
+            content = str(error.content).encode()[:MAX_CONTENT]
+
+        generation = GENERATION.unpack_from(self.map, GENERATION_OFFSET)[0]
+        generation += generation % 2
+
+        GENERATION.pack_into(self.map, GENERATION_OFFSET, generation + 1)
+        self.map[HEADER.size:HEADER.size + len(content)] = content
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, status, generation + 1, updated, len(content))
+        GENERATION.pack_into(self.map, GENERATION_OFFSET, generation + 2)
+
+    def close(self):
+        """
+        Unmap the file and release the write lock if it is held.
+        """
+        self.map.close()
+        os.close(self.fd)
+        self.locked = False
+
+
+class SharedReadinessCache(ReadinessCache):
+    """
+    A readiness cache that shares the results of the readiness probes between the
+    worker processes of a server (e.g. gunicorn workers) through a memory-mapped
+    status file. One worker is elected the writer by acquiring a lock on the file and
+    refreshes the results every ttl seconds; every worker answers readiness requests
+    from the file without running probes, taking locks, or querying the database.
+
+    If the results are stale, e.g. because the writer has exited, the reading worker
+    tries to become the writer; while another process holds the lock (e.g. because its
+    probes are hung) stale results are reported as not ready.
+
+    Probes that check the state of their own process (those that set process_local,
+    e.g. the LoadProbe) are not shared; every worker runs them itself after checking
+    the shared results. The drain state is also per process and is checked before the
+    cache by the readiness checks.
+    """
+
+    def __init__(self, probes, ttl: float, max_age: float = None, path: str = None):
+        """
+        :param path: The path of the status file, which should be on a local (e.g.
+            tmpfs or emptyDir) volume that is shared by the worker processes.
+        """
+        super().__init__(probes, ttl, max_age)
+        self.path = path
+        self.file = None
+
+    @property
+    def status(self) -> StatusFile:
+        """
+        The status file opened by this process; the file is reopened after a fork so
+        that the workers of a preloaded server do not share the master's lock.
+        """
+        if self.file is None or self.file.pid != os.getpid():
+            if self.file is not None:
+                # Closing the inherited descriptor does not release the parent's lock.
+                self.file.close()
+            self.file = StatusFile(self.path)
+            self._thread = None
+        return self.file
+
+    def check(self):
+        """
+        Check the shared readiness results, becoming the writer if they are stale.
+
+        :raises NotReady: If the last result was not ready or is stale.
+        """
+        # Only refresh inline when becoming the writer; if this process is already the
+        # writer, stale results mean its refresher is stuck on a hung probe.
+        snapshot = self.status.read()
+        if self.is_stale(snapshot) and not self.status.locked and self.status.acquire():
+            with self._lock:
+                self.refresh()
+                self.start()
+            snapshot = self.status.read()
+
+        if snapshot is None:
+            # The writer has not written a result yet, so check this process directly.
+            run_probes(self.probes or registry.probes, None)
+            return
+
+        updated, error = snapshot
+        if time.time() - updated > self.max_age:
+            raise NotReady("cache: readiness results are stale")
+
+        if error is not None:
+            raise error
+
+        # The process-local probes are checked directly; reporting them through the
+        # readiness state would reset the failures counted by the writer's refreshes.
+        local_probes = self.local_probes
+        if local_probes:
+            run_probes(local_probes, None, report=False)
+
+    async def acheck(self):
+        """
+        Check the shared readiness results without blocking the event loop; if the
+        probes must be run the check is performed in a worker thread.
+
+        :raises NotReady: If the last result was not ready or is stale.
+        """
+        if self.is_stale(self.status.read()):
+            return await sync_to_async(self.check, thread_sensitive=False)()
+        return self.check()
+
+    @property
+    def cached_probes(self):
+        """
+        The readiness probes whose results are shared with the other processes.
+        """
+        return [probe for probe in self.probes or registry.probes if not probe.process_local]
+
+    @property
+    def local_probes(self):
+        """
+        The readiness probes that every process runs itself.
+        """
+        return [probe for probe in self.probes or registry.probes if probe.process_local]
+
+    def is_stale(self, snapshot) -> bool:
+        """
+        A result must be refreshed (by a new writer if necessary) if there is no result
+        or it is older than the max age.
+        """
+        return snapshot is None or time.time() - snapshot[0] > self.max_age
+
+    def refresh(self):
+        """
+        Run the shared readiness probes and write the result to the status file.
+        """
+        super().refresh()
+        _, error = self.snapshot
+        self.status.write(time.time(), error)
+
+    def stop(self, timeout: float = None):
+        """
+        Stop refreshing the results and release the write lock so that another worker
+        can become the writer.
+        """
+        super().stop(timeout)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,11 @@
+from django.dispatch import Signal
+
+
+# Sent when the readiness state changes from ready to not ready or back again, with
+# the ready and error (a NotReady exception or None) keyword arguments.
+readiness_changed = Signal()
+
+# Sent when the circuit breaker of a readiness probe changes state, with the probe
+# (the probe name), state ("closed", "open", or "half-open"), and retry_after (the
+# number of seconds until the next attempt while open) keyword arguments.
+breaker_changed = Signal()
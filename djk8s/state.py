@@ -0,0 +1,211 @@
+import time
+import random
+import logging
+import threading
+
+from djk8s.conf import settings
+from djk8s.probes import NotReady
+from django.core.signals import setting_changed
+from djk8s.signals import readiness_changed, breaker_changed
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# The states of a probe's circuit breaker.
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker(object):
+    """
+    Stops running a readiness probe after it has failed threshold times in a row so
+    that pods do not keep hammering a dependency that is already struggling. While the
+    breaker is open the probe is reported as not ready without being run; once the
+    backoff has passed a single trial run is allowed (half-open) which closes the
+    breaker if it succeeds or reopens it with twice the backoff if it fails. Backoffs
+    are jittered so that pods do not retry a recovering dependency in lockstep.
+    """
+
+    def __init__(self, probe: str, threshold: int, backoff: float = 1.0, max_backoff: float = 60.0):
+        """
+        :param probe: The name of the probe the breaker guards.
+        :param threshold: The number of consecutive failures that open the breaker.
+        :param backoff: The number of seconds the breaker stays open the first time.
+        :param max_backoff: The maximum number of seconds the breaker stays open.
+        """
+        self.probe = probe
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before(self):
+        """
+        Check that the probe may be run.
+
+        :raises NotReady: If the breaker is open or a trial run is already in progress.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+
+            now = time.monotonic()
+            if self.state == OPEN and now >= self.retry_at:
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+
+            retry_after = max(self.retry_at - now, 0)
+
+        raise NotReady(f"{self.probe}: circuit breaker is open, retrying in {retry_after:.1f}s")
+
+    def success(self):
+        """
+        Record that the probe was ready, closing the breaker.
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened = 0
+            self._trial = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def failure(self):
+        """
+        Record that the probe was not ready, opening the breaker if the threshold of
+        consecutive failures is reached or if the trial run of a half-open breaker failed.
+        """
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                self.opened += 1
+                delay = min(self.backoff * 2 ** (self.opened - 1), self.max_backoff)
+                delay = random.uniform(delay / 2, delay)
+                self.retry_at = time.monotonic() + delay
+                self._transition(OPEN, delay)
+
+    def _transition(self, state: str, retry_after: float = None):
+        self.state = state
+        if state == OPEN:
+            logger.warning(f"{self.probe}: circuit breaker opened, retrying in {retry_after:.1f}s")
+        else:
+            logger.info(f"{self.probe}: circuit breaker {state}")
+        breaker_changed.send(sender=self.__class__, probe=self.probe, state=state, retry_after=retry_after)
+
+
+class ReadinessState(object):
+    """
+    Tracks the readiness of the process across checks so that a single slow or failed
+    check does not immediately flap the pod out of (or into) the Service endpoints.
+    The process only becomes not ready after DJK8S_READINESS_FAILURE_THRESHOLD
+    consecutive failed checks and only becomes ready again after
+    DJK8S_READINESS_SUCCESS_THRESHOLD consecutive successful checks; the first check
+    sets the initial state. Also holds the per-probe circuit breakers.
+    """
+
+    def __init__(self):
+        self.ready = None
+        self.successes = 0
+        self.failures = 0
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def update(self, error: NotReady = None):
+        """
+        Record the result of a readiness check and return the error to report, if any.
+
+        :param error: The NotReady exception raised by the check or None if it was ready.
+        :returns: None if the process is ready, otherwise the NotReady exception to raise.
+        """
+        with self._lock:
+            if error is None:
+                self.successes += 1
+                self.failures = 0
+            else:
+                self.failures += 1
+                self.successes = 0
+
+            if self.ready is None:
+                ready = error is None
+            elif self.ready:
+                ready = self.failures < settings.DJK8S_READINESS_FAILURE_THRESHOLD
+            else:
+                ready = self.successes >= settings.DJK8S_READINESS_SUCCESS_THRESHOLD
+
+            changed = ready != self.ready
+            self.ready = ready
+            successes = self.successes
+
+        if changed:
+            if ready:
+                logger.info("readiness: process is ready")
+            else:
+                logger.warning(f"readiness: process is not ready: {error}")
+            readiness_changed.send(sender=self.__class__, ready=ready, error=error)
+        elif ready and error is not None:
+            logger.warning(f"readiness: ignoring failed check below the failure threshold: {error}")
+
+        if ready:
+            return None
+
+        if error is None:
+            threshold = settings.DJK8S_READINESS_SUCCESS_THRESHOLD
+            error = NotReady(f"readiness: {successes} of {threshold} successful checks required")
+        return error
+
+    def breaker(self, probe: str) -> CircuitBreaker:
+        """
+        Return the circuit breaker for the named probe or None if circuit breakers are
+        disabled because DJK8S_PROBE_BREAKER_THRESHOLD is not set.
+        """
+        threshold = settings.DJK8S_PROBE_BREAKER_THRESHOLD
+        if not threshold:
+            return None
+
+        with self._lock:
+            breaker = self._breakers.get(probe)
+            if breaker is None:
+                breaker = self._breakers[probe] = CircuitBreaker(
+                    probe,
+                    threshold,
+                    backoff=settings.DJK8S_PROBE_BREAKER_BACKOFF,
+                    max_backoff=settings.DJK8S_PROBE_BREAKER_MAX_BACKOFF,
+                )
+            return breaker
+
+    def reset(self):
+        with self._lock:
+            self.ready = None
+            self.successes = 0
+            self.failures = 0
+            self._breakers = {}
+
+
+state = ReadinessState()
+
+
+def reset_state(*args, **kwargs):
+    """
+    Reset the readiness state and circuit breakers when their settings are changed.
+    """
+    if kwargs["setting"] in (
+        "DJK8S_READINESS_SUCCESS_THRESHOLD",
+        "DJK8S_READINESS_FAILURE_THRESHOLD",
+        "DJK8S_PROBE_BREAKER_THRESHOLD",
+        "DJK8S_PROBE_BREAKER_BACKOFF",
+        "DJK8S_PROBE_BREAKER_MAX_BACKOFF",
+    ):
+        state.reset()
+
+
+setting_changed.connect(reset_state)
@@ -1,9 +1,10 @@
 from django.urls import path
-from djk8s.views import LivenessView, ReadinessView
+from djk8s.views import LivenessView, AsyncReadinessView
 
 
 urlpatterns = [
     path("livez", LivenessView.as_view(), name="liveness-probe"),
     path("healthz", LivenessView.as_view(), name="health-probe"),
-    path("readyz", ReadinessView.as_view(), name="readiness-probe"),
+    # Runs on the event loop under ASGI; under WSGI Django runs it with async_to_sync.
+    path("readyz", AsyncReadinessView.as_view(), name="readiness-probe"),
 ]
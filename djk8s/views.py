@@ -1,10 +1,9 @@
-from djk8s.conf import settings
 from django.http import HttpResponse
+from djk8s.checks import check_ready, acheck_ready
 from django.views.generic import View
-from djk8s.probes import NotReady, ReadinessProbe
+from djk8s.probes import NotReady, registry
 from django.utils.functional import classproperty
 from django.utils.decorators import classonlymethod
-from django.core.exceptions import ImproperlyConfigured
 
 
 class LivenessView(View):
@@ -18,32 +17,21 @@ class LivenessView(View):
 
 class ReadinessView(View):
     """
-    A view that checks readiness using configured probes. If any probe raises NotReady,
-    it returns a 503 Service Unavailable response. Otherwise it returns a 200 OK.
+    A view that checks readiness using configured probes once the warm-up hooks have
+    completed. If any probe raises NotReady, it returns a 503 Service Unavailable
+    response. Otherwise it returns a 200 OK.
     """
 
     @classproperty
     def probes(cls):
-        if not hasattr(cls, "__probes"):
-            cls.__probes = [Probe() for Probe in settings.DJK8S_READINESS_PROBES]
-        return cls.__probes
+        return registry.probes
 
     @classonlymethod
     def as_view(cls, **kwargs):
         """
         Override the as_view method to ensure probes are initialized.
         """
-        if not cls.probes:
-            raise ImproperlyConfigured(
-                "No readiness probes configured for ReadinessView."
-            )
-
-        for probe in cls.probes:
-            if not isinstance(probe, ReadinessProbe):
-                raise ImproperlyConfigured(
-                    f"Probe {probe} is not an instance of ReadinessProbe."
-                )
-
+        cls.probes
         return super().as_view(**kwargs)
 
     def get(self, request, *args, **kwargs):
@@ -52,8 +40,26 @@ class ReadinessView(View):
         If any probe is not ready, return a 503 Service Unavailable response.
         """
         try:
-            for probe in self.probes:
-                probe.ready(request)
+            check_ready(probes=self.probes, request=request)
+        except NotReady as e:
+            return e.response()
+
+        return HttpResponse("Ok", status=200, content_type="text/plain")
+
+
+class AsyncReadinessView(ReadinessView):
+    """
+    An async version of the ReadinessView for ASGI deployments that runs all of the
+    configured probes concurrently on the event loop rather than in a worker thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Check readiness by concurrently executing all configured probes.
+        If any probe is not ready, return a 503 Service Unavailable response.
+        """
+        try:
+            await acheck_ready(probes=self.probes, request=request)
         except NotReady as e:
             return e.response()
 
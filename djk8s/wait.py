@@ -0,0 +1,149 @@
+"""
+Helpers shared by the management commands that wait for a service to become ready.
+"""
+
+import sys
+import time
+import random
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+# The minimum number of seconds between "not ready" messages written while waiting.
+LOG_INTERVAL = 5.0
+
+
+def write_stderr(msg):
+    """
+    Write a progress message to stderr; the default log of the wait commands.
+    """
+    sys.stderr.write(msg + "\n")
+    sys.stderr.flush()
+
+
+class Backoff(object):
+    """
+    Computes exponentially increasing delays with jitter between retries so that many
+    pods waiting on the same service do not retry it in lockstep. Each delay is chosen
+    at random between (1 - jitter) and 1 times the current backoff.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.25,
+        maximum: float = 5.0,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+    ):
+        """
+        :param initial: The number of seconds of the first delay.
+        :param maximum: The maximum number of seconds of any delay.
+        :param factor: The multiplier applied to the backoff after every delay.
+        :param jitter: The fraction of each delay that is randomized between 0 and 1.
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.current = initial
+
+    def next(self) -> float:
+        """
+        Return the next delay in seconds and increase the backoff.
+        """
+        delay = min(self.current, self.maximum)
+        self.current = delay * self.factor
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+    def reset(self):
+        self.current = self.initial
+
+
+def wait_until(
+    check,
+    timeout: float,
+    stable: float = 0,
+    backoff: Backoff = None,
+    log=None,
+    name: str = "service",
+    errors=(Exception,),
+):
+    """
+    Call check until it has succeeded continuously for stable seconds. Failed checks
+    are retried with an exponential backoff; while the service is stable it is checked
+    every initial backoff interval. Failures are reported with log at most once every
+    LOG_INTERVAL seconds.
+
+    :param check: A callable that raises one of errors if the service is not ready.
+    :param timeout: The maximum number of seconds to wait for the service.
+    :param stable: The number of seconds the service must be ready for.
+    :param backoff: The Backoff used to compute the delay between checks.
+    :param log: A callable to write progress messages to or None to be silent.
+    :param name: The name of the service used in progress messages.
+    :param errors: The exceptions raised by check if the service is not ready.
+    :returns: The number of seconds waited.
+    :raises TimeoutError: If the service is not ready and stable before the timeout.
+    """
+    backoff = backoff or Backoff()
+    start = time.monotonic()
+    deadline = start + timeout
+    alive = None
+    logged = None
+
+    while True:
+        try:
+            check()
+        except errors as e:
+            alive = None
+            now = time.monotonic()
+            if now >= deadline:
+                raise TimeoutError(f"{name} was not ready after {timeout:g}s") from e
+
+            if log is not None and (logged is None or now - logged >= LOG_INTERVAL):
+                msg = " ".join(str(e).split())
+                log(f"{name} not ready: {msg} (elapsed: {now - start:.1f}s)")
+                logged = now
+
+            time.sleep(min(backoff.next(), deadline - now))
+            continue
+
+        now = time.monotonic()
+        if alive is None:
+            alive = now
+            backoff.reset()
+
+        if now - alive >= stable:
+            if log is not None:
+                log(f"{name} ready after {now - start:.1f}s")
+            return now - start
+
+        time.sleep(min(backoff.initial, alive + stable - now))
+
+
+def wait_all(waits):
+    """
+    Run the wait callables (e.g. partial applications of wait_until) concurrently,
+    each in its own thread, and return once all of them have returned.
+
+    :param waits: The callables that wait for a service.
+    :raises TimeoutError: If any of the callables timed out; the message combines the
+        messages of every timeout.
+    """
+    if len(waits) == 1:
+        waits[0]()
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=len(waits), thread_name_prefix="djk8s-wait"
+    ) as executor:
+        futures = [executor.submit(wait) for wait in waits]
+
+    errors = []
+    for future in futures:
+        try:
+            future.result()
+        except TimeoutError as e:
+            errors.append(str(e))
+
+    if errors:
+        raise TimeoutError("; ".join(errors))
@@ -0,0 +1,133 @@
+import os
+import logging
+import threading
+
+from djk8s.conf import settings
+from django.core.signals import setting_changed
+
+
+logger = logging.getLogger("djk8s.probe")
+
+# The cache key fetched by touch_caches to open connections to the cache servers.
+WARMUP_CACHE_KEY = "djk8s:warmup"
+
+
+def connect_databases():
+    """
+    Open a connection to every database checked by the DatabaseProbe, so that
+    databases excluded by DJK8S_DATABASE_PROBE_ALIASES do not gate readiness.
+    """
+    from django.db import connections
+    from djk8s.probes import DatabaseProbe
+
+    for name in DatabaseProbe().aliases:
+        connections[name].ensure_connection()
+
+
+def populate_urlconf():
+    """
+    Import the root URLconf and populate the URL resolver's lookup tables.
+    """
+    from django.urls import get_resolver
+
+    get_resolver().reverse_dict
+
+
+def load_templates():
+    """
+    Load and compile every template found in the template directories of all of the
+    configured template engines so that cached template loaders are primed.
+    """
+    from django.template import engines
+
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, files in os.walk(directory):
+                for fname in files:
+                    if fname.startswith("."):
+                        continue
+
+                    name = os.path.relpath(os.path.join(root, fname), directory)
+                    try:
+                        engine.get_template(name)
+                    except Exception as e:
+                        logger.debug(f"could not load template {name}: {str(e)}")
+
+
+def touch_caches():
+    """
+    Fetch a key from every cache checked by the CacheProbe to open connections to the
+    cache servers.
+    """
+    from django.core.cache import caches
+    from djk8s.probes import CacheProbe
+
+    for alias in CacheProbe().aliases:
+        caches[alias].get(WARMUP_CACHE_KEY)
+
+
+class Warmup(object):
+    """
+    Runs the DJK8S_WARMUP_HOOKS once per process so that the first requests served by
+    a new pod do not pay to open connections, resolve URLs, compile templates, etc.
+    Hooks that raise an exception are logged and retried on the next run; the warm-up
+    is complete once every hook has succeeded.
+    """
+
+    def __init__(self):
+        self.complete = False
+        self._done = set()
+        self._lock = threading.Lock()
+
+    def run(self) -> bool:
+        """
+        Run any warm-up hooks that have not yet succeeded. If another thread is
+        already running the hooks this returns immediately rather than blocking.
+
+        :returns: True if the warm-up is complete, False otherwise.
+        """
+        if self.complete:
+            return True
+
+        if not self._lock.acquire(blocking=False):
+            return False
+
+        try:
+            for hook in settings.DJK8S_WARMUP_HOOKS:
+                if hook in self._done:
+                    continue
+
+                try:
+                    hook()
+                except Exception as e:
+                    name = getattr(hook, "__name__", repr(hook))
+                    logger.exception(f"warm-up hook {name} failed: {str(e)}")
+                    return False
+                self._done.add(hook)
+
+            self.complete = True
+            return True
+        finally:
+            self._lock.release()
+
+    def reset(self):
+        """
+        Reset the warm-up so that all of the hooks are run again.
+        """
+        with self._lock:
+            self.complete = False
+            self._done = set()
+
+
+warmup = Warmup()
+
+
+def reset_warmup(*args, **kwargs):
+    """
+    Reset the warm-up when the configured warm-up hooks are changed.
+    """
+    if kwargs["setting"] == "DJK8S_WARMUP_HOOKS":
+        warmup.reset()
+
+
+setting_changed.connect(reset_warmup)
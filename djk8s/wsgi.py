@@ -0,0 +1,100 @@
+"""
+A WSGI application wrapper that answers probes before Django handles the request.
+"""
+
+from http import HTTPStatus
+
+from djk8s.conf import settings
+from djk8s.cache import readiness_cache
+from djk8s.probes import NotReady, registry
+from djk8s.checks import check_ready, check_startup
+
+
+class ProbeApplication(object):
+    """
+    Wraps a WSGI application (e.g. the result of get_wsgi_application) and answers
+    GET requests to the health, startup, and readiness paths directly from the WSGI
+    environ using the same probes as the ProbeMiddleware. Probes never build an
+    HttpRequest, send the request_started and request_finished signals, or pass
+    through the middleware stack, so liveness checks only cost a dictionary lookup.
+    All other requests are passed to the wrapped application.
+
+    In your wsgi.py module:
+
+        application = ProbeApplication(get_wsgi_application())
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+        # Build the shared readiness probes so misconfiguration is detected at startup.
+        registry.probes
+
+        # If configured, serve readiness requests from periodically refreshed results.
+        self.cache = readiness_cache()
+
+        # Paths that are answered directly instead of being passed to the application.
+        self.handlers = {}
+        for path in settings.DJK8S_READY_PATHS:
+            self.handlers[path] = self.ready
+
+        for path in settings.DJK8S_HEALTH_PATHS:
+            self.handlers[path] = self.health
+
+        for path in settings.DJK8S_STARTUP_PATHS:
+            self.handlers[path] = self.startup
+
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") == "GET":
+            path = environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", "")
+            handler = self.handlers.get(path)
+            if handler is not None:
+                status, content = handler()
+                return respond(start_response, status, content)
+
+        return self.application(environ, start_response)
+
+    def health(self):
+        """
+        The process is live if it can answer the request.
+        """
+        return 200, "Ok"
+
+    def startup(self):
+        """
+        Runs the warm-up hooks and reports ready once they have all succeeded.
+        """
+        try:
+            check_startup()
+        except NotReady as e:
+            return e.status, e.content
+        return 200, "Ok"
+
+    def ready(self):
+        """
+        Runs the readiness probes (or checks the cached results) once the warm-up is
+        complete. Since the request_finished signal is not sent, connections that have
+        become unusable or exceeded their maximum age are closed here.
+        """
+        try:
+            check_ready(self.cache, close_connections=True)
+        except NotReady as e:
+            return e.status, e.content
+        return 200, "Ok"
+
+
+def respond(start_response, status: int, content: str):
+    """
+    Start a plain text response and return the body.
+    """
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = "Unknown"
+
+    body = content.encode()
+    start_response(
+        f"{status} {reason}",
+        [("Content-Type", "text/plain"), ("Content-Length", str(len(body)))],
+    )
+    return [body]
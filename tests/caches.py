@@ -0,0 +1,15 @@
+from types import SimpleNamespace
+from django.core.cache.backends.memcached import BaseMemcachedCache
+
+
+class FakeMemcachedCache(BaseMemcachedCache):
+    """
+    A memcached cache backend that does not require a memcached client library.
+    """
+
+    def __init__(self, server, params):
+        library = SimpleNamespace(Client=None)
+        super().__init__(server, params, library=library, value_not_found_exception=KeyError)
+
+    def close(self, **kwargs):
+        pass
@@ -0,0 +1,12 @@
+calls = []
+broken = False
+
+
+def record():
+    calls.append("record")
+
+
+def flaky():
+    if broken:
+        raise RuntimeError("warm-up dependency is unavailable")
+    calls.append("flaky")
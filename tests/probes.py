@@ -1,3 +1,6 @@
+import time
+import asyncio
+
 from djk8s.probes import ReadinessProbe, NotReady
 
 
@@ -5,3 +8,41 @@ class NeverReady(ReadinessProbe):
 
     def ready(self, request):
         raise NotReady("test is not ready", status=503)
+
+
+class CountingProbe(ReadinessProbe):
+
+    calls = 0
+
+    def ready(self, request):
+        CountingProbe.calls += 1
+
+
+class ToggleProbe(ReadinessProbe):
+
+    is_ready = True
+    calls = 0
+
+    def ready(self, request):
+        ToggleProbe.calls += 1
+        if not ToggleProbe.is_ready:
+            raise NotReady("toggle is not ready", status=503)
+
+
+class SlowProbe(ReadinessProbe):
+
+    delay = 0.5
+
+    def ready(self, request):
+        time.sleep(SlowProbe.delay)
+
+
+class AsyncSlowProbe(ReadinessProbe):
+
+    delay = 0.5
+
+    def ready(self, request):
+        time.sleep(AsyncSlowProbe.delay)
+
+    async def aready(self, request):
+        await asyncio.sleep(AsyncSlowProbe.delay)
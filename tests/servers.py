@@ -0,0 +1,127 @@
+import socketserver
+import threading
+
+
+class FakeServer(socketserver.ThreadingTCPServer):
+    """
+    A threaded TCP server on a random local port that answers line based requests
+    from the responses dictionary so probes can be tested without a live service.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        super().__init__(("127.0.0.1", 0), FakeHandler)
+
+    @property
+    def location(self):
+        host, port = self.server_address
+        return f"{host}:{port}"
+
+    def __enter__(self):
+        self.thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+
+class FakeHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            self.server.requests.append(line)
+            response = self.server.responses.get(line.strip(), b"ERROR\r\n")
+            self.wfile.write(response)
+            self.wfile.flush()
+
+
+class SilentServer(FakeServer):
+    """
+    A server that accepts connections and reads requests but never responds.
+    """
+
+    def __init__(self):
+        super().__init__({})
+        self.RequestHandlerClass = SilentHandler
+
+
+class SilentHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while self.rfile.readline():
+            pass
+
+
+class FakeMemcachedServer(FakeServer):
+
+    def __init__(self):
+        super().__init__({
+            b"stats": b"STAT pid 1\r\nSTAT uptime 10\r\nEND\r\n",
+            b"version": b"VERSION 1.6.21\r\n",
+        })
+
+
+class FakeRedisServer(FakeServer):
+    """
+    A fake redis server that understands the AUTH and PING commands.
+    """
+
+    def __init__(self, password=None):
+        self.password = password
+        super().__init__({})
+        self.RequestHandlerClass = FakeRedisHandler
+
+    @property
+    def location(self):
+        host, port = self.server_address
+        if self.password:
+            return f"redis://:{self.password}@{host}:{port}/0"
+        return f"redis://{host}:{port}/0"
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        authenticated = self.server.password is None
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+
+            self.server.requests.append(command)
+            if command[0] == b"AUTH":
+                authenticated = command[-1].decode() == self.server.password
+                reply = b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n"
+            elif not authenticated:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            elif command[0] == b"PING":
+                reply = b"+PONG\r\n"
+            else:
+                reply = b"-ERR unknown command\r\n"
+
+            self.wfile.write(reply)
+            self.wfile.flush()
+
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header.startswith(b"*"):
+            return None
+
+        args = []
+        for _ in range(int(header[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
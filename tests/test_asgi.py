@@ -0,0 +1,91 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from djk8s.asgi import ProbeApplication, request_path
+
+
+class TestProbeApplication(TestCase):
+
+    def setUp(self):
+        self.scopes = []
+        self.application = ProbeApplication(self.wrapped)
+
+    async def wrapped(self, scope, receive, send):
+        self.scopes.append(scope)
+        if scope["type"] == "http":
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"app"})
+
+    async def call(self, path, method="GET", type="http", application=None, **extra):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": type, "method": method, "path": path, "headers": [], **extra}
+        await (application or self.application)(scope, receive, send)
+        if not messages:
+            return None, None
+
+        return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:]).decode()
+
+    async def test_health(self):
+        for path in ("/livez", "/healthz"):
+            status, body = await self.call(path)
+            self.assertEqual(status, 200)
+            self.assertEqual(body, "Ok")
+        self.assertEqual(self.scopes, [])
+
+    async def test_ready(self):
+        status, body = await self.call("/readyz")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, "Ok")
+
+        status, body = await self.call("/startupz")
+        self.assertEqual(status, 200)
+        self.assertEqual(self.scopes, [])
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"])
+    async def test_not_ready(self):
+        application = ProbeApplication(self.wrapped)
+        status, body = await self.call("/readyz", application=application)
+        self.assertEqual(status, 503)
+        self.assertEqual(body, "test is not ready")
+
+    async def test_passthrough(self):
+        status, body = await self.call("/api/items")
+        self.assertEqual(body, "app")
+
+        status, body = await self.call("/readyz", method="POST")
+        self.assertEqual(body, "app")
+
+        await self.call("/readyz", type="websocket")
+        await self.call("", type="lifespan")
+        self.assertEqual([scope["type"] for scope in self.scopes], ["http", "http", "websocket", "lifespan"])
+
+    async def test_closes_connections(self):
+        with mock.patch("djk8s.checks.close_old_connections") as close:
+            status, _ = await self.call("/readyz")
+        self.assertEqual(status, 200)
+        close.assert_called_once_with()
+
+    def test_request_path(self):
+        # The root path is matched like SCRIPT_NAME in the WSGI wrapper whether or not
+        # the server includes it in the path.
+        self.assertEqual(request_path({"path": "/readyz"}), "/readyz")
+        self.assertEqual(request_path({"path": "/app/readyz", "root_path": "/app"}), "/app/readyz")
+        self.assertEqual(request_path({"path": "/readyz", "root_path": "/app"}), "/app/readyz")
+        self.assertEqual(request_path({"path": "/application", "root_path": "/app"}), "/app/application")
+
+    async def test_root_path(self):
+        status, body = await self.call("/app/readyz", root_path="/app")
+        self.assertEqual(body, "app")
+
+        with override_settings(DJK8S_READY_PATHS=["/app/readyz"]):
+            application = ProbeApplication(self.wrapped)
+            for path in ("/app/readyz", "/readyz"):
+                status, body = await self.call(path, root_path="/app", application=application)
+                self.assertEqual(body, "Ok")
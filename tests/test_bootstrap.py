@@ -0,0 +1,63 @@
+import io
+import sys
+import subprocess
+
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from djk8s import bootstrap
+from djk8s.client import main
+from djk8s.probes import ReadinessProbe
+
+
+class AppsProbe(ReadinessProbe):
+
+    requires_apps = True
+
+    def ready(self, request):
+        from django.apps import apps
+
+        apps.check_apps_ready()
+
+
+class TestBootstrap(TestCase):
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.CountingProbe"])
+    def test_ready(self):
+        self.assertEqual(bootstrap.ready(), (200, "Ok"))
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"])
+    def test_not_ready(self):
+        status, _ = bootstrap.ready()
+        self.assertEqual(status, 503)
+        self.assertEqual(main(["--ready", "-q"]), 1)
+
+    def test_client_without_socket(self):
+        self.assertEqual(main(["--live", "-q"]), 0)
+
+    def test_client_startup_without_socket(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            with self.assertRaises(SystemExit):
+                main(["--startup", "-q"])
+        self.assertIn("--startup requires the probe server socket", stderr.getvalue())
+
+    def test_apps_are_not_populated(self):
+        code = (
+            "import os\n"
+            "os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.settings'\n"
+            "from django.conf import settings\n"
+            "from django.apps import apps\n"
+            "from djk8s import bootstrap\n"
+            "settings.DJK8S_READINESS_PROBES = [{probe!r}]\n"
+            "print(bootstrap.ready()[0], apps.ready)\n"
+        )
+
+        out = subprocess.check_output(
+            [sys.executable, "-c", code.format(probe="tests.probes.CountingProbe")], text=True
+        )
+        self.assertEqual(out.strip(), "200 False")
+
+        out = subprocess.check_output(
+            [sys.executable, "-c", code.format(probe="tests.test_bootstrap.AppsProbe")], text=True
+        )
+        self.assertEqual(out.strip(), "200 True")
@@ -0,0 +1,118 @@
+import time
+
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from djk8s.probes import NotReady
+from djk8s.cache import ReadinessCache, readiness_cache
+from djk8s.wsgi import ProbeApplication
+from djk8s.middleware import ProbeMiddleware
+from django.core.exceptions import ImproperlyConfigured
+from tests.probes import CountingProbe, NeverReady, ToggleProbe
+
+
+class TestReadinessCache(TestCase):
+    """
+    Test the ReadinessCache serves snapshots and refreshes them in the background.
+    """
+
+    def setUp(self):
+        CountingProbe.calls = 0
+        ToggleProbe.is_ready = True
+
+    def test_bad_config(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ReadinessCache([CountingProbe()], ttl=0)
+
+        with self.assertRaises(ImproperlyConfigured):
+            ReadinessCache([CountingProbe()], ttl=10, max_age=5)
+
+    def test_serves_snapshot(self):
+        cache = ReadinessCache([CountingProbe()], ttl=60)
+        try:
+            for _ in range(10):
+                cache.check()
+            self.assertEqual(CountingProbe.calls, 1)
+        finally:
+            cache.stop()
+
+    def test_not_ready_snapshot(self):
+        cache = ReadinessCache([NeverReady()], ttl=60)
+        try:
+            with self.assertRaisesRegex(NotReady, "test is not ready"):
+                cache.check()
+        finally:
+            cache.stop()
+
+    def test_stale_snapshot(self):
+        cache = ReadinessCache([CountingProbe()], ttl=60, max_age=60)
+        try:
+            cache.check()
+            with mock.patch("djk8s.cache.time.monotonic", return_value=time.monotonic() + 61):
+                with self.assertRaisesRegex(NotReady, "stale"):
+                    cache.check()
+        finally:
+            cache.stop()
+
+    def test_background_refresh(self):
+        cache = ReadinessCache([ToggleProbe()], ttl=0.01)
+        try:
+            cache.check()
+
+            ToggleProbe.is_ready = False
+            deadline = time.monotonic() + 2
+            while cache.snapshot[1] is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            with self.assertRaisesRegex(NotReady, "toggle is not ready"):
+                cache.check()
+        finally:
+            cache.stop()
+
+    def test_refresh_closes_connections(self):
+        cache = ReadinessCache([CountingProbe()], ttl=0.01)
+        with mock.patch("djk8s.cache.close_old_connections") as close:
+            try:
+                cache.check()
+                deadline = time.monotonic() + 2
+                while not close.called and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                cache.stop()
+
+        self.assertTrue(close.called)
+        self.assertGreater(CountingProbe.calls, 1)
+
+
+@override_settings(
+    ROOT_URLCONF="tests.nourls",
+    DJK8S_READINESS_CACHE_TTL=60,
+    DJK8S_READINESS_PROBES=["tests.probes.CountingProbe"],
+)
+class TestCachedProbeMiddleware(TestCase):
+    """
+    Test the ProbeMiddleware serves readiness requests from the cache when enabled.
+    """
+
+    def setUp(self):
+        CountingProbe.calls = 0
+
+    def test_cached_ready_response(self):
+        for _ in range(5):
+            response = self.client.get("/readyz")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content.decode(), "Ok")
+        self.assertEqual(CountingProbe.calls, 1)
+
+    def test_shared_by_entry_points(self):
+        # Every entry point in the process serves the same cache and refresher thread.
+        middleware = ProbeMiddleware(lambda request: None)
+        application = ProbeApplication(lambda environ, start_response: [])
+        self.assertIsInstance(middleware.cache, ReadinessCache)
+        self.assertIs(middleware.cache, application.cache)
+
+        # The cache is replaced when its settings are changed.
+        with override_settings(DJK8S_READINESS_CACHE_TTL=30):
+            self.assertIsNot(readiness_cache(), middleware.cache)
+            self.assertEqual(readiness_cache().ttl, 30)
+        self.assertTrue(middleware.cache._stop.is_set())
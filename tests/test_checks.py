@@ -0,0 +1,84 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from tests import hooks
+from djk8s.drain import drainer
+from djk8s.warmup import warmup
+from djk8s.probes import NotReady
+from djk8s.checks import check_ready, acheck_ready, check_startup, acheck_startup
+from tests.probes import CountingProbe, NeverReady
+
+
+@override_settings(DJK8S_WARMUP_HOOKS=["tests.hooks.flaky"])
+class TestChecks(TestCase):
+    """
+    Test the startup and readiness checks shared by every probe entry point.
+    """
+
+    def setUp(self):
+        CountingProbe.calls = 0
+        hooks.calls.clear()
+        hooks.broken = False
+        warmup.reset()
+
+    def tearDown(self):
+        hooks.broken = False
+        drainer.reset()
+
+    def test_startup(self):
+        hooks.broken = True
+        with self.assertLogs("djk8s.probe", "ERROR"):
+            with self.assertRaisesRegex(NotReady, "startup: warm-up is not complete"):
+                check_startup()
+
+        hooks.broken = False
+        check_startup()
+        self.assertEqual(hooks.calls, ["flaky"])
+
+    def test_ready(self):
+        hooks.broken = True
+        with self.assertLogs("djk8s.probe", "ERROR"):
+            with self.assertRaisesRegex(NotReady, "startup: warm-up is not complete"):
+                check_ready(probes=[CountingProbe()])
+        self.assertEqual(CountingProbe.calls, 0)
+
+        hooks.broken = False
+        check_ready(probes=[CountingProbe()])
+        self.assertEqual(CountingProbe.calls, 1)
+
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            check_ready(probes=[NeverReady()])
+
+    def test_draining(self):
+        with self.assertLogs("djk8s.probe", "WARNING"):
+            drainer.start()
+        with self.assertRaisesRegex(NotReady, "drain:"):
+            check_ready(probes=[CountingProbe()])
+        self.assertEqual(CountingProbe.calls, 0)
+
+    def test_cache(self):
+        cache = mock.Mock()
+        check_ready(cache, probes=[NeverReady()])
+        cache.check.assert_called_once_with()
+
+    def test_close_connections(self):
+        with mock.patch("djk8s.checks.close_old_connections") as close:
+            check_ready(probes=[CountingProbe()])
+            close.assert_not_called()
+
+            with self.assertRaises(NotReady):
+                check_ready(probes=[NeverReady()], close_connections=True)
+            close.assert_called_once_with()
+
+    async def test_async(self):
+        hooks.broken = True
+        with self.assertLogs("djk8s.probe", "ERROR"):
+            with self.assertRaisesRegex(NotReady, "startup: warm-up is not complete"):
+                await acheck_ready(probes=[CountingProbe()])
+
+        hooks.broken = False
+        await acheck_startup()
+        with mock.patch("djk8s.checks.close_old_connections") as close:
+            await acheck_ready(probes=[CountingProbe()], close_connections=True)
+        close.assert_called_once_with()
+        self.assertEqual(CountingProbe.calls, 1)
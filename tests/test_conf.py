@@ -1,4 +1,6 @@
+from unittest import mock
 from django.test import TestCase, override_settings
+from django.utils.module_loading import import_string
 
 
 class TestAppSettings(TestCase):
@@ -21,3 +23,32 @@ class TestAppSettings(TestCase):
 
         self.assertEqual(settings.DJK8S_READY_PATHS, ["/custom_ready"])
         self.assertEqual(settings.DJK8S_HEALTH_PATHS, ["/custom_health"])
+
+    def test_import_strings(self):
+        from djk8s.conf import settings
+        from djk8s.probes import DatabaseProbe, MemcachedProbe
+
+        self.assertEqual(settings.DJK8S_READINESS_PROBES, [DatabaseProbe, MemcachedProbe])
+
+        with override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"]):
+            from tests.probes import NeverReady
+            self.assertEqual(settings.DJK8S_READINESS_PROBES, [NeverReady])
+
+        self.assertEqual(settings.DJK8S_READINESS_PROBES, [DatabaseProbe, MemcachedProbe])
+
+    def test_import_strings_cached(self):
+        from djk8s.conf import settings
+
+        settings.reload()
+        with mock.patch("djk8s.conf.import_string", wraps=import_string) as importer:
+            for _ in range(10):
+                settings.DJK8S_READINESS_PROBES
+            self.assertEqual(importer.call_count, 2)
+
+    def test_reload_on_setting_changed(self):
+        from djk8s.conf import settings
+
+        self.assertEqual(settings.DJK8S_MIGRATE_LOCK_ID, 1000)
+        with override_settings(DJK8S_MIGRATE_LOCK_ID=42):
+            self.assertEqual(settings.DJK8S_MIGRATE_LOCK_ID, 42)
+        self.assertEqual(settings.DJK8S_MIGRATE_LOCK_ID, 1000)
@@ -0,0 +1,142 @@
+import os
+import time
+import signal
+import threading
+
+from django.test import TestCase, override_settings
+
+from djk8s.load import load
+from djk8s.drain import Drain, drainer
+from djk8s.probes import NotReady
+
+
+class TestDrain(TestCase):
+
+    def setUp(self):
+        load.reset()
+        drainer.reset()
+
+    def tearDown(self):
+        load.reset()
+        drainer.reset()
+
+    def test_wait(self):
+        drain = Drain()
+        drain.check()
+
+        self.assertTrue(drain.wait(timeout=1, delay=0))
+        self.assertTrue(drain.draining)
+        with self.assertRaisesRegex(NotReady, "drain:"):
+            drain.check()
+
+    def test_wait_inflight(self):
+        load.inflight = 1
+        drain = Drain()
+        self.assertFalse(drain.wait(timeout=0.1, delay=0))
+        self.assertTrue(drain.wait(timeout=0.1, delay=0, inflight=1))
+
+        timer = threading.Timer(0.1, load.reset)
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        start = time.monotonic()
+        self.assertTrue(drain.wait(timeout=5, delay=0))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait_delay(self):
+        start = time.monotonic()
+        self.assertTrue(Drain().wait(timeout=0, delay=0.1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    @override_settings(DJK8S_DRAIN_TIMEOUT=1)
+    def test_sigterm(self):
+        received = []
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+        self.addCleanup(signal.signal, signal.SIGTERM, previous)
+
+        drain = Drain()
+        self.assertTrue(drain.install())
+        os.kill(os.getpid(), signal.SIGTERM)
+        self.assertTrue(drain.draining)
+
+        # The signal is passed on to the previous handler once the process has drained.
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(received, [signal.SIGTERM])
+
+    def test_install_thread(self):
+        results = []
+        thread = threading.Thread(target=lambda: results.append(Drain().install()))
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [False])
+
+
+@override_settings(
+    ROOT_URLCONF="tests.nourls",
+    DJK8S_DRAIN_PATHS=["/drainz"],
+    DJK8S_DRAIN_TIMEOUT=0.1,
+)
+class TestDrainMiddleware(TestCase):
+
+    def setUp(self):
+        load.reset()
+
+    def tearDown(self):
+        load.reset()
+        drainer.reset()
+
+    def test_drain(self):
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/drainz")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("drain:", response.content.decode())
+
+        response = self.client.get("/livez")
+        self.assertEqual(response.status_code, 200)
+
+    def test_drain_forbidden(self):
+        # Only requests from the loopback interface may drain the process by default.
+        response = self.client.get("/drainz", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/drainz", REMOTE_ADDR="::1")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DJK8S_DRAIN_TOKEN="secret")
+    def test_drain_token(self):
+        for headers in ({}, {"X-Drain-Token": "wrong"}):
+            response = self.client.get("/drainz", headers=headers)
+            self.assertEqual(response.status_code, 403)
+        self.assertFalse(drainer.draining)
+
+        response = self.client.get("/drainz", headers={"X-Drain-Token": "secret"}, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(drainer.draining)
+
+    def test_drain_timeout(self):
+        load.inflight = 1
+        response = self.client.get("/drainz")
+        self.assertEqual(response.status_code, 503)
+
+    async def test_async_drain(self):
+        response = await self.async_client.get("/drainz")
+        self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+
+    def test_tracking(self):
+        # Requests that are not probes are counted while they are in flight.
+        self.client.get("/")
+        self.assertEqual(load.inflight, 0)
+        self.assertEqual(load.latency.count, 1)
@@ -0,0 +1,166 @@
+import io
+import os
+import json
+import tempfile
+
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.core.management import call_command, CommandError
+from djk8s.management.commands.ensureadmin import Command
+
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class TestEnsureAdmin(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def call(self, *args):
+        out = io.StringIO()
+        call_command("ensureadmin", *args, stdout=out)
+        return out.getvalue()
+
+    def test_create_admin(self):
+        out = self.call("-u", "admin", "-p", "correct horse battery", "-e", "admin@example.com")
+        self.assertIn("Admin user created", out)
+
+        user = User.objects.get(username="admin")
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.check_password("correct horse battery"))
+
+    def test_existing_admin_skips_validation(self):
+        User.objects.create_superuser("admin", "admin@example.com", "correct horse battery")
+        with mock.patch(
+            "djk8s.management.commands.ensureadmin.validate_password"
+        ) as validate:
+            out = self.call("-u", "admin", "-p", "x")
+
+        self.assertIn("already exists", out)
+        validate.assert_not_called()
+
+    def test_bulk_json(self):
+        User.objects.create_user("alice", "alice@example.com", "correct horse battery")
+        path = self.write("users.json", json.dumps([
+            {"username": "alice", "password": "x"},
+            {"username": "bob", "password": "correct horse battery", "email": "bob@EXAMPLE.com"},
+            {"username": "carol", "password": "correct horse battery", "is_superuser": True, "first_name": "Carol"},
+        ]))
+
+        with mock.patch(
+            "djk8s.management.commands.ensureadmin.validate_password"
+        ) as validate:
+            out = self.call("-f", path, "-w", "2")
+
+        self.assertIn("Created 2 users", out)
+        self.assertIn("1 already exist", out)
+        self.assertEqual(validate.call_count, 2)
+
+        bob = User.objects.get(username="bob")
+        self.assertEqual(bob.email, "bob@example.com")
+        self.assertFalse(bob.is_staff)
+        self.assertTrue(bob.check_password("correct horse battery"))
+
+        carol = User.objects.get(username="carol")
+        self.assertTrue(carol.is_superuser)
+        self.assertTrue(carol.is_staff)
+        self.assertEqual(carol.first_name, "Carol")
+
+        # Running again does not create or hash anything.
+        with mock.patch(
+            "djk8s.management.commands.ensureadmin.make_password"
+        ) as hasher:
+            out = self.call("-f", path)
+        self.assertIn("Created 0 users", out)
+        hasher.assert_not_called()
+
+    def test_bulk_yaml(self):
+        path = self.write("users.yaml", (
+            "users:\n"
+            "  - username: dave\n"
+            "    password: correct horse battery\n"
+            "    is_staff: true\n"
+        ))
+
+        self.call("-f", path)
+        self.assertTrue(User.objects.get(username="dave").is_staff)
+
+    def test_bulk_invalid(self):
+        cases = [
+            ("users.json", "{not json"),
+            ("users.json", json.dumps({"people": []})),
+            ("users.json", json.dumps([{"username": "erin"}])),
+            ("users.json", json.dumps([{"username": "erin", "password": "correct horse battery", "is_admin": True}])),
+            ("users.json", json.dumps([{"username": "erin", "password": "correct horse battery", "groups": [1]}])),
+            ("users.json", json.dumps([
+                {"username": "erin", "password": "correct horse battery"},
+                {"username": "erin", "password": "correct horse battery"},
+            ])),
+        ]
+
+        for name, content in cases:
+            with self.assertRaises(CommandError):
+                self.call("-f", self.write(name, content))
+
+        with self.assertRaises(CommandError):
+            self.call("-f", os.path.join(self.tmpdir.name, "missing.json"))
+
+        self.assertFalse(User.objects.filter(username="erin").exists())
+
+    def test_bulk_conflicts(self):
+        # Users skipped by the insert because of a conflict are not reported as created.
+        path = self.write("users.json", json.dumps([
+            {"username": "heidi", "password": "correct horse battery"},
+            {"username": "ivan", "password": "correct horse battery"},
+        ]))
+
+        def bulk_create(objs, **kwargs):
+            return create(objs[:1], **kwargs)
+
+        create = User.objects.bulk_create
+        with mock.patch.object(type(User.objects), "bulk_create", side_effect=bulk_create):
+            out = self.call("-f", path)
+
+        self.assertIn("Created 1 users", out)
+        self.assertIn("1 already exist", out)
+
+    def test_bulk_email_username(self):
+        # With an email-as-username model the email does not overwrite the username.
+        command = Command()
+        command.email_field = command.username_field
+        path = self.write("users.json", json.dumps([
+            {"username": "judy@example.com", "password": "correct horse battery"},
+            {"username": "kim@example.com", "password": "correct horse battery", "email": "kim@example.com"},
+        ]))
+
+        users = command.load_users(path)
+        self.assertEqual([user["username"] for user in users], ["judy@example.com", "kim@example.com"])
+
+        path = self.write("users.json", json.dumps([
+            {"username": "judy@example.com", "password": "correct horse battery", "email": "j@example.com"},
+        ]))
+        with self.assertRaisesRegex(CommandError, "email that differs from its username"):
+            command.load_users(path)
+
+    @override_settings(AUTH_PASSWORD_VALIDATORS=[
+        {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
+    ])
+    def test_bulk_password_validation(self):
+        path = self.write("users.json", json.dumps([
+            {"username": "frank", "password": "correct horse battery"},
+            {"username": "grace", "password": "short"},
+        ]))
+
+        with self.assertRaisesRegex(CommandError, "grace"):
+            self.call("-f", path)
+        self.assertFalse(User.objects.filter(username="frank").exists())
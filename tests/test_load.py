@@ -0,0 +1,108 @@
+import time
+
+from django.test import TestCase, override_settings
+
+from djk8s.load import load, queue_delay, RollingWindow, MIN_SAMPLES
+from djk8s.probes import LoadProbe, NotReady
+
+
+class TestRollingWindow(TestCase):
+
+    def test_percentile(self):
+        window = RollingWindow(100)
+        for i in range(1, 101):
+            window.add(i / 100, now=float(i))
+
+        self.assertEqual(window.percentile(50, since=0.0), 0.5)
+        self.assertEqual(window.percentile(99, since=0.0), 0.99)
+        self.assertEqual(window.percentile(100, since=0.0), 1.0)
+        self.assertEqual(window.percentile(0, since=0.0), 0.01)
+
+        # Only samples recorded since the given time are included.
+        self.assertEqual(window.percentile(0, since=91.0), 0.91)
+        self.assertIsNone(window.percentile(50, since=100.0))
+
+    def test_overwrite(self):
+        window = RollingWindow(MIN_SAMPLES)
+        for i in range(MIN_SAMPLES * 2):
+            window.add(float(i), now=float(i))
+        self.assertEqual(window.count, MIN_SAMPLES)
+        self.assertEqual(window.percentile(0, since=0.0), MIN_SAMPLES)
+
+
+class TestQueueDelay(TestCase):
+
+    def test_queue_delay(self):
+        now = 1700000000.5
+        self.assertAlmostEqual(queue_delay("t=1700000000.25", now), 0.25)
+        self.assertAlmostEqual(queue_delay("1700000000250", now), 0.25)
+        self.assertAlmostEqual(queue_delay("t=1700000000250000", now), 0.25)
+        self.assertEqual(queue_delay("1700000001.0", now), 0.0)
+        self.assertIsNone(queue_delay("", now))
+        self.assertIsNone(queue_delay(None, now))
+        self.assertIsNone(queue_delay("t=soon", now))
+
+
+@override_settings(
+    ROOT_URLCONF="tests.nourls",
+    DJK8S_READINESS_PROBES=["djk8s.probes.LoadProbe"],
+)
+class TestLoadProbe(TestCase):
+
+    def setUp(self):
+        load.reset()
+
+    def tearDown(self):
+        load.reset()
+
+    @override_settings(DJK8S_LOAD_PROBE_MAX_INFLIGHT=2)
+    def test_inflight(self):
+        LoadProbe().ready(None)
+        load.inflight = 3
+        with self.assertRaisesRegex(NotReady, "load: 3 requests in flight exceeds the maximum of 2"):
+            LoadProbe().ready(None)
+
+    @override_settings(DJK8S_LOAD_PROBE_MAX_LATENCY=0.5)
+    def test_latency(self):
+        now = time.monotonic()
+        for _ in range(MIN_SAMPLES):
+            load.latency.add(0.1, now)
+        LoadProbe().ready(None)
+
+        load.latency.add(1.0, now)
+        with self.assertRaisesRegex(NotReady, "p99 request latency of 1000ms exceeds the 500ms maximum"):
+            LoadProbe().ready(None)
+
+    @override_settings(DJK8S_LOAD_PROBE_MAX_LATENCY=0.5, DJK8S_LOAD_PROBE_WINDOW=5)
+    def test_window(self):
+        for _ in range(MIN_SAMPLES):
+            load.latency.add(1.0, time.monotonic() - 10)
+        LoadProbe().ready(None)
+
+    @override_settings(DJK8S_LOAD_PROBE_MAX_QUEUE_DELAY=0.5)
+    def test_queue_delay(self):
+        start = f"t={time.time() - 2:.3f}"
+        for _ in range(MIN_SAMPLES):
+            response = self.client.get("/", headers={"X-Request-Start": start})
+            self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(load.inflight, 0)
+        self.assertEqual(load.latency.count, MIN_SAMPLES)
+
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("load: p99 request queue delay", response.content.decode())
+
+    async def test_async_tracking(self):
+        for _ in range(MIN_SAMPLES):
+            await self.async_client.get("/")
+        self.assertEqual(load.inflight, 0)
+        self.assertEqual(load.latency.count, MIN_SAMPLES)
+
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.CountingProbe"])
+    def test_not_tracked(self):
+        self.client.get("/")
+        self.assertEqual(load.latency.count, 0)
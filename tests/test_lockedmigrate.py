@@ -0,0 +1,165 @@
+import io
+import os
+import tempfile
+import threading
+
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.core.management import call_command, CommandError
+from django.core.management.base import OutputWrapper
+
+from djk8s.plan import build_cache
+from djk8s.management.commands.lockedmigrate import Command, PrefixedStream, alias_lock_id
+
+
+class FakeCursor(object):
+    """
+    Returns the queued results of pg_try_advisory_lock and records all queries.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+
+    def fetchone(self):
+        return (self.results.pop(0),)
+
+
+class TestLockedMigrate(TestCase):
+
+    def setUp(self):
+        # Emulate the postgres advisory lock functions on the sqlite test database.
+        self.locks = []
+        connection.ensure_connection()
+        connection.connection.create_function("pg_try_advisory_lock", 1, self.lock)
+        connection.connection.create_function("pg_advisory_unlock", 1, self.locks.remove)
+
+    def lock(self, lock_id):
+        self.locks.append(lock_id)
+        return True
+
+    def test_nothing_to_migrate(self):
+        out = io.StringIO()
+        with mock.patch.object(Command, "acquire_lock") as acquire_lock:
+            call_command("lockedmigrate", stdout=out)
+        acquire_lock.assert_not_called()
+        self.assertIn("No migrations to apply.", out.getvalue())
+
+    def test_migration_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "migrations.json")
+            build_cache(path)
+
+            out = io.StringIO()
+            with override_settings(DJK8S_MIGRATION_CACHE=path):
+                with mock.patch(
+                    "djk8s.management.commands.lockedmigrate.MigrationExecutor"
+                ) as executor:
+                    call_command("lockedmigrate", stdout=out)
+
+        executor.assert_not_called()
+        self.assertIn("No migrations to apply.", out.getvalue())
+
+    def test_applied_by_another_process(self):
+        out = io.StringIO()
+        with mock.patch.object(Command, "migration_plan", side_effect=[["0001"], []]):
+            with mock.patch("django.core.management.commands.migrate.Command.handle") as handle:
+                call_command("lockedmigrate", "--lock-id", "42", stdout=out)
+
+        handle.assert_not_called()
+        self.assertEqual(self.locks, [])
+        self.assertIn("applied by another process", out.getvalue())
+
+    def test_migrate(self):
+        with mock.patch.object(Command, "migration_plan", return_value=["0001"]):
+            with mock.patch("django.core.management.commands.migrate.Command.handle") as handle:
+                call_command("lockedmigrate", stdout=io.StringIO())
+        handle.assert_called_once()
+        self.assertEqual(self.locks, [])
+
+    def test_single_database_lock_id(self):
+        # Without --all-databases the lock ID is used as given for any database.
+        options = {
+            "database": "reports",
+            "lock_id": 42,
+            "lock_timeout": None,
+            "verbosity": 0,
+            "skip_checks": True,
+        }
+        acquire_lock = mock.patch.object(
+            Command, "acquire_lock", autospec=True, side_effect=Command.acquire_lock
+        )
+        with mock.patch("djk8s.management.commands.lockedmigrate.connections", {"reports": connection}):
+            with mock.patch.object(Command, "migration_plan", return_value=["0001"]):
+                with acquire_lock as acquired, mock.patch("django.core.management.commands.migrate.Command.handle"):
+                    Command(stdout=io.StringIO()).migrate(**options)
+        self.assertEqual(acquired.call_args.args[2], 42)
+
+    def test_acquire_lock(self):
+        out = io.StringIO()
+        cursor = FakeCursor(False, False, True)
+        with mock.patch("time.sleep") as sleep:
+            Command(stdout=out).acquire_lock(cursor, 1000)
+
+        self.assertEqual(len(cursor.queries), 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(out.getvalue().count("Waiting for migration lock 1000"), 1)
+
+    def test_acquire_lock_timeout(self):
+        cursor = FakeCursor(*([False] * 100))
+        with self.assertRaisesRegex(CommandError, "Could not acquire migration lock 1000 after 0.05s"):
+            Command(stdout=io.StringIO()).acquire_lock(cursor, 1000, timeout=0.05, verbosity=0)
+
+
+class TestAllDatabases(TestCase):
+    """
+    Test migrating multiple databases concurrently with --all-databases.
+    """
+
+    def test_alias_lock_id(self):
+        self.assertEqual(alias_lock_id(1000, "default"), 1000)
+        self.assertEqual(alias_lock_id(1000, "shard1") >> 32, 1000)
+        self.assertNotEqual(alias_lock_id(1000, "shard1"), alias_lock_id(1000, "shard2"))
+        self.assertLess(alias_lock_id(2**40, "shard1"), 2**63)
+
+    def test_prefixed_stream(self):
+        out = io.StringIO()
+        stream = PrefixedStream(OutputWrapper(out), "shard1", threading.Lock())
+        stream.write("  Applying 0001...")
+        stream.write(" OK\nDone")
+        self.assertEqual(out.getvalue(), "[shard1]   Applying 0001... OK\n")
+        stream.flush()
+        self.assertEqual(out.getvalue(), "[shard1]   Applying 0001... OK\n[shard1] Done\n")
+
+    def test_migrate_all(self):
+        aliases = {alias: mock.Mock() for alias in ("default", "shard1", "shard2")}
+        migrated = []
+        lock_ids = {}
+
+        def migrate(command, *args, **options):
+            migrated.append((options["database"], threading.current_thread().name))
+            lock_ids[options["database"]] = options["lock_id"]
+            command.stdout.write("migrated")
+            if options["database"] == "shard2":
+                raise CommandError("shard2 is broken")
+
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch("djk8s.management.commands.lockedmigrate.connections", aliases):
+            with mock.patch.object(Command, "migrate", autospec=True, side_effect=migrate):
+                with self.assertRaisesRegex(CommandError, "Migrations failed for databases: shard2"):
+                    call_command(
+                        "lockedmigrate", "--all-databases", "-j", "2", "--skip-checks",
+                        stdout=out, stderr=err,
+                    )
+
+        self.assertEqual(sorted(alias for alias, _ in migrated), list(aliases))
+        self.assertTrue(all(name.startswith("djk8s-migrate") for _, name in migrated))
+        self.assertEqual(lock_ids, {alias: alias_lock_id(1000, alias) for alias in aliases})
+        for alias, conn in aliases.items():
+            self.assertIn(f"[{alias}] migrated", out.getvalue())
+            conn.close.assert_called_once()
+        self.assertIn("[shard2] migration failed: shard2 is broken", err.getvalue())
@@ -0,0 +1,81 @@
+from django.test import TestCase, override_settings
+
+from djk8s.metrics import Histogram, Metrics, metrics
+
+
+class TestHistogram(TestCase):
+    """
+    Test the fixed bucket histogram.
+    """
+
+    def test_observe(self):
+        hist = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0, 3.0):
+            hist.observe(value)
+
+        self.assertEqual(list(hist.counts), [2, 1, 2])
+        self.assertEqual(hist.count, 5)
+        self.assertAlmostEqual(hist.sum, 5.65)
+
+
+class TestMetrics(TestCase):
+    """
+    Test the Prometheus text rendering of the probe metrics.
+    """
+
+    def test_render_empty(self):
+        self.assertEqual(Metrics().render(), "")
+
+    def test_render(self):
+        m = Metrics(buckets=(0.1, 1.0))
+        m.set_ready(False)
+        m.observe("DatabaseProbe", 0.05, ok=True)
+        m.observe("DatabaseProbe", 0.5, ok=False)
+        m.timeout('Bad"Probe')
+
+        text = m.render()
+        self.assertIn("djk8s_ready 0\n", text)
+        self.assertIn('djk8s_probe_duration_seconds_bucket{probe="DatabaseProbe",le="0.1"} 1\n', text)
+        self.assertIn('djk8s_probe_duration_seconds_bucket{probe="DatabaseProbe",le="1"} 2\n', text)
+        self.assertIn('djk8s_probe_duration_seconds_bucket{probe="DatabaseProbe",le="+Inf"} 2\n', text)
+        self.assertIn('djk8s_probe_duration_seconds_count{probe="DatabaseProbe"} 2\n', text)
+        self.assertIn('djk8s_probe_success_total{probe="DatabaseProbe"} 1\n', text)
+        self.assertIn('djk8s_probe_failure_total{probe="DatabaseProbe"} 1\n', text)
+        self.assertIn('djk8s_probe_timeout_total{probe="Bad\\"Probe"} 1\n', text)
+        self.assertIn('djk8s_probe_last_failure_timestamp_seconds{probe="DatabaseProbe"}', text)
+
+
+@override_settings(
+    ROOT_URLCONF="tests.nourls",
+    DJK8S_METRICS_PATHS=["/metricz"],
+)
+class TestMetricsMiddleware(TestCase):
+    """
+    Test the ProbeMiddleware serves metrics recorded by readiness checks.
+    """
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_metrics_response(self):
+        self.client.get("/readyz")
+        response = self.client.get("/metricz")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+        text = response.content.decode()
+        self.assertIn("djk8s_ready 1\n", text)
+        self.assertIn('djk8s_probe_success_total{probe="DatabaseProbe"} 1\n', text)
+        self.assertIn('djk8s_probe_success_total{probe="MemcachedProbe"} 1\n', text)
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"])
+    def test_not_ready_metrics(self):
+        self.client.get("/readyz")
+        text = self.client.get("/metricz").content.decode()
+        self.assertIn("djk8s_ready 0\n", text)
+        self.assertIn('djk8s_probe_failure_total{probe="NeverReady"} 1\n', text)
+
+    @override_settings(DJK8S_METRICS_PATHS=[])
+    def test_metrics_disabled(self):
+        response = self.client.get("/metricz")
+        self.assertEqual(response.status_code, 404)
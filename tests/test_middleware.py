@@ -49,3 +49,33 @@ class TestProbeMiddleware(TestCase):
         response = self.client.get("/livez")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content.decode(), "Ok")
+
+    async def test_async_ready_response(self):
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), "Ok")
+
+    async def test_async_live_response(self):
+        response = await self.async_client.get("/livez")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), "Ok")
+
+    @override_settings(
+        DJK8S_READINESS_PROBES=[
+            "djk8s.probes.DatabaseProbe",
+            "tests.probes.NeverReady"
+        ]
+    )
+    async def test_async_not_ready(self):
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("test is not ready", response.content.decode())
+
+    @override_settings(
+        DJK8S_PROBE_TIMEOUT=0.05,
+        DJK8S_READINESS_PROBES=["tests.probes.SlowProbe"],
+    )
+    async def test_async_timeout(self):
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("timed out", response.content.decode())
@@ -0,0 +1,93 @@
+import io
+import os
+import json
+import tempfile
+
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.core.management import call_command, CommandError
+
+from djk8s import plan
+
+
+class TestMigrationCache(TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "migrations.json")
+
+    def test_source_hash(self):
+        digest = plan.source_hash()
+        self.assertEqual(plan.source_hash(), digest)
+
+        # Disabling the migrations of an app changes the hash.
+        with self.settings(MIGRATION_MODULES={"sites": None}):
+            self.assertNotEqual(plan.source_hash(), digest)
+
+    def test_build_and_load(self):
+        cache = plan.build_cache(self.path)
+        self.assertIn("0001_initial", cache["migrations"]["auth"])
+        expected, replacements = plan.load_cache(self.path)
+        self.assertIn(("auth", "0001_initial"), expected)
+        self.assertEqual(replacements, {})
+
+    def test_stale(self):
+        plan.build_cache(self.path)
+        with mock.patch.object(plan, "source_hash", return_value="changed"):
+            self.assertIsNone(plan.load_cache(self.path))
+
+        with open(self.path, "w") as f:
+            json.dump({"version": 0}, f)
+        self.assertIsNone(plan.load_cache(self.path))
+
+        # A cache written before the replacements were recorded must be rebuilt.
+        for version in (1, plan.CACHE_VERSION):
+            with open(self.path, "w") as f:
+                json.dump({"version": version, "source": plan.source_hash(), "migrations": {}}, f)
+            self.assertIsNone(plan.load_cache(self.path))
+
+        self.assertIsNone(plan.load_cache(os.path.join(os.path.dirname(self.path), "missing.json")))
+        self.assertIsNone(plan.load_cache(None))
+
+    def test_migrated(self):
+        self.assertFalse(plan.migrated(connection, self.path))
+
+        plan.build_cache(self.path)
+        with self.assertNumQueries(1):
+            self.assertTrue(plan.migrated(connection, self.path))
+
+        with mock.patch.object(plan, "applied_migrations", return_value={("auth", "0001_initial")}):
+            self.assertFalse(plan.migrated(connection, self.path))
+
+    def test_unapplied_migrations(self):
+        expected = {("app", "0001_initial"), ("app", "0002_squashed_0004")}
+        replacements = {("app", "0002_squashed_0004"): [("app", "0002"), ("app", "0003"), ("app", "0004")]}
+
+        applied = {("app", "0001_initial"), ("app", "0002_squashed_0004")}
+        self.assertEqual(plan.unapplied_migrations(expected, replacements, applied), [])
+
+        # The squashed migration has not been recorded but all replaced migrations have.
+        applied = {("app", "0001_initial"), ("app", "0002"), ("app", "0003"), ("app", "0004")}
+        self.assertEqual(plan.unapplied_migrations(expected, replacements, applied), [])
+
+        applied = {("app", "0001_initial"), ("app", "0002"), ("app", "0003")}
+        self.assertEqual(
+            plan.unapplied_migrations(expected, replacements, applied), [("app", "0002_squashed_0004")]
+        )
+
+    def test_command(self):
+        out = io.StringIO()
+        with self.assertRaisesRegex(CommandError, "is missing or out of date"):
+            call_command("migrationcache", "--check", "-o", self.path)
+
+        call_command("migrationcache", "-o", self.path, stdout=out)
+        self.assertIn("Wrote migration cache for", out.getvalue())
+
+        with override_settings(DJK8S_MIGRATION_CACHE=self.path):
+            call_command("migrationcache", "--check", stdout=out)
+        self.assertIn("is up to date", out.getvalue())
+
+        with self.assertRaisesRegex(CommandError, "Specify the cache path"):
+            call_command("migrationcache")
@@ -0,0 +1,88 @@
+import time
+
+from django.test import TestCase, override_settings
+
+from djk8s.probes import NotReady
+from djk8s.runner import run_probes
+from tests.probes import CountingProbe, NeverReady, SlowProbe
+
+
+class TestRunProbes(TestCase):
+    """
+    Test that run_probes runs probes sequentially or concurrently with deadlines.
+    """
+
+    def setUp(self):
+        CountingProbe.calls = 0
+        SlowProbe.delay = 0.5
+
+    def test_sequential(self):
+        run_probes([CountingProbe(), CountingProbe()])
+        self.assertEqual(CountingProbe.calls, 2)
+
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            run_probes([CountingProbe(), NeverReady()])
+
+    @override_settings(DJK8S_PROBE_WORKERS=4)
+    def test_concurrent(self):
+        run_probes([CountingProbe(), CountingProbe(), CountingProbe()])
+        self.assertEqual(CountingProbe.calls, 3)
+
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            run_probes([CountingProbe(), NeverReady()])
+
+    @override_settings(DJK8S_PROBE_WORKERS=4)
+    def test_concurrent_fails_fast(self):
+        start = time.monotonic()
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            run_probes([SlowProbe(), NeverReady()])
+        self.assertLess(time.monotonic() - start, SlowProbe.delay)
+
+    @override_settings(DJK8S_PROBE_WORKERS=4, DJK8S_PROBE_TIMEOUT=0.05)
+    def test_probe_timeout(self):
+        start = time.monotonic()
+        with self.assertRaisesRegex(NotReady, "SlowProbe: probe timed out after 0.05s"):
+            run_probes([CountingProbe(), SlowProbe()])
+        self.assertLess(time.monotonic() - start, SlowProbe.delay)
+
+    @override_settings(DJK8S_PROBE_WORKERS=1, DJK8S_PROBE_TIMEOUT=0.15)
+    def test_probe_timeout_excludes_queue(self):
+        # The second probe waits for the only worker but has its own full timeout.
+        SlowProbe.delay = 0.1
+        run_probes([SlowProbe(), SlowProbe()])
+
+    @override_settings(DJK8S_PROBE_WORKERS=3, DJK8S_PROBE_TIMEOUT=0.1)
+    def test_probe_timeout_full_pool(self):
+        # Hung probes keep their threads after they time out; once they fill the pool
+        # later checks still fail within the timeout instead of waiting for a thread.
+        with self.assertLogs("djk8s.probe", "WARNING"):
+            with self.assertRaisesRegex(NotReady, "timed out"):
+                run_probes([SlowProbe(), SlowProbe(), SlowProbe()])
+
+            start = time.monotonic()
+            with self.assertRaisesRegex(NotReady, "SlowProbe: probe was not started within 0.1s"):
+                run_probes([SlowProbe()])
+        self.assertLess(time.monotonic() - start, 0.3)
+
+    @override_settings(DJK8S_PROBE_WORKERS=4, DJK8S_PROBE_DEADLINE=0.05)
+    def test_deadline(self):
+        with self.assertRaisesRegex(NotReady, "readiness deadline of 0.05s exceeded"):
+            run_probes([SlowProbe()])
+
+    @override_settings(DJK8S_PROBE_WORKERS=4, DJK8S_PROBE_TIMEOUT=0.05)
+    def test_probe_timeout_override(self):
+        probe = SlowProbe()
+        probe.timeout = 2
+        SlowProbe.delay = 0.1
+        run_probes([probe])
+
+    @override_settings(
+        ROOT_URLCONF="tests.nourls",
+        DJK8S_PROBE_WORKERS=2,
+        DJK8S_PROBE_TIMEOUT=0.05,
+        DJK8S_READINESS_PROBES=["tests.probes.SlowProbe"],
+    )
+    def test_middleware_timeout(self):
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("timed out", response.content.decode())
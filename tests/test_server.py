@@ -0,0 +1,97 @@
+import os
+import sys
+import socket
+import tempfile
+import subprocess
+
+from django.test import TestCase, override_settings
+
+from djk8s import server
+from djk8s.client import main, request
+from tests.probes import CountingProbe
+
+
+@override_settings(DJK8S_WARMUP_HOOKS=[])
+class TestProbeServer(TestCase):
+    """
+    Test the probe server and the client that queries it over a UNIX domain socket.
+    """
+
+    def setUp(self):
+        CountingProbe.calls = 0
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "djk8s.sock")
+        self.server = server.start(self.path)
+        self.assertIsNotNone(self.server)
+
+    def tearDown(self):
+        server.stop()
+        self.tmpdir.cleanup()
+
+    def test_live(self):
+        for command in ("live", "health"):
+            self.assertEqual(request(self.path, command), (200, "Ok"))
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.CountingProbe"])
+    def test_ready(self):
+        self.assertEqual(request(self.path, "ready"), (200, "Ok"))
+        self.assertEqual(request(self.path, "ready"), (200, "Ok"))
+        self.assertEqual(CountingProbe.calls, 2)
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"])
+    def test_not_ready(self):
+        self.assertEqual(request(self.path, "ready"), (503, "test is not ready"))
+
+    def test_startup(self):
+        self.assertEqual(request(self.path, "startup"), (200, "Ok"))
+
+    def test_unknown_command(self):
+        status, _ = request(self.path, "restart")
+        self.assertEqual(status, 400)
+
+    def test_already_running(self):
+        self.assertIs(server.start(self.path), self.server)
+
+        server.stop()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(self.path)
+            sock.listen()
+            self.assertIsNone(server.start(self.path))
+
+    def test_stale_socket(self):
+        server.stop()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(self.path)
+
+        self.assertIsNotNone(server.start(self.path))
+        self.assertEqual(request(self.path, "live"), (200, "Ok"))
+
+    def test_client_main(self):
+        self.assertEqual(main(["--live", "--quiet", "--socket", self.path]), 0)
+
+        with override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"]):
+            self.assertEqual(main(["--ready", "-q", "-s", self.path]), 1)
+
+        server.stop()
+        self.assertEqual(main(["--live", "-q", "-s", self.path]), 1)
+
+    def test_should_start(self):
+        self.assertTrue(server.should_start(["/usr/bin/gunicorn", "myapp.wsgi"]))
+        self.assertTrue(server.should_start(["/usr/lib/python3/site-packages/uvicorn/__main__.py"]))
+        self.assertTrue(server.should_start(["/usr/bin/celery", "-A", "myapp", "worker"]))
+        self.assertTrue(server.should_start(["manage.py", "runserver"]))
+        self.assertFalse(server.should_start(["/usr/bin/celery", "-A", "myapp", "beat"]))
+        self.assertFalse(server.should_start(["manage.py", "migrate"]))
+        self.assertFalse(server.should_start(["manage.py"]))
+        self.assertFalse(server.should_start(["/usr/bin/pytest"]))
+        self.assertFalse(server.should_start(["-c"]))
+        self.assertFalse(server.should_start([]))
+
+        with override_settings(DJK8S_PROBE_SERVER_PROGRAMS=["granian"]):
+            self.assertTrue(server.should_start(["/usr/bin/granian", "myapp.asgi:application"]))
+            self.assertFalse(server.should_start(["/usr/bin/gunicorn", "myapp.wsgi"]))
+
+    def test_client_does_not_import_django(self):
+        code = "import sys, djk8s.client; print('django' in sys.modules)"
+        out = subprocess.check_output([sys.executable, "-c", code], text=True)
+        self.assertEqual(out.strip(), "False")
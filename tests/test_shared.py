@@ -0,0 +1,205 @@
+import os
+import time
+import tempfile
+
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from djk8s.probes import NotReady
+from djk8s.cache import readiness_cache
+from django.core.exceptions import ImproperlyConfigured
+from djk8s.shared import SharedReadinessCache, StatusFile, GENERATION, GENERATION_OFFSET, MAX_CONTENT
+from tests.probes import CountingProbe, NeverReady, ToggleProbe
+
+
+class LocalProbe(ToggleProbe):
+
+    process_local = True
+
+
+class LocalCountingProbe(CountingProbe):
+
+    process_local = True
+
+
+class SharedTestCase(TestCase):
+
+    def setUp(self):
+        CountingProbe.calls = 0
+        ToggleProbe.is_ready = True
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "status")
+
+
+class TestStatusFile(SharedTestCase):
+
+    def test_read_write(self):
+        status = StatusFile(self.path)
+        self.addCleanup(status.close)
+        self.assertIsNone(status.read())
+
+        status.write(1000.0)
+        self.assertEqual(status.read(), (1000.0, None))
+
+        status.write(1001.0, NotReady("db: down", status=500))
+        updated, error = status.read()
+        self.assertEqual(updated, 1001.0)
+        self.assertEqual(error.content, "db: down")
+        self.assertEqual(error.status, 500)
+
+        # Results are visible to other processes mapping the same file.
+        other = StatusFile(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(other.read()[0], 1001.0)
+
+        status.write(1002.0, NotReady("x" * (MAX_CONTENT * 2)))
+        self.assertEqual(len(other.read()[1].content), MAX_CONTENT)
+        self.assertEqual(os.path.getsize(self.path), 512)
+
+    def test_torn_write(self):
+        status = StatusFile(self.path)
+        self.addCleanup(status.close)
+        status.write(1000.0)
+
+        # A writer that died while writing leaves an odd generation behind.
+        generation = GENERATION.unpack_from(status.map, GENERATION_OFFSET)[0]
+        GENERATION.pack_into(status.map, GENERATION_OFFSET, generation + 1)
+        self.assertIsNone(status.read())
+
+        status.write(1001.0)
+        self.assertEqual(status.read(), (1001.0, None))
+        self.assertEqual(GENERATION.unpack_from(status.map, GENERATION_OFFSET)[0] % 2, 0)
+
+    def test_acquire(self):
+        status = StatusFile(self.path)
+        other = StatusFile(self.path)
+        self.addCleanup(other.close)
+
+        self.assertTrue(status.acquire())
+        self.assertTrue(status.acquire())
+        self.assertFalse(other.acquire())
+
+        status.close()
+        self.assertTrue(other.acquire())
+
+
+class TestSharedReadinessCache(SharedTestCase):
+
+    def cache(self, probes, **kwargs):
+        cache = SharedReadinessCache(probes, path=self.path, **{"ttl": 60, **kwargs})
+        self.addCleanup(cache.stop)
+        return cache
+
+    def test_shared_results(self):
+        writer = self.cache([CountingProbe()])
+        reader = self.cache([CountingProbe()])
+
+        writer.check()
+        for _ in range(10):
+            reader.check()
+
+        self.assertEqual(CountingProbe.calls, 1)
+        self.assertTrue(writer.status.locked)
+        self.assertFalse(reader.status.locked)
+
+    def test_shared_not_ready(self):
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            self.cache([NeverReady()]).check()
+
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            self.cache([CountingProbe()]).check()
+        self.assertEqual(CountingProbe.calls, 0)
+
+    def test_process_local_probes(self):
+        # The writer's own load is not published; every worker checks its own.
+        ToggleProbe.is_ready = False
+        writer = self.cache([CountingProbe(), LocalProbe()])
+        with self.assertRaisesRegex(NotReady, "toggle is not ready"):
+            writer.check()
+        self.assertIsNone(writer.status.read()[1])
+
+        ToggleProbe.is_ready = True
+        calls = ToggleProbe.calls
+        self.cache([CountingProbe(), LocalProbe()]).check()
+        self.assertEqual(ToggleProbe.calls, calls + 1)
+        self.assertEqual(CountingProbe.calls, 1)
+
+    @override_settings(DJK8S_READINESS_FAILURE_THRESHOLD=3)
+    def test_process_local_probes_threshold(self):
+        # Passing local checks do not reset the failures of the shared probes.
+        writer = self.cache([ToggleProbe(), LocalCountingProbe()])
+        writer.check()
+
+        ToggleProbe.is_ready = False
+        for _ in range(2):
+            writer.refresh()
+            writer.check()
+
+        writer.refresh()
+        with self.assertRaisesRegex(NotReady, "toggle is not ready"):
+            writer.check()
+        self.assertEqual(CountingProbe.calls, 3)
+
+    def test_no_results(self):
+        writer = self.cache([CountingProbe()])
+        writer.status.acquire()
+
+        # Until the writer has written a result the probes are checked directly.
+        reader = self.cache([NeverReady()])
+        with self.assertRaisesRegex(NotReady, "test is not ready"):
+            reader.check()
+
+    def test_stale_writer(self):
+        writer = self.cache([CountingProbe()], max_age=60)
+        reader = self.cache([CountingProbe()], max_age=60)
+        writer.check()
+
+        with mock.patch("djk8s.shared.time.time", return_value=time.time() + 61):
+            with self.assertRaisesRegex(NotReady, "stale"):
+                reader.check()
+
+            # Once the writer exits the reader takes over writing the results.
+            writer.stop()
+            reader.check()
+            self.assertTrue(reader.status.locked)
+        self.assertEqual(CountingProbe.calls, 2)
+
+    def test_background_refresh(self):
+        self.cache([ToggleProbe()], ttl=0.01).check()
+        reader = self.cache([CountingProbe()], ttl=0.01)
+
+        ToggleProbe.is_ready = False
+        deadline = time.monotonic() + 2
+        while reader.status.read()[1] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        with self.assertRaisesRegex(NotReady, "toggle is not ready"):
+            reader.check()
+
+    async def test_async_check(self):
+        writer = self.cache([CountingProbe()])
+        await writer.acheck()
+        await self.cache([NeverReady()]).acheck()
+        self.assertEqual(CountingProbe.calls, 1)
+
+    def test_readiness_cache(self):
+        with override_settings(DJK8S_SHARED_STATUS_FILE=self.path):
+            with self.assertRaises(ImproperlyConfigured):
+                readiness_cache()
+
+            with override_settings(DJK8S_READINESS_CACHE_TTL=5):
+                cache = readiness_cache()
+                self.assertIsInstance(cache, SharedReadinessCache)
+                self.assertEqual(cache.path, self.path)
+
+    @override_settings(ROOT_URLCONF="tests.nourls", DJK8S_READINESS_CACHE_TTL=60)
+    def test_middleware(self):
+        with override_settings(DJK8S_SHARED_STATUS_FILE=self.path):
+            response = self.client.get("/readyz")
+            self.assertEqual(response.status_code, 200)
+
+        status = StatusFile(self.path)
+        self.addCleanup(status.close)
+        self.assertIsNone(status.read()[1])
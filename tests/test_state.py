@@ -0,0 +1,160 @@
+import time
+
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from djk8s.probes import NotReady
+from djk8s.runner import run_probes, arun_probes
+from djk8s.state import state, CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from djk8s.signals import readiness_changed, breaker_changed
+from tests.probes import AsyncSlowProbe, SlowProbe, ToggleProbe
+
+
+class TestReadinessState(TestCase):
+    """
+    Test the readiness success and failure thresholds.
+    """
+
+    def setUp(self):
+        state.reset()
+        ToggleProbe.is_ready = True
+        self.transitions = []
+        readiness_changed.connect(self.record)
+
+    def tearDown(self):
+        readiness_changed.disconnect(self.record)
+        ToggleProbe.is_ready = True
+        state.reset()
+
+    def record(self, sender, ready, error, **kwargs):
+        self.transitions.append(ready)
+
+    def test_default_thresholds(self):
+        run_probes([ToggleProbe()])
+        ToggleProbe.is_ready = False
+        with self.assertRaises(NotReady):
+            run_probes([ToggleProbe()])
+        ToggleProbe.is_ready = True
+        run_probes([ToggleProbe()])
+        self.assertEqual(self.transitions, [True, False, True])
+
+    @override_settings(DJK8S_READINESS_FAILURE_THRESHOLD=3, DJK8S_READINESS_SUCCESS_THRESHOLD=2)
+    def test_thresholds(self):
+        run_probes([ToggleProbe()])
+
+        ToggleProbe.is_ready = False
+        run_probes([ToggleProbe()])
+        run_probes([ToggleProbe()])
+        with self.assertRaisesRegex(NotReady, "toggle is not ready"):
+            run_probes([ToggleProbe()])
+
+        ToggleProbe.is_ready = True
+        with self.assertRaisesRegex(NotReady, "readiness: 1 of 2 successful checks required"):
+            run_probes([ToggleProbe()])
+        run_probes([ToggleProbe()])
+
+        self.assertEqual(self.transitions, [True, False, True])
+
+    @override_settings(DJK8S_READINESS_FAILURE_THRESHOLD=3)
+    def test_failures_must_be_consecutive(self):
+        run_probes([ToggleProbe()])
+        for _ in range(3):
+            ToggleProbe.is_ready = False
+            run_probes([ToggleProbe()])
+            run_probes([ToggleProbe()])
+            ToggleProbe.is_ready = True
+            run_probes([ToggleProbe()])
+        self.assertEqual(self.transitions, [True])
+
+
+class TestCircuitBreaker(TestCase):
+    """
+    Test that the circuit breaker stops running probes that keep failing.
+    """
+
+    def setUp(self):
+        state.reset()
+        ToggleProbe.calls = 0
+        ToggleProbe.is_ready = True
+        self.transitions = []
+        breaker_changed.connect(self.record)
+
+    def tearDown(self):
+        breaker_changed.disconnect(self.record)
+        ToggleProbe.is_ready = True
+        state.reset()
+
+    def record(self, sender, probe, state, **kwargs):
+        self.transitions.append(state)
+
+    def test_disabled(self):
+        self.assertIsNone(state.breaker("ToggleProbe"))
+
+    @override_settings(DJK8S_PROBE_BREAKER_THRESHOLD=2, DJK8S_PROBE_BREAKER_BACKOFF=0.05)
+    def test_open_and_close(self):
+        ToggleProbe.is_ready = False
+        for _ in range(4):
+            with self.assertRaises(NotReady):
+                run_probes([ToggleProbe()])
+        self.assertEqual(ToggleProbe.calls, 2)
+
+        with self.assertRaisesRegex(NotReady, "ToggleProbe: circuit breaker is open"):
+            run_probes([ToggleProbe()])
+
+        time.sleep(0.06)
+        ToggleProbe.is_ready = True
+        run_probes([ToggleProbe()])
+        run_probes([ToggleProbe()])
+        self.assertEqual(ToggleProbe.calls, 4)
+        self.assertEqual(self.transitions, [OPEN, HALF_OPEN, CLOSED])
+
+    @override_settings(DJK8S_PROBE_WORKERS=2, DJK8S_PROBE_TIMEOUT=0.05, DJK8S_PROBE_BREAKER_THRESHOLD=2)
+    def test_open_on_timeouts(self):
+        SlowProbe.delay = 0.1
+        with self.assertLogs("djk8s.probe", "WARNING"):
+            for _ in range(2):
+                with self.assertRaisesRegex(NotReady, "SlowProbe: probe timed out"):
+                    run_probes([SlowProbe()])
+
+        # The probes that timed out finishing later does not close the breaker.
+        time.sleep(0.15)
+        with self.assertRaisesRegex(NotReady, "SlowProbe: circuit breaker is open"):
+            run_probes([SlowProbe()])
+        self.assertEqual(self.transitions, [OPEN])
+
+    @override_settings(DJK8S_PROBE_TIMEOUT=0.05, DJK8S_PROBE_BREAKER_THRESHOLD=2)
+    async def test_async_open_on_timeouts(self):
+        with self.assertLogs("djk8s.probe", "WARNING"):
+            for _ in range(2):
+                with self.assertRaisesRegex(NotReady, "AsyncSlowProbe: probe timed out"):
+                    await arun_probes([AsyncSlowProbe()])
+
+        with self.assertRaisesRegex(NotReady, "AsyncSlowProbe: circuit breaker is open"):
+            await arun_probes([AsyncSlowProbe()])
+        self.assertEqual(self.transitions, [OPEN])
+
+    def test_backoff(self):
+        breaker = CircuitBreaker("test", threshold=1, backoff=1.0, max_backoff=4.0)
+        delays = []
+        with mock.patch("time.monotonic", return_value=0.0):
+            for _ in range(5):
+                if breaker.state == OPEN:
+                    breaker.retry_at = 0.0
+                    breaker.before()
+                breaker.failure()
+                delays.append(breaker.retry_at)
+
+        for delay, expected in zip(delays, (1.0, 2.0, 4.0, 4.0, 4.0)):
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+
+    def test_single_trial(self):
+        breaker = CircuitBreaker("test", threshold=1, backoff=0.0)
+        breaker.failure()
+        breaker.before()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaisesRegex(NotReady, "circuit breaker is open"):
+            breaker.before()
+        breaker.success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.before()
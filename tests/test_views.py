@@ -1,5 +1,10 @@
+from unittest import mock
 from django.test import TestCase
 from django.test import override_settings
+from django.urls import resolve
+
+from djk8s.views import AsyncReadinessView
+from tests import hooks
 
 
 @override_settings(
@@ -47,3 +52,41 @@ class TestViews(TestCase):
         response = self.client.get("/livez")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content.decode(), "Ok")
+
+    def test_shipped_readiness_view(self):
+        # The included urls serve the async view, which also works under WSGI.
+        self.assertIs(resolve("/readyz").func.view_class, AsyncReadinessView)
+        self.assertTrue(AsyncReadinessView.view_is_async)
+
+    async def test_async_readyz(self):
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), "Ok")
+
+    async def test_async_readiness_view(self):
+        response = await self.async_client.get("/areadyz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), "Ok")
+
+    @override_settings(
+        DJK8S_READINESS_PROBES=[
+            "djk8s.probes.DatabaseProbe",
+            "tests.probes.NeverReady",
+        ]
+    )
+    async def test_async_not_ready(self):
+        response = await self.async_client.get("/areadyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("test is not ready", response.content.decode())
+
+    @override_settings(DJK8S_WARMUP_HOOKS=["tests.hooks.flaky"])
+    async def test_warmup(self):
+        # The readiness views report not ready until the warm-up is complete.
+        with mock.patch.object(hooks, "broken", True), self.assertLogs("djk8s.probe", "ERROR"):
+            for path in ("/readyz", "/areadyz"):
+                response = await self.async_client.get(path)
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response.content.decode(), "startup: warm-up is not complete")
+
+        response = await self.async_client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,168 @@
+import io
+import time
+import socket
+
+from unittest import mock
+from django.db.utils import OperationalError
+from django.core.management import call_command, CommandError
+from django.test import TransactionTestCase, override_settings
+
+from djk8s.wait import Backoff, wait_until
+from djk8s.management.commands import wait4db
+from tests.probes import CountingProbe, SlowProbe
+
+
+class Flaky(object):
+    """
+    A check that fails the given number of times before succeeding.
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OperationalError(f"failure {self.calls}")
+
+
+class TestWait(TransactionTestCase):
+
+    def test_backoff(self):
+        backoff = Backoff(initial=1, maximum=4, factor=2, jitter=0.5)
+        for expected in (1, 2, 4, 4):
+            delay = backoff.next()
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+
+        backoff.reset()
+        self.assertLessEqual(backoff.next(), 1)
+
+    def test_wait_until(self):
+        check = Flaky(3)
+        messages = []
+        waited = wait_until(
+            check, timeout=5, backoff=Backoff(0.01, 0.02), log=messages.append, name="test"
+        )
+        self.assertEqual(check.calls, 4)
+        self.assertLess(waited, 1)
+
+        # Failures are only logged once per LOG_INTERVAL
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(messages[0].startswith("test not ready: failure 1"))
+        self.assertTrue(messages[1].startswith("test ready after"))
+
+    def test_wait_until_stable(self):
+        check = Flaky(0)
+        wait_until(check, timeout=5, stable=0.05, backoff=Backoff(0.01, 0.02))
+        self.assertGreater(check.calls, 1)
+
+    def test_wait_until_timeout(self):
+        with self.assertRaisesRegex(TimeoutError, "test was not ready after 0.05s"):
+            wait_until(Flaky(100), timeout=0.05, backoff=Backoff(0.01, 0.02), name="test")
+
+    def test_database_address(self):
+        conn = mock.Mock(vendor="postgresql", settings_dict={"HOST": "db", "PORT": ""})
+        self.assertEqual(wait4db.database_address(conn), ("db", 5432))
+
+        conn.settings_dict = {"HOST": "db", "PORT": "6543"}
+        self.assertEqual(wait4db.database_address(conn), ("db", 6543))
+
+        for host in ("", "/var/run/postgresql", "db1,db2"):
+            conn.settings_dict = {"HOST": host, "PORT": "5432"}
+            self.assertIsNone(wait4db.database_address(conn))
+
+    def test_tcp_precheck(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            address = sock.getsockname()
+
+        with mock.patch.object(wait4db, "database_address", return_value=address):
+            with self.assertRaises(OSError):
+                wait4db.check_database("default")
+
+    def test_wait4db(self):
+        start = time.monotonic()
+        call_command("wait4db", "--all", "-s", "0", verbosity=0)
+        call_command("wait4db", "-d", "default", "-s", "0.05", "-i", "0.01", stderr=io.StringIO())
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait4db_validation(self):
+        with self.assertRaisesRegex(CommandError, "not configured"):
+            call_command("wait4db", "-d", "missing")
+
+        with self.assertRaisesRegex(CommandError, "either --all or --database"):
+            call_command("wait4db", "--all", "-d", "default")
+
+        with self.assertRaisesRegex(CommandError, "Interval must be greater than 0"):
+            call_command("wait4db", "-i", "0")
+
+    def test_wait4db_timeout(self):
+        with mock.patch.object(wait4db, "check_database", side_effect=OperationalError("down")):
+            with self.assertRaisesRegex(CommandError, "database 'default' was not ready after 0.05s"):
+                call_command("wait4db", "-t", "0.05", "-i", "0.01", verbosity=0)
+
+    def test_waitfor(self):
+        CountingProbe.calls = 0
+        with override_settings(DJK8S_READINESS_PROBES=["tests.probes.CountingProbe"]):
+            call_command("waitfor", "-s", "0", verbosity=0)
+        self.assertEqual(CountingProbe.calls, 1)
+
+        call_command(
+            "waitfor",
+            "-p", "tests.probes.CountingProbe",
+            "-p", "djk8s.probes.DatabaseProbe",
+            "-s", "0.05",
+            "-i", "0.01",
+            verbosity=0,
+        )
+        self.assertGreater(CountingProbe.calls, 2)
+
+    def test_waitfor_timeout(self):
+        with self.assertRaisesRegex(CommandError, "NeverReady was not ready after 0.05s"):
+            call_command(
+                "waitfor",
+                "-p", "tests.probes.CountingProbe",
+                "-p", "tests.probes.NeverReady",
+                "-s", "0",
+                "-t", "0.05",
+                "-i", "0.01",
+                stderr=io.StringIO(),
+            )
+
+    def test_waitfor_retries_errors(self):
+        # Unexpected errors are retried like probes that are not ready.
+        error = mock.patch.object(CountingProbe, "ready", side_effect=RuntimeError("boom"))
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr, error:
+            with self.assertRaisesRegex(CommandError, "CountingProbe was not ready after 0.05s"):
+                call_command(
+                    "waitfor",
+                    "-p", "tests.probes.CountingProbe",
+                    "-s", "0",
+                    "-t", "0.05",
+                    "-i", "0.01",
+                )
+        self.assertIn("CountingProbe not ready: boom", stderr.getvalue())
+
+    @override_settings(DJK8S_PROBE_WORKERS=1, DJK8S_PROBE_TIMEOUT=0.02)
+    def test_waitfor_probe_timeout(self):
+        SlowProbe.delay = 0.1
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            with self.assertLogs("djk8s.probe", "WARNING"):
+                with self.assertRaisesRegex(CommandError, "SlowProbe was not ready after 0.05s"):
+                    call_command(
+                        "waitfor",
+                        "-p", "tests.probes.SlowProbe",
+                        "-s", "0",
+                        "-t", "0.05",
+                        "-i", "0.01",
+                    )
+        self.assertIn("probe timed out after 0.02s", stderr.getvalue())
+
+    def test_waitfor_invalid_probe(self):
+        with self.assertRaisesRegex(CommandError, "Could not import 'tests.probes.Missing'"):
+            call_command("waitfor", "-p", "tests.probes.Missing")
+
+        with self.assertRaisesRegex(CommandError, "is not a ReadinessProbe"):
+            call_command("waitfor", "-p", "djk8s.probes.ProbeRegistry")
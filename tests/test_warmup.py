@@ -0,0 +1,104 @@
+from unittest import mock
+from django.db import connections, OperationalError
+from django.test import TestCase, override_settings
+
+from tests import hooks
+from djk8s.warmup import Warmup, warmup
+
+
+class TestWarmup(TestCase):
+    """
+    Test the warm-up hooks are run once per process and retried on failure.
+    """
+
+    def setUp(self):
+        hooks.calls.clear()
+        hooks.broken = False
+
+    def test_default_hooks(self):
+        w = Warmup()
+        self.assertTrue(w.run())
+        self.assertTrue(w.complete)
+
+    @override_settings(DJK8S_WARMUP_HOOKS=[
+        "djk8s.warmup.connect_databases",
+        "djk8s.warmup.populate_urlconf",
+        "djk8s.warmup.load_templates",
+        "djk8s.warmup.touch_caches",
+    ])
+    def test_provided_hooks(self):
+        self.assertTrue(Warmup().run())
+
+    @override_settings(
+        DJK8S_WARMUP_HOOKS=["djk8s.warmup.connect_databases"],
+        DJK8S_DATABASE_PROBE_ALIASES=["default"],
+    )
+    def test_excluded_database(self):
+        # A database that is not probed does not gate the warm-up or readiness.
+        reports = mock.Mock()
+        reports.ensure_connection.side_effect = OperationalError("unreachable")
+        conns = {"default": connections["default"], "reports": reports}
+
+        with mock.patch("django.db.connections", conns):
+            self.assertTrue(Warmup().run())
+        reports.ensure_connection.assert_not_called()
+
+    @override_settings(DJK8S_WARMUP_HOOKS=["tests.hooks.record"])
+    def test_runs_once(self):
+        w = Warmup()
+        for _ in range(3):
+            self.assertTrue(w.run())
+        self.assertEqual(hooks.calls, ["record"])
+
+    @override_settings(DJK8S_WARMUP_HOOKS=["tests.hooks.record", "tests.hooks.flaky"])
+    def test_retry_failed_hooks(self):
+        hooks.broken = True
+        w = Warmup()
+        with self.assertLogs("djk8s.probe", "ERROR"):
+            self.assertFalse(w.run())
+        self.assertFalse(w.complete)
+
+        hooks.broken = False
+        self.assertTrue(w.run())
+        self.assertEqual(hooks.calls, ["record", "flaky"])
+
+
+@override_settings(
+    ROOT_URLCONF="tests.nourls",
+    DJK8S_WARMUP_HOOKS=["tests.hooks.flaky"],
+)
+class TestStartupMiddleware(TestCase):
+    """
+    Test the ProbeMiddleware startup path and that readiness waits for the warm-up.
+    """
+
+    def setUp(self):
+        hooks.calls.clear()
+        hooks.broken = False
+        warmup.reset()
+
+    def test_startup_response(self):
+        response = self.client.get("/startupz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), "Ok")
+        self.assertEqual(hooks.calls, ["flaky"])
+
+    def test_not_started(self):
+        hooks.broken = True
+        with self.assertLogs("djk8s.probe", "ERROR"):
+            for path in ("/startupz", "/readyz"):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 503)
+                self.assertIn("warm-up is not complete", response.content.decode())
+
+        response = self.client.get("/livez")
+        self.assertEqual(response.status_code, 200)
+
+        hooks.broken = False
+        self.assertEqual(self.client.get("/readyz").status_code, 200)
+        self.assertEqual(self.client.get("/startupz").status_code, 200)
+
+    async def test_async_startup_response(self):
+        response = await self.async_client.get("/startupz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(hooks.calls, ["flaky"])
@@ -0,0 +1,90 @@
+from django.test import TestCase, RequestFactory, override_settings
+from django.core.signals import request_started
+from django.core.handlers.wsgi import WSGIHandler
+
+from djk8s.wsgi import ProbeApplication
+
+
+class TestProbeApplication(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.application = ProbeApplication(self.wrapped)
+        self.environ = RequestFactory()._base_environ
+
+    def wrapped(self, environ, start_response):
+        self.calls.append(environ["PATH_INFO"])
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"app"]
+
+    def call(self, path, method="GET", **extra):
+        response = {}
+
+        def start_response(status, headers):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        environ = self.environ(PATH_INFO=path, REQUEST_METHOD=method, **extra)
+        body = b"".join(self.application(environ, start_response))
+        return response["status"], response["headers"], body.decode()
+
+    def test_health(self):
+        started = []
+        request_started.connect(started.append)
+        self.addCleanup(request_started.disconnect, started.append)
+
+        for path in ("/livez", "/healthz"):
+            status, headers, body = self.call(path)
+            self.assertEqual(status, "200 OK")
+            self.assertEqual(body, "Ok")
+            self.assertEqual(headers["Content-Type"], "text/plain")
+            self.assertEqual(headers["Content-Length"], "2")
+
+        self.assertEqual(self.calls, [])
+        self.assertEqual(started, [])
+
+    def test_ready(self):
+        status, _, body = self.call("/readyz")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(body, "Ok")
+
+        status, _, body = self.call("/startupz")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(self.calls, [])
+
+    @override_settings(DJK8S_READINESS_PROBES=["tests.probes.NeverReady"])
+    def test_not_ready(self):
+        application = ProbeApplication(self.wrapped)
+        environ = self.environ(PATH_INFO="/readyz", REQUEST_METHOD="GET")
+
+        response = []
+        body = application(environ, lambda status, headers: response.append(status))
+        self.assertEqual(response, ["503 Service Unavailable"])
+        self.assertEqual(body, [b"test is not ready"])
+
+    def test_passthrough(self):
+        status, _, body = self.call("/api/items")
+        self.assertEqual(body, "app")
+
+        status, _, body = self.call("/readyz", method="POST")
+        self.assertEqual(body, "app")
+
+        # Paths are matched including the script name the application is mounted at.
+        status, _, body = self.call("/readyz", SCRIPT_NAME="/myapp")
+        self.assertEqual(body, "app")
+        self.assertEqual(self.calls, ["/api/items", "/readyz", "/readyz"])
+
+    @override_settings(ROOT_URLCONF="tests.nourls")
+    def test_django(self):
+        application = ProbeApplication(WSGIHandler())
+        environ = self.environ(PATH_INFO="/readyz", REQUEST_METHOD="GET")
+
+        response = []
+        body = application(environ, lambda status, headers: response.append(status))
+        self.assertEqual(response, ["200 OK"])
+        self.assertEqual(b"".join(body), b"Ok")
+
+        environ = self.environ(PATH_INFO="/missing", REQUEST_METHOD="GET")
+        body = application(environ, lambda status, headers: response.append(status))
+        body.close()
+        self.assertEqual(response[-1], "404 Not Found")
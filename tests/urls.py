@@ -1,3 +1,7 @@
 from django.urls import path, include
+from djk8s.views import AsyncReadinessView
 
-urlpatterns = [path("", include("djk8s.urls"))]
+urlpatterns = [
+    path("", include("djk8s.urls")),
+    path("areadyz", AsyncReadinessView.as_view(), name="async-readiness-probe"),
+]